@@ -2,11 +2,202 @@
 Backtesting framework for pairs trading strategies.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import pandas as pd
 import numpy as np
 from typing import Dict, Tuple, Optional
 
 
+EXIT_REASONS = np.array(['TAKE_PROFIT', 'STOP_LOSS', 'END_OF_PERIOD'])
+
+# optimize_parameters runs grids smaller than this serially by default: a
+# cell takes a few milliseconds, less than starting worker processes and
+# shipping each of them the price data
+PARALLEL_GRID_MIN = 100
+
+
+def _rolling_beta(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing-window OLS slope of y on x for every bar, in O(n).
+
+    Uses differences of cumulative sums instead of refitting each window.
+    Bars with fewer than `window` observations are NaN.
+    """
+    # Centering keeps the cumulative sums small (slope is shift-invariant)
+    x = x - x.mean()
+    y = y - y.mean()
+    zero = np.zeros(1)
+    cx = np.concatenate((zero, np.cumsum(x)))
+    cy = np.concatenate((zero, np.cumsum(y)))
+    cxx = np.concatenate((zero, np.cumsum(x * x)))
+    cxy = np.concatenate((zero, np.cumsum(x * y)))
+
+    sum_x = cx[window:] - cx[:-window]
+    sum_y = cy[window:] - cy[:-window]
+    sum_xx = cxx[window:] - cxx[:-window]
+    sum_xy = cxy[window:] - cxy[:-window]
+
+    beta = np.full(len(x), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta[window - 1:] = (window * sum_xy - sum_x * sum_y) / (window * sum_xx - sum_x ** 2)
+    return beta
+
+
+def _backtest_kernel(
+    z: np.ndarray,
+    price_a: np.ndarray,
+    price_b: np.ndarray,
+    hedge_ratio: np.ndarray,
+    entry_zscore: float,
+    exit_zscore: float,
+    stop_loss_zscore: float,
+    transaction_cost: float,
+    initial_capital: float,
+    start: int
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Sequential position state machine for backtest_pairs_strategy.
+
+    Works on raw ndarrays and scalars only, so it has no pandas overhead.
+    hedge_ratio holds the hedge ratio in force on each bar.
+    The trade log is kept as one preallocated array per field (bar indices
+    instead of dates, exit reasons as codes into EXIT_REASONS). The loop only
+    tracks realized capital and which trade is open on each bar; the
+    mark-to-market equity curve is computed afterwards in one vector pass.
+
+    Returns:
+    --------
+    tuple
+        (trades, equity_curve) where trades maps field name -> ndarray
+    """
+    # Precompute all signals in one vectorized pass (NaN compares False, so
+    # bars with a NaN z-score never trigger anything).
+    # Threshold comparisons only need float32; prices and P&L stay float64
+    # so capital accounting does not accumulate rounding error.
+    zf = z.astype(np.float32)
+    skipped = np.isnan(zf)
+
+    # Entry: +1 = long spread (z very negative), -1 = short spread (z very positive)
+    entry_signal = (
+        (zf < np.float32(-entry_zscore)).astype(np.int8) -
+        (zf > np.float32(entry_zscore)).astype(np.int8)
+    )
+
+    # Exit per position side: code into EXIT_REASONS, or -1 to keep holding.
+    # Take profit (mean reversion) takes precedence over stop loss.
+    long_exit = np.where(
+        zf > np.float32(-exit_zscore), 0, np.where(zf < np.float32(-stop_loss_zscore), 1, -1)
+    )
+    short_exit = np.where(
+        zf < np.float32(exit_zscore), 0, np.where(zf > np.float32(stop_loss_zscore), 1, -1)
+    )
+
+    # Trade log (at most one trade per bar)
+    n = len(z)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    position_sign = np.empty(n, dtype=np.int8)
+    exit_reason = np.empty(n, dtype=np.int8)
+    entry_z = np.empty(n)
+    exit_z = np.empty(n)
+    shares_a = np.empty(n)
+    shares_b = np.empty(n)
+    entry_pa = np.empty(n)
+    entry_pb = np.empty(n)
+    capital_allocated = np.empty(n)
+    gross_pnl = np.empty(n)
+    nt = 0
+
+    # Equity curve: initial capital, then one value per bar from `start`.
+    # The loop fills in realized capital; open positions are added after.
+    equity_curve = np.empty(max(n - start, 0) + 1)
+    equity_curve[0] = initial_capital
+
+    # Per-bar index of the open trade (-1 if flat)
+    open_trade = np.full(n, -1, dtype=np.int64)
+
+    # Initialize tracking variables
+    position = 0  # 0 = no position, 1 = long spread, -1 = short spread
+    current_capital = initial_capital
+
+    def close_trade(t, i, reason):
+        gross_pnl[t] = position_sign[t] * (
+            shares_a[t] * (price_a[i] - entry_pa[t]) -
+            shares_b[t] * (price_b[i] - entry_pb[t])
+        )
+        exit_idx[t] = i
+        exit_z[t] = z[i]
+        exit_reason[t] = reason
+        # Transaction costs (4 transactions: entry buy/sell + exit buy/sell)
+        return gross_pnl[t] - capital_allocated[t] * transaction_cost * 4
+
+    # Start after the z-score window to avoid NaN values
+    for i in range(start, n):
+        # Entry logic
+        if position == 0:
+            # Long spread (buy A, sell B) or short spread (sell A, buy B)
+            if entry_signal[i] != 0:
+                position = int(entry_signal[i])
+
+                # Calculate position sizes (dollar-neutral)
+                capital_per_leg = current_capital / 2
+                entry_idx[nt] = i
+                entry_z[nt] = z[i]
+                position_sign[nt] = position
+                shares_a[nt] = capital_per_leg / price_a[i]
+                shares_b[nt] = (capital_per_leg / price_b[i]) * hedge_ratio[i]
+                entry_pa[nt] = price_a[i]
+                entry_pb[nt] = price_b[i]
+                capital_allocated[nt] = current_capital
+                nt += 1
+
+        # Exit logic: take profit on mean reversion, stop loss if spread moved against us
+        else:
+            reason = long_exit[i] if position == 1 else short_exit[i]
+            if reason >= 0:
+                current_capital += close_trade(nt - 1, i, reason)
+                position = 0
+
+        equity_curve[i - start + 1] = current_capital
+        open_trade[i] = nt - 1 if position != 0 else -1
+
+    # Close any open position at the end
+    if position != 0:
+        close_trade(nt - 1, n - 1, 2)
+
+    # Mark open positions to market in one vector pass
+    held = open_trade[start:] >= 0
+    t = open_trade[start:][held]
+    i = np.arange(start, n)[held]
+    equity_curve[1:][held] += position_sign[t] * (
+        shares_a[t] * (price_a[i] - entry_pa[t]) -
+        shares_b[t] * (price_b[i] - entry_pb[t])
+    )
+
+    # Bars skipped while holding a position carry the previous equity forward
+    stale = np.concatenate(([False], skipped[start:] & held))
+    if stale.any():
+        last_fresh = np.maximum.accumulate(np.where(stale, 0, np.arange(len(equity_curve))))
+        equity_curve = equity_curve[last_fresh]
+
+    trades = {
+        'entry_idx': entry_idx[:nt],
+        'exit_idx': exit_idx[:nt],
+        'position': position_sign[:nt],
+        'exit_reason': exit_reason[:nt],
+        'entry_zscore': entry_z[:nt],
+        'exit_zscore': exit_z[:nt],
+        'shares_a': shares_a[:nt],
+        'shares_b': shares_b[:nt],
+        'entry_price_a': entry_pa[:nt],
+        'entry_price_b': entry_pb[:nt],
+        'capital_allocated': capital_allocated[:nt],
+        'gross_pnl': gross_pnl[:nt]
+    }
+    return trades, equity_curve
+
+
 def backtest_pairs_strategy(
     data: pd.DataFrame,
     hedge_ratio: float,
@@ -15,7 +206,10 @@ def backtest_pairs_strategy(
     stop_loss_zscore: float = 4.0,
     transaction_cost: float = 0.001,
     initial_capital: float = 100000,
-    zscore_window: int = 20
+    zscore_window: int = 20,
+    prices: Optional[np.ndarray] = None,
+    signal_mode: str = "zscore",
+    rolling_window: Optional[int] = None
 ) -> Dict:
     """
     Backtest a z-score based pairs trading strategy.
@@ -38,6 +232,17 @@ def backtest_pairs_strategy(
         Starting capital (default $100,000)
     zscore_window : int
         Rolling window for z-score calculation (default 20 days)
+    prices : np.ndarray, optional
+        Raw (non-log) prices aligned with data, shape (len(data), 2).
+        Computed as exp(data) if not given; pass it to avoid repeating
+        the conversion when backtesting the same data many times.
+    signal_mode : str
+        Spread normalization: "zscore" (rolling mean/std, default) or
+        "qscore" (rolling median / interquartile range, robust to outliers).
+        Both use the zscore_window lookback and the same thresholds.
+    rolling_window : int, optional
+        If set, re-estimate the hedge ratio on every bar from the trailing
+        rolling_window days instead of using the static hedge_ratio.
 
     Returns:
     --------
@@ -46,188 +251,70 @@ def backtest_pairs_strategy(
     """
     if len(data.columns) != 2:
         raise ValueError("Data must contain exactly 2 stocks")
+    if signal_mode not in ("zscore", "qscore"):
+        raise ValueError(f"signal_mode must be 'zscore' or 'qscore' (got {signal_mode!r})")
 
-    # Calculate spread and ROLLING z-score (fixes look-ahead bias)
-    spread = data.iloc[:, 0] - hedge_ratio * data.iloc[:, 1]
-    spread_mean = spread.rolling(window=zscore_window).mean()
-    spread_std = spread.rolling(window=zscore_window).std()
-    zscore = (spread - spread_mean) / spread_std
-
-    # Initialize tracking variables
-    position = 0  # 0 = no position, 1 = long spread, -1 = short spread
-    entry_price = 0
-    entry_zscore_val = 0
-    trades = []
-    equity_curve = [initial_capital]
-    current_capital = initial_capital
-
-    # Track actual prices for position sizing
-    price_a = np.exp(data.iloc[:, 0])  # Convert log prices back
-    price_b = np.exp(data.iloc[:, 1])
+    # Work on raw arrays throughout (avoids per-element pandas .iloc dispatch)
+    log_a = data.iloc[:, 0].to_numpy(dtype=np.float64)
+    log_b = data.iloc[:, 1].to_numpy(dtype=np.float64)
 
-    # Start after zscore_window to avoid NaN values
-    for i in range(zscore_window, len(data)):
-        current_zscore = zscore.iloc[i]
-
-        # Skip if z-score is NaN
-        if pd.isna(current_zscore):
-            equity_curve.append(current_capital if position == 0 else equity_curve[-1])
-            continue
-
-        prev_zscore = zscore.iloc[i-1]
-
-        # Entry logic
-        if position == 0:
-            # Enter long spread (buy A, sell B) when z-score is very negative
-            if current_zscore < -entry_zscore:
-                position = 1
-                entry_zscore_val = current_zscore
-                entry_price = spread.iloc[i]
-
-                # Calculate position sizes (dollar-neutral)
-                capital_per_leg = current_capital / 2
-                shares_a = capital_per_leg / price_a.iloc[i]
-                shares_b = (capital_per_leg / price_b.iloc[i]) * hedge_ratio
-
-                # Record entry
-                trades.append({
-                    'entry_date': data.index[i],
-                    'entry_zscore': current_zscore,
-                    'position_type': 'LONG_SPREAD',
-                    'shares_a': shares_a,
-                    'shares_b': shares_b,
-                    'entry_price_a': price_a.iloc[i],
-                    'entry_price_b': price_b.iloc[i],
-                    'capital_allocated': current_capital
-                })
-
-            # Enter short spread (sell A, buy B) when z-score is very positive
-            elif current_zscore > entry_zscore:
-                position = -1
-                entry_zscore_val = current_zscore
-                entry_price = spread.iloc[i]
-
-                # Calculate position sizes
-                capital_per_leg = current_capital / 2
-                shares_a = capital_per_leg / price_a.iloc[i]
-                shares_b = (capital_per_leg / price_b.iloc[i]) * hedge_ratio
-
-                trades.append({
-                    'entry_date': data.index[i],
-                    'entry_zscore': current_zscore,
-                    'position_type': 'SHORT_SPREAD',
-                    'shares_a': shares_a,
-                    'shares_b': shares_b,
-                    'entry_price_a': price_a.iloc[i],
-                    'entry_price_b': price_b.iloc[i],
-                    'capital_allocated': current_capital
-                })
-
-        # Exit logic
-        elif position != 0:
-            exit_triggered = False
-            exit_reason = None
-
-            # Take profit: mean reversion occurred
-            if position == 1 and current_zscore > -exit_zscore:
-                exit_triggered = True
-                exit_reason = 'TAKE_PROFIT'
-            elif position == -1 and current_zscore < exit_zscore:
-                exit_triggered = True
-                exit_reason = 'TAKE_PROFIT'
-
-            # Stop loss: spread moved against us
-            elif position == 1 and current_zscore < -stop_loss_zscore:
-                exit_triggered = True
-                exit_reason = 'STOP_LOSS'
-            elif position == -1 and current_zscore > stop_loss_zscore:
-                exit_triggered = True
-                exit_reason = 'STOP_LOSS'
-
-            if exit_triggered:
-                # Calculate P&L
-                trade = trades[-1]
-                exit_price_a = price_a.iloc[i]
-                exit_price_b = price_b.iloc[i]
-
-                if position == 1:  # Long spread
-                    pnl_a = trade['shares_a'] * (exit_price_a - trade['entry_price_a'])
-                    pnl_b = -trade['shares_b'] * (exit_price_b - trade['entry_price_b'])
-                else:  # Short spread
-                    pnl_a = -trade['shares_a'] * (exit_price_a - trade['entry_price_a'])
-                    pnl_b = trade['shares_b'] * (exit_price_b - trade['entry_price_b'])
-
-                gross_pnl = pnl_a + pnl_b
-
-                # Apply transaction costs (4 transactions: entry buy/sell + exit buy/sell)
-                costs = trade['capital_allocated'] * transaction_cost * 4
-                net_pnl = gross_pnl - costs
-
-                # Update capital
-                current_capital += net_pnl
-
-                # Record exit
-                trade['exit_date'] = data.index[i]
-                trade['exit_zscore'] = current_zscore
-                trade['exit_price_a'] = exit_price_a
-                trade['exit_price_b'] = exit_price_b
-                trade['gross_pnl'] = gross_pnl
-                trade['costs'] = costs
-                trade['net_pnl'] = net_pnl
-                trade['return_pct'] = (net_pnl / trade['capital_allocated']) * 100
-                trade['holding_days'] = (data.index[i] - trade['entry_date']).days
-                trade['exit_reason'] = exit_reason
-
-                # Reset position
-                position = 0
-
-        # Update equity curve
-        if position == 0:
-            equity_curve.append(current_capital)
-        else:
-            # Mark to market current position
-            trade = trades[-1]
-            if position == 1:
-                mtm_pnl = (
-                    trade['shares_a'] * (price_a.iloc[i] - trade['entry_price_a']) +
-                    -trade['shares_b'] * (price_b.iloc[i] - trade['entry_price_b'])
-                )
-            else:
-                mtm_pnl = (
-                    -trade['shares_a'] * (price_a.iloc[i] - trade['entry_price_a']) +
-                    trade['shares_b'] * (price_b.iloc[i] - trade['entry_price_b'])
-                )
-            equity_curve.append(current_capital + mtm_pnl)
-
-    # Close any open position at the end
-    if position != 0:
-        trade = trades[-1]
-        trade['exit_date'] = data.index[-1]
-        trade['exit_zscore'] = zscore.iloc[-1]
-        trade['exit_price_a'] = price_a.iloc[-1]
-        trade['exit_price_b'] = price_b.iloc[-1]
-        trade['exit_reason'] = 'END_OF_PERIOD'
-
-        if position == 1:
-            pnl_a = trade['shares_a'] * (trade['exit_price_a'] - trade['entry_price_a'])
-            pnl_b = -trade['shares_b'] * (trade['exit_price_b'] - trade['entry_price_b'])
-        else:
-            pnl_a = -trade['shares_a'] * (trade['exit_price_a'] - trade['entry_price_a'])
-            pnl_b = trade['shares_b'] * (trade['exit_price_b'] - trade['entry_price_b'])
-
-        gross_pnl = pnl_a + pnl_b
-        costs = trade['capital_allocated'] * transaction_cost * 4
-        net_pnl = gross_pnl - costs
-        current_capital += net_pnl
+    # Hedge ratio in force on each bar (static, or trailing-window OLS)
+    if rolling_window is not None:
+        hedge_ratios = _rolling_beta(log_b, log_a, rolling_window)
+    else:
+        hedge_ratios = np.full(len(data), float(hedge_ratio))
 
-        trade['gross_pnl'] = gross_pnl
-        trade['costs'] = costs
-        trade['net_pnl'] = net_pnl
-        trade['return_pct'] = (net_pnl / trade['capital_allocated']) * 100
-        trade['holding_days'] = (trade['exit_date'] - trade['entry_date']).days
+    # Calculate spread and ROLLING z-score (fixes look-ahead bias)
+    spread = log_a - hedge_ratios * log_b
+    rolling = pd.Series(spread).rolling(window=zscore_window)
+    if signal_mode == "qscore":
+        center = rolling.median().to_numpy()
+        scale = (rolling.quantile(0.75) - rolling.quantile(0.25)).to_numpy()
+    else:
+        center = rolling.mean().to_numpy()
+        scale = rolling.std().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):  # flat windows give NaN, as in pandas
+        z = (spread - center) / scale
+
+    if prices is None:
+        prices = np.exp(data.to_numpy(dtype=np.float64))  # Convert log prices back
+    price_a = prices[:, 0]
+    price_b = prices[:, 1]
+
+    trades, equity_curve = _backtest_kernel(
+        z, price_a, price_b, hedge_ratios, entry_zscore, exit_zscore,
+        stop_loss_zscore, transaction_cost, initial_capital, zscore_window
+    )
 
-    # Calculate performance metrics
-    trades_df = pd.DataFrame(trades)
+    # Build the trade log DataFrame in one pass from the per-field arrays
+    entry_idx = trades['entry_idx']
+    exit_idx = trades['exit_idx']
+    exit_pa = price_a[exit_idx]
+    exit_pb = price_b[exit_idx]
+    costs = trades['capital_allocated'] * transaction_cost * 4
+    net_pnl = trades['gross_pnl'] - costs
+    entry_dates = data.index[entry_idx]
+    exit_dates = data.index[exit_idx]
+    trades_df = pd.DataFrame({
+        'entry_date': entry_dates,
+        'entry_zscore': trades['entry_zscore'],
+        'position_type': np.where(trades['position'] == 1, 'LONG_SPREAD', 'SHORT_SPREAD'),
+        'shares_a': trades['shares_a'],
+        'shares_b': trades['shares_b'],
+        'entry_price_a': trades['entry_price_a'],
+        'entry_price_b': trades['entry_price_b'],
+        'capital_allocated': trades['capital_allocated'],
+        'exit_date': exit_dates,
+        'exit_zscore': trades['exit_zscore'],
+        'exit_price_a': exit_pa,
+        'exit_price_b': exit_pb,
+        'gross_pnl': trades['gross_pnl'],
+        'costs': costs,
+        'net_pnl': net_pnl,
+        'return_pct': (net_pnl / trades['capital_allocated']) * 100,
+        'holding_days': (exit_dates - entry_dates).days,
+        'exit_reason': EXIT_REASONS[trades['exit_reason']]
+    })
 
     # Create equity series with correct indexing
     # Equity curve starts from zscore_window (skipping NaN period)
@@ -248,11 +335,39 @@ def backtest_pairs_strategy(
             'exit_zscore': exit_zscore,
             'stop_loss_zscore': stop_loss_zscore,
             'transaction_cost': transaction_cost,
-            'initial_capital': initial_capital
+            'initial_capital': initial_capital,
+            'signal_mode': signal_mode,
+            'rolling_window': rolling_window
         }
     }
 
 
+def _equity_stats(equity: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Mean and standard deviation of per-bar returns plus maximum drawdown (%).
+
+    Returns are differenced once and both moments are reduced from that one
+    array; the drawdown reuses a single scratch buffer for the running peak.
+    """
+    returns = np.diff(equity)
+    returns /= equity[:-1]
+    returns = returns[~np.isnan(returns)]
+    n = len(returns)
+    avg_return = returns.sum() / n if n > 0 else np.nan
+    if n > 1:
+        centered = returns - avg_return
+        std_return = np.sqrt(np.dot(centered, centered) / (n - 1))
+    else:
+        std_return = np.nan
+
+    peak = np.maximum.accumulate(equity)
+    drawdown = equity - peak
+    drawdown /= peak
+    max_drawdown = drawdown.min() * 100
+
+    return avg_return, std_return, max_drawdown
+
+
 def calculate_performance_metrics(
     trades_df: pd.DataFrame,
     equity_curve: pd.Series,
@@ -298,39 +413,36 @@ def calculate_performance_metrics(
             'avg_win_loss_ratio': 0
         }
 
+    # Work on raw arrays to avoid pandas dispatch/alignment overhead
+    equity = equity_curve.to_numpy(dtype=np.float64)
+
     # Basic metrics
-    final_capital = equity_curve.iloc[-1]
+    final_capital = equity[-1]
     total_return = final_capital - initial_capital
     total_return_pct = (total_return / initial_capital) * 100
 
-    # Returns
-    returns = equity_curve.pct_change().dropna()
-    avg_return = returns.mean()
-    std_return = returns.std()
+    avg_return, std_return, max_drawdown = _equity_stats(equity)
 
     # Sharpe ratio (annualized)
     sharpe_ratio = (avg_return / std_return * np.sqrt(252)) if std_return > 0 else 0
 
-    # Maximum drawdown
-    running_max = equity_curve.expanding().max()
-    drawdown = (equity_curve - running_max) / running_max
-    max_drawdown = drawdown.min() * 100
-
     # Trade statistics
-    completed_trades = trades_df[trades_df['net_pnl'].notna()]
-    if len(completed_trades) > 0:
-        wins = completed_trades[completed_trades['net_pnl'] > 0]
-        losses = completed_trades[completed_trades['net_pnl'] <= 0]
-
-        win_rate = len(wins) / len(completed_trades) * 100
-        avg_win = wins['net_pnl'].mean() if len(wins) > 0 else 0
-        avg_loss = abs(losses['net_pnl'].mean()) if len(losses) > 0 else 0
-        avg_return_per_trade = completed_trades['return_pct'].mean()
-        avg_holding_days = completed_trades['holding_days'].mean()
+    net_pnl = trades_df['net_pnl'].to_numpy(dtype=np.float64)
+    completed = ~np.isnan(net_pnl)
+    pnl = net_pnl[completed]
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl <= 0]
+
+    if len(pnl) > 0:
+        win_rate = len(wins) / len(pnl) * 100
+        avg_win = wins.mean() if len(wins) > 0 else 0
+        avg_loss = abs(losses.mean()) if len(losses) > 0 else 0
+        avg_return_per_trade = trades_df['return_pct'].to_numpy(dtype=np.float64)[completed].mean()
+        avg_holding_days = trades_df['holding_days'].to_numpy(dtype=np.float64)[completed].mean()
 
         # Profit factor
-        total_wins = wins['net_pnl'].sum() if len(wins) > 0 else 0
-        total_losses = abs(losses['net_pnl'].sum()) if len(losses) > 0 else 0
+        total_wins = wins.sum()
+        total_losses = abs(losses.sum())
         profit_factor = total_wins / total_losses if total_losses > 0 else np.inf
 
         # Risk-adjusted metrics
@@ -350,9 +462,9 @@ def calculate_performance_metrics(
     calmar_ratio = annual_return / abs(max_drawdown) if max_drawdown != 0 else 0
 
     return {
-        'total_trades': len(completed_trades),
-        'winning_trades': len(wins) if len(completed_trades) > 0 else 0,
-        'losing_trades': len(losses) if len(completed_trades) > 0 else 0,
+        'total_trades': len(pnl),
+        'winning_trades': len(wins),
+        'losing_trades': len(losses),
         'total_return': total_return,
         'total_return_pct': total_return_pct,
         'annual_return_pct': annual_return,
@@ -369,16 +481,45 @@ def calculate_performance_metrics(
     }
 
 
+def _optimize_one(
+    params: Tuple[float, float, float],
+    data: pd.DataFrame,
+    hedge_ratio: float,
+    prices: np.ndarray
+) -> Dict:
+    """Run one optimize_parameters grid cell (module-level so it can be pickled)."""
+    entry_z, exit_z, stop_z = params
+    metrics = backtest_pairs_strategy(
+        data, hedge_ratio, entry_z, exit_z, stop_z, prices=prices
+    )['metrics']
+    return {
+        'entry_zscore': entry_z,
+        'exit_zscore': exit_z,
+        'stop_loss_zscore': stop_z,
+        'total_return_pct': metrics['total_return_pct'],
+        'sharpe_ratio': metrics['sharpe_ratio'],
+        'max_drawdown_pct': metrics['max_drawdown_pct'],
+        'win_rate': metrics['win_rate'],
+        'total_trades': metrics['total_trades'],
+        'profit_factor': metrics['profit_factor']
+    }
+
+
 def optimize_parameters(
     data: pd.DataFrame,
     hedge_ratio: float,
     entry_zscores: list = [1.5, 2.0, 2.5],
     exit_zscores: list = [0.3, 0.5, 0.7],
-    stop_loss_zscores: list = [3.0, 4.0, 5.0]
+    stop_loss_zscores: list = [3.0, 4.0, 5.0],
+    max_workers: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Optimize trading parameters through grid search.
 
+    Grid cells are independent, so grids of PARALLEL_GRID_MIN cells or more
+    run in parallel across processes; smaller grids, and any grid with
+    max_workers=1, run serially in this process.
+
     Parameters:
     -----------
     data : pd.DataFrame
@@ -391,34 +532,30 @@ def optimize_parameters(
         Exit thresholds to test
     stop_loss_zscores : list
         Stop loss thresholds to test
+    max_workers : int, optional
+        Number of worker processes (default: serial for small grids, else
+        one per CPU core); 1 runs serially without a pool
 
     Returns:
     --------
     pd.DataFrame
         Results for all parameter combinations
     """
-    results = []
-
-    for entry_z in entry_zscores:
-        for exit_z in exit_zscores:
-            for stop_z in stop_loss_zscores:
-                if exit_z < entry_z < stop_z:  # Logical constraint
-                    backtest_result = backtest_pairs_strategy(
-                        data, hedge_ratio, entry_z, exit_z, stop_z
-                    )
-
-                    metrics = backtest_result['metrics']
-                    results.append({
-                        'entry_zscore': entry_z,
-                        'exit_zscore': exit_z,
-                        'stop_loss_zscore': stop_z,
-                        'total_return_pct': metrics['total_return_pct'],
-                        'sharpe_ratio': metrics['sharpe_ratio'],
-                        'max_drawdown_pct': metrics['max_drawdown_pct'],
-                        'win_rate': metrics['win_rate'],
-                        'total_trades': metrics['total_trades'],
-                        'profit_factor': metrics['profit_factor']
-                    })
+    grid = [
+        (entry_z, exit_z, stop_z)
+        for entry_z in entry_zscores
+        for exit_z in exit_zscores
+        for stop_z in stop_loss_zscores
+        if exit_z < entry_z < stop_z  # Logical constraint
+    ]
+
+    prices = np.exp(data.to_numpy(dtype=np.float64))
+    run_one = partial(_optimize_one, data=data, hedge_ratio=hedge_ratio, prices=prices)
+    if max_workers == 1 or (max_workers is None and len(grid) < PARALLEL_GRID_MIN):
+        results = [run_one(cell) for cell in grid]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run_one, grid))
 
     return pd.DataFrame(results).sort_values('sharpe_ratio', ascending=False)
 
@@ -475,9 +612,13 @@ def walk_forward_backtest(
         raise ValueError("Data must contain exactly 2 stocks")
 
     all_trades = []
-    equity_curve = [initial_capital]
+    equity_segments = [np.array([initial_capital], dtype=np.float64)]
     current_capital = initial_capital
     parameters_over_time = []
+    # Flat log-price matrix sliced by position in the loop instead of
+    # materializing column Series per period; raw prices converted once
+    log_prices = data.to_numpy(dtype=np.float64)
+    prices = np.exp(log_prices)
 
     print(f"\nWalk-Forward Backtest Configuration:")
     print(f"  Training window: {train_window} days")
@@ -499,14 +640,13 @@ def walk_forward_backtest(
         test_start = i
         test_end = min(i + test_window, len(data))
 
-        train_data = data.iloc[train_start:train_end]
         test_data = data.iloc[test_start:test_end]
 
         try:
             # TRAIN: Estimate hedge ratio from training window only
             hedge_ratio = np.polyfit(
-                train_data.iloc[:, 1],
-                train_data.iloc[:, 0],
+                log_prices[train_start:train_end, 1],
+                log_prices[train_start:train_end, 0],
                 1
             )[0]
 
@@ -529,22 +669,19 @@ def walk_forward_backtest(
                 stop_loss_zscore=stop_loss_zscore,
                 transaction_cost=transaction_cost,
                 initial_capital=current_capital,
-                zscore_window=zscore_window
+                zscore_window=zscore_window,
+                prices=prices[test_start:test_end]
             )
 
             # Update capital based on this period's results
             if len(window_result['trades']) > 0:
                 completed_trades = window_result['trades'][window_result['trades']['net_pnl'].notna()]
-                for _, trade in completed_trades.iterrows():
-                    all_trades.append(trade.to_dict())
+                all_trades.append(completed_trades)
 
                 current_capital = window_result['equity_curve'].iloc[-1]
 
-            # Extend equity curve
-            if len(equity_curve) > 0:
-                equity_curve.extend(window_result['equity_curve'].iloc[1:].tolist())
-            else:
-                equity_curve.extend(window_result['equity_curve'].tolist())
+            # Extend equity curve (first point repeats the carried-over capital)
+            equity_segments.append(window_result['equity_curve'].to_numpy()[1:])
 
             print(f"Period {period_num}/{total_periods}: {data.index[test_start]} to {data.index[test_end-1]}")
             print(f"  Hedge ratio: {hedge_ratio:.4f}, Trades: {len(window_result['trades'])}, "
@@ -555,7 +692,8 @@ def walk_forward_backtest(
             continue
 
     # Calculate final metrics
-    trades_df = pd.DataFrame(all_trades) if all_trades else pd.DataFrame()
+    trades_df = pd.concat(all_trades, ignore_index=True) if all_trades else pd.DataFrame()
+    equity_curve = np.concatenate(equity_segments)
     equity_series = pd.Series(equity_curve, index=data.index[:len(equity_curve)])
 
     metrics = calculate_performance_metrics(
@@ -2,15 +2,150 @@
 Cointegration testing functions using Johansen and Engle-Granger tests.
 """
 
+import hashlib
+import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
 import pandas as pd
+import statsmodels
 from statsmodels.tsa.stattools import coint
 from statsmodels.tsa.vector_ar.vecm import coint_johansen
+from stats_utils import mean_std
+from rolling_analysis import (
+    _engle_granger,
+    _engle_granger_batch,
+    _johansen_from_moments,
+    _ols_fit,
+    _rolling_johansen_moments,
+    analyze_spread_stability,
+    rolling_cointegration_analysis
+)
+
+# Parquet output of the p-value matrix needs pyarrow; fall back to CSV without it
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
+
+def _serial_future(fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) in this process and wrap the outcome in a completed Future.
+
+    Lets max_workers=1 skip the process pool (forking from a multithreaded
+    caller can deadlock) while results are collected the same way.
+    """
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+# Directory for results persisted across runs by cached_coint_johansen (next
+# to this module, like data_loader.CACHE_DIR, not the caller's working directory)
+JOHANSEN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "johansen")
+
+
+@lru_cache(maxsize=128)
+def _coint_johansen_from_bytes(data_bytes, shape, det_order, k_ar_diff, cache_dir):
+    """
+    Run coint_johansen on a price matrix passed as raw bytes (hashable cache key).
+
+    When cache_dir is set, results are also pickled there under a blake2b
+    digest of the inputs and the statsmodels version so later runs on the
+    same data skip the fit. Unreadable cache files are deleted and refit.
+    """
+    path = None
+    if cache_dir:
+        key = hashlib.blake2b(data_bytes, digest_size=16)
+        key.update(repr((shape, det_order, k_ar_diff, statsmodels.__version__)).encode())
+        path = os.path.join(cache_dir, key.hexdigest() + ".pkl")
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # Truncated file or a pickle from another library version
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    values = np.frombuffer(data_bytes, dtype=np.float64).reshape(shape)
+    result = coint_johansen(values, det_order=det_order, k_ar_diff=k_ar_diff)
+
+    if path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  Could not cache Johansen result: {e}")
+
+    return result
 
 
-def test_basket_cointegration(data_dict, k_ar_diff=5, crit_level=1):
+def cached_coint_johansen(data, det_order=0, k_ar_diff=5, disk_cache=False):
+    """
+    Memoized coint_johansen keyed on the price values and test settings.
+
+    The Johansen fit depends only on the data, det_order and k_ar_diff
+    (not on the critical level used to read the rank), so repeated
+    analyses of the same basket reuse the first result within a session,
+    and with disk_cache also across runs from JOHANSEN_CACHE_DIR. The returned
+    result object is shared and must not be modified.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame or np.ndarray
+        Price data for the basket
+    det_order : int
+        Deterministic trend order (default 0)
+    k_ar_diff : int
+        Lag order (default 5)
+    disk_cache : bool
+        Also persist results to JOHANSEN_CACHE_DIR (default False)
+
+    Returns:
+    --------
+    JohansenTestResult
+        Result of coint_johansen
+    """
+    values = np.ascontiguousarray(data, dtype=np.float64)
+    cache_dir = JOHANSEN_CACHE_DIR if disk_cache else None
+    return _coint_johansen_from_bytes(values.tobytes(), values.shape, det_order, k_ar_diff, cache_dir)
+
+
+def _johansen_one(values, k_ar_diff, crit_level):
+    """Johansen rank and leading trace statistic for one basket array (picklable worker)."""
+    n_obs = len(values)
+    if n_obs - 1 - k_ar_diff <= values.shape[1] * (k_ar_diff + 1):
+        raise ValueError(f"Not enough observations ({n_obs}) for k_ar_diff={k_ar_diff}")
+
+    # Whole sample as a single window of the symmetric Johansen solver
+    (_, s00, sk0, skk, t), = _rolling_johansen_moments(values, n_obs, n_obs, k_ar_diff)
+    lr1, cvt, _ = _johansen_from_moments(s00, sk0, skk, t)
+    n_coint = int(np.count_nonzero(lr1 > cvt[:, crit_level]))
+    max_trace = lr1[0] if len(lr1) > 0 else 0
+    return n_coint, max_trace
+
+
+def test_basket_cointegration(data_dict, k_ar_diff=5, crit_level=1, max_workers=None):
     """
     Test Johansen cointegration for all baskets.
 
+    Baskets are independent, so they are tested in parallel across processes;
+    max_workers=1 tests them serially in this process (use it from threads).
+
     Parameters:
     -----------
     data_dict : dict
@@ -19,6 +154,9 @@ def test_basket_cointegration(data_dict, k_ar_diff=5, crit_level=1):
         Lag order (default 5)
     crit_level : int
         Confidence level: 0=90%, 1=95%, 2=99%
+    max_workers : int, optional
+        Number of worker processes (default: one per CPU core); 1 runs
+        serially without a pool
 
     Returns:
     --------
@@ -26,23 +164,37 @@ def test_basket_cointegration(data_dict, k_ar_diff=5, crit_level=1):
         Summary of cointegration test results
     """
     results = []
+    log = []
+
+    names = list(data_dict)
+    arrays = [data_dict[name].to_numpy(dtype=np.float64) for name in names]
+
+    if max_workers == 1:
+        futures = [_serial_future(_johansen_one, values, k_ar_diff, crit_level) for values in arrays]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_johansen_one, values, k_ar_diff, crit_level) for values in arrays]
 
-    for name, df in data_dict.items():
+    # Collect in basket order so output is deterministic
+    for name, values, future in zip(names, arrays, futures):
         try:
-            result = coint_johansen(df, det_order=0, k_ar_diff=k_ar_diff)
-            n_coint = sum(result.lr1 > result.cvt[:, crit_level])
+            n_coint, max_trace = future.result()
 
             results.append({
                 'Basket': name,
-                'N_Stocks': len(df.columns),
+                'N_Stocks': values.shape[1],
                 'Coint_Rank': n_coint,
-                'Max_Trace': result.lr1[0] if len(result.lr1) > 0 else 0
+                'Max_Trace': max_trace
             })
 
-            print(f"{name:40} | Rank: {n_coint}")
+            log.append(f"{name:40} | Rank: {n_coint}")
 
         except Exception as e:
-            print(f"{name:40} | Error: {e}")
+            log.append(f"{name:40} | Error: {e}")
+
+    # Report once after the pool is drained instead of per basket
+    if log:
+        print("\n".join(log))
 
     return pd.DataFrame(results)
 
@@ -66,8 +218,8 @@ def analyze_basket(data, k_ar_diff=5, crit_level=1):
         (result, cointegrating_vectors_df, n_coint)
     """
     # Run Johansen test
-    result = coint_johansen(data, det_order=0, k_ar_diff=k_ar_diff)
-    n_coint = sum(result.lr1 > result.cvt[:, crit_level])
+    result = cached_coint_johansen(data, det_order=0, k_ar_diff=k_ar_diff)
+    n_coint = int(np.count_nonzero(result.lr1 > result.cvt[:, crit_level]))
 
     # Print results
     print(f"\nBasket: {', '.join(data.columns)}")
@@ -131,14 +283,12 @@ def get_hedge_ratio(data):
     tuple
         (beta, alpha) from linear regression
     """
-    import numpy as np
-
     if len(data.columns) != 2:
         raise ValueError("Data must contain exactly 2 stocks")
 
     stock_a, stock_b = data.columns
     # Regression: stock_a = beta * stock_b + alpha
-    beta, alpha = np.polyfit(data[stock_b], data[stock_a], 1)
+    beta, alpha = _ols_fit(data[stock_b].to_numpy(), data[stock_a].to_numpy())
 
     print(f"\nHedge ratio (beta): {beta:.4f}")
     print(f"Intercept (alpha): {alpha:.4f}")
@@ -147,10 +297,113 @@ def get_hedge_ratio(data):
     return beta, alpha
 
 
-def find_cointegrated_pairs(basket, data_dict, p_threshold=0.05):
+# Basket price matrix shared with pair-test worker processes
+_pair_prices = None
+
+# Pairs per stacked Engle-Granger batch in find_cointegrated_pairs; larger
+# grids are split into blocks that run in parallel
+PAIR_BLOCK_SIZE = 256
+
+
+def _init_pair_worker(prices):
+    """Stash the basket price matrix in each worker so tasks only carry column indices."""
+    global _pair_prices
+    _pair_prices = prices
+
+
+def _pair_block(prices, first, second, betas, alphas):
+    """Batched Engle-Granger tests of columns first[k] on second[k] of prices."""
+    y = prices[:, first]
+    return _engle_granger_batch(y, y - prices[:, second] * betas - alphas)
+
+
+def _test_pair_block(first, second, betas, alphas):
+    """_pair_block on the shared price matrix (picklable worker)."""
+    return _pair_block(_pair_prices, first, second, betas, alphas)
+
+
+def _test_pair_indices(i, j, beta, alpha):
+    """Engle-Granger test for columns i and j of the shared price matrix."""
+    return _engle_granger(_pair_prices[:, i], _pair_prices[:, j], beta, alpha)
+
+
+def _pair_outcomes(prices, pairs, max_workers=None):
+    """
+    Engle-Granger test of column i on column j for every (i, j) in pairs.
+
+    The Engle-Granger regressions of up to PAIR_BLOCK_SIZE pairs are solved
+    together as stacked NumPy arrays, with blocks of a larger grid running
+    in parallel across processes. If a degenerate pair makes that fail,
+    pairs are tested one at a time across processes instead. With
+    max_workers=1 everything runs serially in this process.
+
+    Returns:
+    --------
+    tuple
+        (first, second, betas, outcomes); each outcome is (score, p_value)
+        or the Exception raised by that pair
+    """
+    # Hedge ratio matrix from one cross-product of centered prices:
+    # regressing column i on column j gives hedge_ratios[i, j] = S[i, j] / S[j, j].
+    # Pairs with a constant column have no meaningful fit: NaN, so they fail
+    means = prices.mean(axis=0)
+    centered = prices - means
+    cross = centered.T @ centered
+    constant = np.ptp(prices, axis=0) == 0
+    hedge_ratios = np.divide(cross, np.diag(cross)[None, :], out=np.full_like(cross, np.nan),
+                             where=~(constant[:, None] | constant[None, :]))
+
+    # Residuals of a block of pairs' regressions form the columns of one
+    # matrix, tested with one set of stacked ADF regressions. Blocks bound the
+    # memory of the stacked arrays and run in parallel across processes
+    first = np.array([i for i, _ in pairs], dtype=np.intp)
+    second = np.array([j for _, j in pairs], dtype=np.intp)
+    betas = hedge_ratios[first, second]
+    alphas = means[first] - betas * means[second]
+    blocks = [slice(start, start + PAIR_BLOCK_SIZE) for start in range(0, len(pairs), PAIR_BLOCK_SIZE)]
+    try:
+        if len(blocks) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_pair_worker,
+                                     initargs=(prices,)) as executor:
+                futures = [
+                    executor.submit(_test_pair_block, first[b], second[b], betas[b], alphas[b])
+                    for b in blocks
+                ]
+                parts = [future.result() for future in futures]
+        else:
+            parts = [_pair_block(prices, first[b], second[b], betas[b], alphas[b]) for b in blocks]
+        outcomes = list(zip(*(np.concatenate(part) for part in zip(*parts))))
+    except (np.linalg.LinAlgError, ValueError):
+        # A degenerate pair breaks the stacked solve: test pairs one at a time
+        # (across processes unless max_workers=1) so only the offending pairs
+        # report errors
+        if max_workers == 1:
+            futures = [
+                _serial_future(_engle_granger, prices[:, i], prices[:, j], beta, alpha)
+                for (i, j), beta, alpha in zip(pairs, betas, alphas)
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_pair_worker,
+                                     initargs=(prices,)) as executor:
+                futures = [
+                    executor.submit(_test_pair_indices, i, j, beta, alpha)
+                    for (i, j), beta, alpha in zip(pairs, betas, alphas)
+                ]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(e)
+    return first, second, betas, outcomes
+
+
+def find_cointegrated_pairs(basket, data_dict, p_threshold=0.05, max_workers=None):
     """
     Find all cointegrated pairs within a basket.
 
+    Pairs are tested in stacked blocks (see _pair_outcomes).
+
     Parameters:
     -----------
     basket : list
@@ -159,16 +412,17 @@ def find_cointegrated_pairs(basket, data_dict, p_threshold=0.05):
         Dictionary with basket data
     p_threshold : float
         P-value threshold for cointegration
+    max_workers : int, optional
+        Number of worker processes (default: one per CPU core); 1 runs
+        serially without a pool
 
     Returns:
     --------
     pd.DataFrame
         All cointegrated pairs with their statistics
     """
-    from itertools import combinations
-    import numpy as np
-
     results = []
+    log = []
 
     # Find the basket data
     basket_name = "_".join(basket)
@@ -177,23 +431,29 @@ def find_cointegrated_pairs(basket, data_dict, p_threshold=0.05):
         return None
 
     data = data_dict[basket_name]
+    prices = data.to_numpy(dtype=np.float64)
+    pairs = list(combinations(range(len(data.columns)), 2))
 
-    # Test all pairs
-    for stock_a, stock_b in combinations(data.columns, 2):
-        try:
-            score, p_value, _ = coint(data[stock_a], data[stock_b])
-            beta = np.polyfit(data[stock_b], data[stock_a], 1)[0]
-
-            if p_value < p_threshold:
-                results.append({
-                    'Stock_A': stock_a,
-                    'Stock_B': stock_b,
-                    'P_Value': p_value,
-                    'Test_Score': score,
-                    'Hedge_Ratio': beta
-                })
-        except Exception as e:
-            print(f"Error testing {stock_a} vs {stock_b}: {e}")
+    first, second, betas, outcomes = _pair_outcomes(prices, pairs, max_workers)
+
+    for i, j, beta, outcome in zip(first, second, betas, outcomes):
+        stock_a, stock_b = data.columns[i], data.columns[j]
+        if isinstance(outcome, Exception):
+            log.append(f"Error testing {stock_a} vs {stock_b}: {outcome}")
+            continue
+
+        score, p_value = outcome
+        if p_value < p_threshold:
+            results.append({
+                'Stock_A': stock_a,
+                'Stock_B': stock_b,
+                'P_Value': p_value,
+                'Test_Score': score,
+                'Hedge_Ratio': beta
+            })
+
+    if log:
+        print("\n".join(log))
 
     if results:
         results_df = pd.DataFrame(results).sort_values('P_Value')
@@ -204,6 +464,66 @@ def find_cointegrated_pairs(basket, data_dict, p_threshold=0.05):
         return pd.DataFrame()
 
 
+def pvalue_matrix(data, save_path=None, both_directions=False, max_workers=None):
+    """
+    Engle-Granger p-values of every pair of columns as a float32 matrix.
+
+    Each unordered pair is tested once: entry [a, b] is the p-value of
+    regressing column a on column b for a before b in column order,
+    mirrored into the lower triangle. With both_directions the reverse
+    regressions fill the lower triangle instead; they share the
+    cross-product of centered prices with the forward ones and run in the
+    same stacked batch. The diagonal is zero. Pairs whose test fails or is
+    undefined (missing prices, a constant column, a non-finite score such
+    as an exactly colinear pair) are NaN rather than a p-value.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame
+        Price data, one column per stock
+    save_path : str, optional
+        Write the matrix here: Parquet (zstd) when pyarrow is installed,
+        CSV when the path ends in '.csv' or pyarrow is missing
+    both_directions : bool
+        Test b on a as well as a on b (default False)
+    max_workers : int, optional
+        Number of worker processes (default: one per CPU core); 1 runs
+        serially without a pool
+
+    Returns:
+    --------
+    pd.DataFrame
+        N x N float32 p-values indexed by ticker on both axes; NaN where
+        a pair's test failed or is undefined
+    """
+    prices = data.to_numpy(dtype=np.float64)
+    n_stocks = prices.shape[1]
+    pairs = list(combinations(range(n_stocks), 2))
+    if both_directions:
+        pairs += [(j, i) for i, j in pairs]
+    first, second, _, outcomes = _pair_outcomes(prices, pairs, max_workers)
+
+    # Failed pairs (including any with a constant column) and non-finite
+    # scores map to NaN
+    matrix = np.zeros((n_stocks, n_stocks), dtype=np.float32)
+    scores, pvalues = np.array([(np.nan, np.nan) if isinstance(outcome, Exception) else outcome
+                                for outcome in outcomes], dtype=np.float64).reshape(-1, 2).T
+    pvalues[~np.isfinite(scores)] = np.nan
+    pvalues = pvalues.astype(np.float32)
+    if not both_directions:
+        matrix[second, first] = pvalues
+    matrix[first, second] = pvalues
+    pvalues_df = pd.DataFrame(matrix, index=data.columns, columns=data.columns)
+
+    if save_path is not None:
+        if _HAS_PARQUET and not save_path.endswith('.csv'):
+            pvalues_df.to_parquet(save_path, compression="zstd")
+        else:
+            pvalues_df.to_csv(save_path)
+        print(f"Saved p-value matrix to {save_path}")
+    return pvalues_df
+
+
 def calculate_enhanced_metrics(results):
     """
     Calculate enhanced metrics for deeper LLM interpretation.
@@ -218,9 +538,6 @@ def calculate_enhanced_metrics(results):
     dict
         Enhanced metrics including half-life, z-score distribution, etc.
     """
-    import numpy as np
-    from statsmodels.tsa.stattools import adfuller
-
     enhanced = {}
 
     if results['is_pair']:
@@ -228,16 +545,17 @@ def calculate_enhanced_metrics(results):
         coint = results['cointegration']
         rolling = results['rolling_analysis']
 
-        # Calculate spread
-        spread = data.iloc[:, 0] - coint['hedge_ratio'] * data.iloc[:, 1]
+        # Calculate spread once as a float64 array; every statistic below reads it
+        prices = data.to_numpy(dtype=np.float64)
+        spread = prices[:, 0] - coint['hedge_ratio'] * prices[:, 1]
 
         # 1. Half-life of mean reversion (critical for trading frequency)
         # Using lag-1 autoregression: spread(t) = a + b*spread(t-1) + error
-        spread_lag = spread.shift(1).dropna()
+        spread_lag = spread[:-1]
         spread_curr = spread[1:]
 
         try:
-            beta = np.polyfit(spread_lag, spread_curr, 1)[0]
+            beta = _ols_fit(spread_lag, spread_curr)[0]
             if 0 < abs(beta) < 1:
                 halflife = -np.log(2) / np.log(abs(beta))
             else:
@@ -247,53 +565,58 @@ def calculate_enhanced_metrics(results):
 
         enhanced['halflife_days'] = halflife if not np.isinf(halflife) else 999
 
-        # 2. Spread statistics
-        enhanced['spread_mean'] = spread.mean()
-        enhanced['spread_std'] = spread.std()
-        enhanced['spread_min'] = spread.min()
-        enhanced['spread_max'] = spread.max()
-        enhanced['spread_current'] = spread.iloc[-1]
+        # 2. Spread statistics (NaN-skipping, like the pandas reductions)
+        spread_mean, spread_std = mean_std(spread)
+        enhanced['spread_mean'] = spread_mean
+        enhanced['spread_std'] = spread_std
+        enhanced['spread_min'] = np.nanmin(spread)
+        enhanced['spread_max'] = np.nanmax(spread)
+        enhanced['spread_current'] = spread[-1]
 
         # Current z-score
-        zscore_current = (spread.iloc[-1] - spread.mean()) / spread.std()
+        zscore_current = (spread[-1] - spread_mean) / spread_std
         enhanced['spread_zscore_current'] = zscore_current
 
         # 3. Z-score distribution (for entry/exit thresholds)
-        zscore = (spread - spread.mean()) / spread.std()
+        zscore = (spread - spread_mean) / spread_std
+        q25, q50, q75 = np.nanquantile(zscore, [0.25, 0.50, 0.75])
         enhanced['zscore_quartiles'] = {
-            'q25': zscore.quantile(0.25),
-            'q50': zscore.quantile(0.50),
-            'q75': zscore.quantile(0.75)
+            'q25': q25,
+            'q50': q50,
+            'q75': q75
         }
+        n_above = np.count_nonzero(zscore > 2)
+        n_below = np.count_nonzero(zscore < -2)
         enhanced['zscore_extremes'] = {
-            'pct_above_2': (zscore > 2).mean() * 100,
-            'pct_below_neg2': (zscore < -2).mean() * 100,
-            'max_zscore': zscore.max(),
-            'min_zscore': zscore.min()
+            'pct_above_2': n_above / len(zscore) * 100,
+            'pct_below_neg2': n_below / len(zscore) * 100,
+            'max_zscore': np.nanmax(zscore),
+            'min_zscore': np.nanmin(zscore)
         }
 
         # 4. Trading signal analysis
-        entry_signals = (zscore.abs() > 2).sum()
+        entry_signals = n_above + n_below
         enhanced['historical_entry_opportunities'] = int(entry_signals)
         enhanced['avg_days_between_entries'] = len(zscore) / entry_signals if entry_signals > 0 else 999
 
         # 5. Recent trend analysis (last 60 days vs historical)
-        recent_window = min(60, len(rolling) // 3)
-        if len(rolling) > recent_window:
-            recent_pvalues = rolling['p_value'].tail(recent_window)
-            older_pvalues = rolling['p_value'].head(len(rolling) - recent_window)
-
-            enhanced['recent_trend'] = {
-                'recent_avg_pvalue': recent_pvalues.mean(),
-                'historical_avg_pvalue': older_pvalues.mean(),
-                'relationship_strengthening': recent_pvalues.mean() < older_pvalues.mean()
-            }
-        else:
-            enhanced['recent_trend'] = {
-                'recent_avg_pvalue': rolling['p_value'].mean(),
-                'historical_avg_pvalue': rolling['p_value'].mean(),
-                'relationship_strengthening': False
-            }
+        p_values = rolling['p_value'].to_numpy(dtype=np.float64)
+        n_windows = len(p_values)
+        recent_window = min(60, n_windows // 3)
+
+        # NaN-skipping means of the tail and the rest (untestable windows are NaN)
+        split = n_windows - recent_window
+        recent, historical = p_values[split:], p_values[:split]
+        n_recent = np.count_nonzero(~np.isnan(recent))
+        n_historical = np.count_nonzero(~np.isnan(historical))
+        recent_avg = np.nansum(recent) / n_recent if n_recent > 0 else np.nan
+        historical_avg = np.nansum(historical) / n_historical if n_historical > 0 else np.nan
+
+        enhanced['recent_trend'] = {
+            'recent_avg_pvalue': recent_avg,
+            'historical_avg_pvalue': historical_avg,
+            'relationship_strengthening': recent_avg < historical_avg
+        }
 
         # 6. Cointegration stability score (0-100)
         pct_coint = (rolling['p_value'] < 0.05).mean() * 100
@@ -308,23 +631,27 @@ def calculate_enhanced_metrics(results):
 
         # 7. Simple Sharpe ratio estimate
         # Based on z-score mean reversion
-        returns_estimate = []
-        for i in range(1, len(zscore)):
-            if abs(zscore.iloc[i-1]) > 2 and abs(zscore.iloc[i]) < abs(zscore.iloc[i-1]):
-                # Mean reversion occurred
-                returns_estimate.append(abs(zscore.iloc[i-1]) - abs(zscore.iloc[i]))
+        abs_z = np.abs(zscore)
+        prev_z, curr_z = abs_z[:-1], abs_z[1:]
+        # Mean reversion occurred: outside +/-2 and moved back toward zero
+        reverted = (prev_z > 2) & (curr_z < prev_z)
+        returns_estimate = prev_z[reverted] - curr_z[reverted]
 
-        if returns_estimate and len(returns_estimate) > 5:
+        if len(returns_estimate) > 5:
             mean_ret = np.mean(returns_estimate)
             std_ret = np.std(returns_estimate)
             enhanced['estimated_sharpe'] = (mean_ret / std_ret * np.sqrt(252)) if std_ret > 0 else 0
         else:
             enhanced['estimated_sharpe'] = None
 
-        # 8. Beta drift metrics
+        # 8. Beta drift metrics (one buffer of absolute beta changes)
+        beta_changes = np.abs(np.diff(rolling['beta'].to_numpy(dtype=np.float64)))
+        valid_changes = beta_changes[~np.isnan(beta_changes)]
+        recent_changes = beta_changes[-5:]
+        recent_changes = recent_changes[~np.isnan(recent_changes)]
         enhanced['beta_drift'] = {
-            'recent_beta_change': rolling['beta'].diff().tail(5).abs().mean(),
-            'max_beta_change': rolling['beta'].diff().abs().max(),
+            'recent_beta_change': recent_changes.mean() if recent_changes.size else np.nan,
+            'max_beta_change': valid_changes.max() if valid_changes.size else np.nan,
             'beta_cv': beta_cv
         }
 
@@ -344,7 +671,9 @@ def comprehensive_cointegration_analysis(
     use_llm=True,
     save_plots=True,
     plots_dir="plots",
-    backtest_method="walk_forward"
+    backtest_method="walk_forward",
+    data=None,
+    max_workers=None
 ):
     """
     Comprehensive cointegration analysis for pairs or baskets.
@@ -375,18 +704,27 @@ def comprehensive_cointegration_analysis(
         Directory to save plots
     backtest_method : str
         Backtesting method: "walk_forward", "train_test_split", or "simple" (default "walk_forward")
+    data : pd.DataFrame, optional
+        Log prices for tickers from get_close_price_data. When given, the
+        download step reuses them instead of fetching again.
+    max_workers : int, optional
+        Worker processes for plotting and the pair search (default: up to 3
+        for plots, one per CPU core for pairs); 1 renders plots inline and
+        uses no process pool, e.g. when called from a thread
 
     Returns:
     --------
     dict
         Comprehensive results dictionary containing all analysis outputs
+
+    Notes:
+    ------
+    With save_plots (and max_workers other than 1) the plots are rendered
+    in worker processes. On platforms that spawn rather than fork them
+    (macOS, Windows), scripts calling this function must do so under an
+    ``if __name__ == "__main__":`` guard.
     """
-    import os
     from data_loader import get_close_price_data
-    from rolling_analysis import (
-        rolling_cointegration_analysis,
-        analyze_spread_stability
-    )
     from visualization import (
         plot_price_series,
         plot_rolling_results,
@@ -403,9 +741,12 @@ def comprehensive_cointegration_analysis(
 
     # Download data
     total_steps = 6 if len(tickers) == 2 else 5
-    print(f"\n[1/{total_steps}] Downloading {period} of price data...")
-    data = get_close_price_data(tickers, period=period)
-    print(f"  Downloaded {len(data)} days of data")
+    if data is None:
+        print(f"\n[1/{total_steps}] Downloading {period} of price data...")
+        data = get_close_price_data(tickers, period=period)
+        print(f"  Downloaded {len(data)} days of data")
+    else:
+        print(f"\n[1/{total_steps}] Using {len(data)} days of preloaded price data")
 
     # Validate parameters
     try:
@@ -436,194 +777,222 @@ def comprehensive_cointegration_analysis(
     except ImportError:
         print("  (Parameter validation skipped - parameter_validator.py not found)")
 
-    # Initialize results dictionary
-    results = {
-        'tickers': tickers,
-        'is_pair': len(tickers) == 2,
-        'data': data,
-        'period': period,
-        'window': window,
-        'step_size': step_size
-    }
-
-    # Determine if pair or basket
-    is_pair = len(tickers) == 2
-
-    if is_pair:
-        # PAIR ANALYSIS
-        print(f"\n[2/{total_steps}] Running pair cointegration test (Engle-Granger)...")
-        score, p_value, crit_values = test_pair_cointegration(data)
-        beta, alpha = get_hedge_ratio(data)
-
-        results['cointegration'] = {
-            'score': score,
-            'p_value': p_value,
-            'critical_values': crit_values,
-            'hedge_ratio': beta,
-            'alpha': alpha,
-            'is_cointegrated': p_value < 0.05
-        }
+    # Plots are independent Agg renders: write them in worker processes
+    # while the analysis and backtest continue, or inline with max_workers=1
+    plot_pool = None
+    if save_plots and max_workers != 1:
+        plot_pool = ProcessPoolExecutor(max_workers=max_workers or min(3, os.cpu_count() or 1))
+    submit_plot = plot_pool.submit if plot_pool is not None else _serial_future
+    plot_futures = []
 
-        # Plot price series
-        if save_plots:
-            price_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_prices.png")
-            plot_price_series(data, title=f"{' vs '.join(tickers)} - Log Prices",
-                            save_path=price_plot_path)
+    try:
+        # Initialize results dictionary
+        results = {
+            'tickers': tickers,
+            'is_pair': len(tickers) == 2,
+            'data': data,
+            'period': period,
+            'window': window,
+            'step_size': step_size
+        }
 
-        # Spread analysis
-        print(f"\n[3/{total_steps}] Analyzing spread stability...")
-        stability = analyze_spread_stability(data, window=window, step_size=step_size)
-        results['spread_stability'] = stability
+        # Determine if pair or basket
+        is_pair = len(tickers) == 2
+
+        if is_pair:
+            # PAIR ANALYSIS
+            print(f"\n[2/{total_steps}] Running pair cointegration test (Engle-Granger)...")
+            score, p_value, crit_values = test_pair_cointegration(data)
+            beta, alpha = get_hedge_ratio(data)
+
+            results['cointegration'] = {
+                'score': score,
+                'p_value': p_value,
+                'critical_values': crit_values,
+                'hedge_ratio': beta,
+                'alpha': alpha,
+                'is_cointegrated': p_value < 0.05
+            }
 
-        if save_plots:
-            spread_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_spread_analysis.png")
-            plot_spread_analysis(data, hedge_ratio=beta, zscore_window=20,
-                               save_path=spread_plot_path)
+            # Plot price series
+            if save_plots:
+                price_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_prices.png")
+                plot_futures.append(submit_plot(
+                    plot_price_series, data, title=f"{' vs '.join(tickers)} - Log Prices",
+                    save_path=price_plot_path))
 
-        # Rolling analysis
-        print(f"\n[4/{total_steps}] Running rolling cointegration analysis...")
-        rolling_results = rolling_cointegration_analysis(data, window=window, step_size=step_size)
-        results['rolling_analysis'] = rolling_results
+            # Spread analysis
+            print(f"\n[3/{total_steps}] Analyzing spread stability...")
+            stability = analyze_spread_stability(data, window=window, step_size=step_size)
+            results['spread_stability'] = stability
 
-        if save_plots:
-            rolling_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_rolling_analysis.png")
-            plot_rolling_results(rolling_results, tickers, window=window, step_size=step_size,
-                               save_path=rolling_plot_path)
+            if save_plots:
+                spread_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_spread_analysis.png")
+                plot_futures.append(submit_plot(
+                    plot_spread_analysis, data, hedge_ratio=beta, zscore_window=20,
+                    save_path=spread_plot_path))
 
-        results['pairs_within'] = None
+            # Rolling analysis
+            print(f"\n[4/{total_steps}] Running rolling cointegration analysis...")
+            rolling_results = rolling_cointegration_analysis(data, window=window, step_size=step_size)
+            results['rolling_analysis'] = rolling_results
 
-    else:
-        # BASKET ANALYSIS
-        print(f"\n[2/{total_steps}] Running basket cointegration test (Johansen)...")
-        johansen_result, vectors_df, n_coint = analyze_basket(data, k_ar_diff=5, crit_level=1)
-
-        results['cointegration'] = {
-            'rank': n_coint,
-            'trace_stats': johansen_result.lr1,
-            'critical_values': johansen_result.cvt,
-            'cointegrating_vectors': vectors_df,
-            'is_cointegrated': n_coint > 0
-        }
+            if save_plots:
+                rolling_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_rolling_analysis.png")
+                plot_futures.append(submit_plot(
+                    plot_rolling_results, rolling_results, tickers, window=window,
+                    step_size=step_size, save_path=rolling_plot_path))
 
-        # Plot price series
-        if save_plots:
-            price_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_prices.png")
-            plot_price_series(data, title=f"Basket: {', '.join(tickers)} - Log Prices",
-                            save_path=price_plot_path)
-
-        # Find cointegrated pairs within basket
-        print(f"\n[3/{total_steps}] Finding cointegrated pairs within basket...")
-        data_dict = {"_".join(tickers): data}
-        pairs = find_cointegrated_pairs(tickers, data_dict, p_threshold=0.05)
-        results['pairs_within'] = pairs
-
-        # Rolling analysis
-        print(f"\n[4/{total_steps}] Running rolling cointegration analysis...")
-        rolling_results = rolling_cointegration_analysis(data, window=window, step_size=step_size)
-        results['rolling_analysis'] = rolling_results
-
-        if save_plots:
-            rolling_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_rolling_analysis.png")
-            plot_rolling_results(rolling_results, tickers, window=window, step_size=step_size,
-                               save_path=rolling_plot_path)
-
-        results['spread_stability'] = None
-
-    # Backtesting (for pairs only)
-    if is_pair:
-        print(f"\n[5/6] Running backtest strategy simulation...")
-        try:
-            from backtesting import (
-                backtest_pairs_strategy,
-                walk_forward_backtest,
-                backtest_with_train_test_split,
-                print_backtest_summary
-            )
-
-            # Run backtest based on selected method
-            if backtest_method == "walk_forward":
-                print("  Using walk-forward methodology (most robust)...")
-                backtest_result = walk_forward_backtest(
-                    data,
-                    train_window=min(252, len(data) // 3),  # 1 year or 1/3 of data
-                    test_window=min(63, len(data) // 10),   # 3 months or 1/10 of data
-                    step_size=21,  # Roll forward monthly
-                    entry_zscore=2.0,
-                    exit_zscore=0.5,
-                    stop_loss_zscore=4.0,
-                    transaction_cost=0.001,
-                    initial_capital=100000,
-                    zscore_window=20
-                )
-            elif backtest_method == "train_test_split":
-                print("  Using train/test split methodology...")
-                backtest_result = backtest_with_train_test_split(
-                    data,
-                    train_pct=0.6,
-                    entry_zscore=2.0,
-                    exit_zscore=0.5,
-                    stop_loss_zscore=4.0,
-                    transaction_cost=0.001,
-                    initial_capital=100000,
-                    zscore_window=20
-                )
-            else:  # simple
-                print("  Using simple backtest (WARNING: may have look-ahead bias if used incorrectly)...")
-                backtest_result = backtest_pairs_strategy(
-                    data,
-                    hedge_ratio=beta,
-                    entry_zscore=2.0,
-                    exit_zscore=0.5,
-                    stop_loss_zscore=4.0,
-                    transaction_cost=0.001,
-                    initial_capital=100000,
-                    zscore_window=20
-                )
+            results['pairs_within'] = None
 
-            results['backtest'] = backtest_result
-            results['backtest_method'] = backtest_method
+        else:
+            # BASKET ANALYSIS
+            print(f"\n[2/{total_steps}] Running basket cointegration test (Johansen)...")
+            johansen_result, vectors_df, n_coint = analyze_basket(data, k_ar_diff=5, crit_level=1)
+
+            results['cointegration'] = {
+                'rank': n_coint,
+                'trace_stats': johansen_result.lr1,
+                'critical_values': johansen_result.cvt,
+                'cointegrating_vectors': vectors_df,
+                'is_cointegrated': n_coint > 0
+            }
 
-            # Print summary
-            print_backtest_summary(backtest_result)
+            # Plot price series
+            if save_plots:
+                price_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_prices.png")
+                plot_futures.append(submit_plot(
+                    plot_price_series, data, title=f"Basket: {', '.join(tickers)} - Log Prices",
+                    save_path=price_plot_path))
+
+            # Find cointegrated pairs within basket
+            print(f"\n[3/{total_steps}] Finding cointegrated pairs within basket...")
+            data_dict = {"_".join(tickers): data}
+            pairs = find_cointegrated_pairs(tickers, data_dict, p_threshold=0.05,
+                                            max_workers=max_workers)
+            results['pairs_within'] = pairs
+
+            # Rolling analysis
+            print(f"\n[4/{total_steps}] Running rolling cointegration analysis...")
+            rolling_results = rolling_cointegration_analysis(data, window=window, step_size=step_size)
+            results['rolling_analysis'] = rolling_results
 
-            # Optionally save trades to CSV
             if save_plots:
-                # Handle different result formats
-                if 'method' in backtest_result:
-                    trades_df = backtest_result['trades']
-                    if backtest_method == "walk_forward":
-                        params_df = backtest_result['parameters_over_time']
-                        params_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_walkforward_parameters.csv")
-                        params_df.to_csv(params_path, index=False)
-                        print(f"\n  Saved parameter evolution to {params_path}")
-                elif 'trades' in backtest_result:
-                    trades_df = backtest_result['trades']
-
-                if len(trades_df) > 0:
-                    trades_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_backtest_trades.csv")
-                    trades_df.to_csv(trades_path, index=False)
-                    print(f"  Saved backtest trades to {trades_path}")
+                rolling_plot_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_rolling_analysis.png")
+                plot_futures.append(submit_plot(
+                    plot_rolling_results, rolling_results, tickers, window=window,
+                    step_size=step_size, save_path=rolling_plot_path))
+
+            results['spread_stability'] = None
+
+        # Backtesting (for pairs only)
+        if is_pair:
+            print(f"\n[5/6] Running backtest strategy simulation...")
+            try:
+                from backtesting import (
+                    backtest_pairs_strategy,
+                    walk_forward_backtest,
+                    backtest_with_train_test_split,
+                    print_backtest_summary
+                )
 
-        except Exception as e:
-            print(f"  ⚠ Could not run backtest: {e}")
-            import traceback
-            traceback.print_exc()
+                # Run backtest based on selected method
+                if backtest_method == "walk_forward":
+                    print("  Using walk-forward methodology (most robust)...")
+                    backtest_result = walk_forward_backtest(
+                        data,
+                        train_window=min(252, len(data) // 3),  # 1 year or 1/3 of data
+                        test_window=min(63, len(data) // 10),   # 3 months or 1/10 of data
+                        step_size=21,  # Roll forward monthly
+                        entry_zscore=2.0,
+                        exit_zscore=0.5,
+                        stop_loss_zscore=4.0,
+                        transaction_cost=0.001,
+                        initial_capital=100000,
+                        zscore_window=20
+                    )
+                elif backtest_method == "train_test_split":
+                    print("  Using train/test split methodology...")
+                    backtest_result = backtest_with_train_test_split(
+                        data,
+                        train_pct=0.6,
+                        entry_zscore=2.0,
+                        exit_zscore=0.5,
+                        stop_loss_zscore=4.0,
+                        transaction_cost=0.001,
+                        initial_capital=100000,
+                        zscore_window=20
+                    )
+                else:  # simple
+                    print("  Using simple backtest (WARNING: may have look-ahead bias if used incorrectly)...")
+                    backtest_result = backtest_pairs_strategy(
+                        data,
+                        hedge_ratio=beta,
+                        entry_zscore=2.0,
+                        exit_zscore=0.5,
+                        stop_loss_zscore=4.0,
+                        transaction_cost=0.001,
+                        initial_capital=100000,
+                        zscore_window=20
+                    )
+
+                results['backtest'] = backtest_result
+                results['backtest_method'] = backtest_method
+
+                # Print summary
+                print_backtest_summary(backtest_result)
+
+                # Optionally save trades to CSV
+                if save_plots:
+                    # Handle different result formats
+                    if 'method' in backtest_result:
+                        trades_df = backtest_result['trades']
+                        if backtest_method == "walk_forward":
+                            params_df = backtest_result['parameters_over_time']
+                            params_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_walkforward_parameters.csv")
+                            params_df.to_csv(params_path, index=False)
+                            print(f"\n  Saved parameter evolution to {params_path}")
+                    elif 'trades' in backtest_result:
+                        trades_df = backtest_result['trades']
+
+                    if len(trades_df) > 0:
+                        trades_path = os.path.join(plots_dir, f"{'_'.join(tickers)}_backtest_trades.csv")
+                        trades_df.to_csv(trades_path, index=False)
+                        print(f"  Saved backtest trades to {trades_path}")
+
+            except Exception as e:
+                print(f"  ⚠ Could not run backtest: {e}")
+                import traceback
+                traceback.print_exc()
+                results['backtest'] = None
+        else:
             results['backtest'] = None
-    else:
-        results['backtest'] = None
+
+        # Every plot is on disk before the interpretation step reports; a
+        # failed plot raises here as it would have when drawn inline
+        for future in plot_futures:
+            future.result()
+    finally:
+        # Never leave worker processes behind, even if a step above raised
+        if plot_pool is not None:
+            plot_pool.shutdown(cancel_futures=True)
 
     # LLM Interpretation
     print(f"\n[6/6] Generating comprehensive interpretation...")
     if use_llm:
         try:
-            from llm_interpreter import interpret_comprehensive_analysis
-            interpretation = interpret_comprehensive_analysis(results)
-            results['interpretation'] = interpretation
+            from llm_interpreter import interpret_comprehensive_analysis_stream
 
+            # Print the report as it is generated; the full text is kept in results
             print("\n" + "=" * 70)
             print("AI INTERPRETATION & TRADING STRATEGY:")
             print("=" * 70)
-            print(interpretation)
+            pieces = []
+            for piece in interpret_comprehensive_analysis_stream(results):
+                pieces.append(piece)
+                print(piece, end="", flush=True)
+            print()
+            results['interpretation'] = "".join(pieces).strip()
         except Exception as e:
             print(f"  ⚠ Could not generate LLM interpretation: {e}")
             results['interpretation'] = None
@@ -2,17 +2,119 @@
 Data loading and downloading utilities for stock price data.
 """
 
+import hashlib
 import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
 import yfinance as yf
 import pandas as pd
 import numpy as np
 
+# Parquet persistence needs pyarrow; fall back to CSV without it
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
 
-def get_close_price_data(tickers, period="1y", max_missing=25, log_prices=True, save_csv=True):
+# Daily on-disk cache of downloaded close prices (Parquet with pyarrow,
+# otherwise pickle so the test scripts stay deterministic offline too)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+def _cache_path(tickers, period):
+    """Cache file for (tickers, period), valid for the current calendar day."""
+    key = hashlib.sha1(",".join(tickers).encode()).hexdigest()[:12]
+    ext = "parquet" if _HAS_PARQUET else "pkl"
+    return os.path.join(CACHE_DIR, f"closes_{period}_{key}_{date.today().isoformat()}.{ext}")
+
+
+def _prune_cache():
+    """Delete cached closes from earlier days; only today's files are ever read."""
+    today = date.today().isoformat()
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith("closes_") and os.path.splitext(name)[0].rsplit("_", 1)[-1] != today:
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=32)
+def _download_prices(tickers, period):
+    """
+    Download close prices via yfinance, memoized per (tickers, period).
+
+    Repeated analyses of the same tickers within a session reuse the first
+    download instead of hitting the network again, and the closes are also
+    cached on disk for the rest of the day so later runs skip the network
+    entirely. Callers must not mutate the returned DataFrame.
+    """
+    cache = _cache_path(tickers, period)
+    if os.path.exists(cache):
+        return pd.read_parquet(cache) if _HAS_PARQUET else pd.read_pickle(cache)
+
+    # threads=True fetches the symbols of a multi-ticker request concurrently
+    data = yf.download(list(tickers), period=period, auto_adjust=True, threads=True,
+                       progress=False)
+
+    # Handle single ticker case
+    if len(tickers) == 1:
+        close_data = data[["Close"]]
+        close_data.columns = list(tickers)
+    else:
+        close_data = data["Close"]
+
+    # Never cache a failed download: empty, or a ticker that came back all
+    # NaN (a later run retries it instead of silently dropping it all day)
+    if not close_data.empty and not close_data.isna().all().any():
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            if _HAS_PARQUET:
+                close_data.to_parquet(cache, compression="zstd")
+            else:
+                close_data.to_pickle(cache)
+            _prune_cache()
+        except OSError as e:
+            print(f"  Could not write price cache: {e}")
+    return close_data
+
+
+def get_universe(tickers, period="1y"):
+    """
+    Download close prices for every unique ticker in one multi-symbol call.
+
+    Parameters:
+    -----------
+    tickers : list
+        List of stock tickers (duplicates are ignored)
+    period : str
+        Time period ("1y", "2y", "6mo", etc.)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Raw close prices, one column per ticker
+    """
+    unique = tuple(sorted(set(tickers)))
+    return _download_prices(unique, period).copy()
+
+
+def _read_prices(path):
+    """Read a saved basket file, Parquet or CSV depending on its extension."""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def get_close_price_data(tickers, period="1y", max_missing=25, log_prices=True, save_csv=True,
+                         universe=None):
     """
     Download close prices for a list of tickers and optionally save to CSV.
 
@@ -27,7 +129,10 @@ def get_close_price_data(tickers, period="1y", max_missing=25, log_prices=True,
     log_prices : bool
         Convert to log prices (default True)
     save_csv : bool
-        Save to CSV file (default True)
+        Save to disk (default True): Parquet when pyarrow is installed, else CSV
+    universe : pd.DataFrame, optional
+        Close prices from get_universe covering these tickers. When given,
+        columns are sliced from it instead of downloading again.
 
     Returns:
     --------
@@ -35,37 +140,51 @@ def get_close_price_data(tickers, period="1y", max_missing=25, log_prices=True,
         Close prices (log-transformed if specified)
     """
     try:
-        print(f"Downloading close prices for {len(tickers)} stocks...")
+        if universe is not None:
+            print(f"Selecting close prices for {len(tickers)} stocks...")
+            close_data = universe[list(tickers)]
+        else:
+            print(f"Downloading close prices for {len(tickers)} stocks...")
 
-        # Download data with auto_adjust=True to suppress warning
-        data = yf.download(tickers, period=period, auto_adjust=True, progress=False)
+            close_data = _download_prices(tuple(tickers), period)
 
-        # Handle single ticker case
-        if len(tickers) == 1:
-            close_data = data[["Close"]].copy()
-            close_data.columns = tickers
-        else:
-            close_data = data["Close"].copy()
+        # Single owned buffer for the whole pipeline; the cached download is never mutated
+        prices = close_data.to_numpy(dtype=np.float64, copy=True)
+        columns = close_data.columns
+        is_missing = np.isnan(prices)
 
         # Drop stocks with too many missing values
-        missing = close_data.isnull().sum()
-        stocks_to_drop = missing[missing > max_missing].index.tolist()
+        missing = is_missing.sum(axis=0)
+        drop_mask = missing > max_missing
 
-        if stocks_to_drop:
+        if drop_mask.any():
+            stocks_to_drop = columns[drop_mask].tolist()
             print(f"  Dropping {len(stocks_to_drop)} stocks with >{max_missing} missing values: {stocks_to_drop}")
-            close_data = close_data.drop(stocks_to_drop, axis=1)
+            prices = prices[:, ~drop_mask]
+            is_missing = is_missing[:, ~drop_mask]
+            columns = columns[~drop_mask]
 
-        # Forward fill remaining missing values
-        close_data = close_data.ffill()
+        # Forward fill remaining missing values from the last valid row
+        if is_missing.any():
+            last_valid = np.where(is_missing, 0, np.arange(len(prices))[:, None])
+            np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+            prices = prices[last_valid, np.arange(prices.shape[1])]
 
-        # Apply log transformation
+        # Apply log transformation in place before wrapping the array once
         if log_prices:
-            close_data = np.log(close_data)
+            np.log(prices, out=prices)
+
+        close_data = pd.DataFrame(prices, index=close_data.index, columns=columns)
 
-        # Save to CSV with ticker names in filename
+        # Save with ticker names in filename
         if save_csv:
-            filename = "_".join(close_data.columns.tolist()) + ".csv"
-            close_data.to_csv(filename)
+            basket_name = "_".join(close_data.columns.tolist())
+            if _HAS_PARQUET:
+                filename = basket_name + ".parquet"
+                close_data.to_parquet(filename, compression="snappy")
+            else:
+                filename = basket_name + ".csv"
+                close_data.to_csv(filename)
             print(f"  Saved to {filename}")
 
         print(f"  Final dataset: {len(close_data.columns)} stocks, {len(close_data)} days\n")
@@ -97,9 +216,15 @@ def download_all_baskets(basket_list, period="1y", max_missing=25):
     """
     all_data = {}
 
+    # One bulk request for every symbol; baskets are sliced from it locally
+    all_tickers = [ticker for basket in basket_list for ticker in basket]
+    print(f"Downloading close prices for {len(set(all_tickers))} unique stocks...")
+    universe = get_universe(all_tickers, period=period)
+
     for i, basket in enumerate(basket_list, 1):
         print(f"Basket {i}/{len(basket_list)}:")
-        data = get_close_price_data(basket, period=period, max_missing=max_missing)
+        data = get_close_price_data(basket, period=period, max_missing=max_missing,
+                                    universe=universe)
         if data is not None:
             basket_name = "_".join(data.columns.tolist())
             all_data[basket_name] = data
@@ -108,40 +233,51 @@ def download_all_baskets(basket_list, period="1y", max_missing=25):
     return all_data
 
 
-def load_all_csv(folder_path="."):
+def load_all_csv(folder_path=".", max_workers=8):
     """
-    Load all basket CSVs from folder into a dictionary of DataFrames.
+    Load all saved baskets from folder into a dictionary of DataFrames.
+
+    Parquet files are preferred over CSVs of the same basket.
 
     Parameters:
     -----------
     folder_path : str
-        Path to folder containing CSV files
+        Path to folder containing Parquet/CSV files
+    max_workers : int
+        Number of threads reading files concurrently (default 8)
 
     Returns:
     --------
     dict
         Dictionary mapping basket names to DataFrames
     """
-    dfs = {}
+    extensions = ('.parquet', '.csv') if _HAS_PARQUET else ('.csv',)
+    files = {}
     for file in os.listdir(folder_path):
-        if file.endswith('.csv') and '_' in file and file != 'data.csv':
-            basket_name = file.replace('.csv', '')
-            df = pd.read_csv(os.path.join(folder_path, file), index_col=0, parse_dates=True)
-            dfs[basket_name] = df
-    print(f"Loaded {len(dfs)} baskets from CSV files")
+        basket_name, ext = os.path.splitext(file)
+        if ext in extensions and '_' in file and file != 'data.csv':
+            if basket_name not in files or ext == '.parquet':
+                files[basket_name] = file
+    names = list(files)
+    paths = [os.path.join(folder_path, files[name]) for name in names]
+
+    # File reads are I/O bound, so overlap them on threads
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        dfs = dict(zip(names, executor.map(_read_prices, paths)))
+    print(f"Loaded {len(dfs)} baskets from saved files")
     return dfs
 
 
 def load_basket_csv(basket_name, folder_path="."):
     """
-    Load a specific basket CSV file.
+    Load a specific basket file, preferring Parquet over CSV.
 
     Parameters:
     -----------
     basket_name : str
-        Name of the basket (without .csv extension)
+        Name of the basket (without file extension)
     folder_path : str
-        Path to folder containing CSV file
+        Path to folder containing the basket file
 
     Returns:
     --------
@@ -149,8 +285,32 @@ def load_basket_csv(basket_name, folder_path="."):
         Price data for the basket
     """
     file_path = os.path.join(folder_path, f"{basket_name}.csv")
-    if os.path.exists(file_path):
+    parquet_path = os.path.join(folder_path, f"{basket_name}.parquet")
+    if _HAS_PARQUET and os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+    elif os.path.exists(file_path):
         return pd.read_csv(file_path, index_col=0, parse_dates=True)
     else:
         print(f"File not found: {file_path}")
         return None
+
+
+def main(argv=None):
+    """Download every configured basket from the command line."""
+    import argparse
+    from config import ALL_BASKETS
+
+    global CACHE_DIR
+    parser = argparse.ArgumentParser(description="Download close prices for all configured baskets.")
+    parser.add_argument("--period", default="1y", help='yfinance period, e.g. "6mo", "1y", "2y"')
+    parser.add_argument("--max-missing", type=int, default=25,
+                        help="maximum missing values allowed per stock")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="directory of the daily price cache")
+    args = parser.parse_args(argv)
+
+    CACHE_DIR = args.cache_dir
+    download_all_baskets(ALL_BASKETS, period=args.period, max_missing=args.max_missing)
+
+
+if __name__ == "__main__":
+    main()
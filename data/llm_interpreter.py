@@ -4,30 +4,389 @@ LLM Interpreter Module for Cointegration Analysis Results
 This module provides functions to interpret technical cointegration analysis results
 using GPT-4o-mini, translating statistical outputs into plain English explanations
 suitable for non-technical users.
+
+Every interpret_* function has an interpret_*_async twin, so independent
+interpretations can be awaited together with asyncio.gather and their API
+round trips overlap. Most also have an interpret_*_stream variant that yields
+the text in pieces as the model generates it, for interactive display.
+interpret_structured returns the short interpretations as JSON sections.
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
-from openai import OpenAI
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Union
+from stats_utils import mean_std
 
 # Load environment variables
 load_dotenv()
 
 
-def _get_openai_client():
-    """Initialize and return OpenAI client with API key from environment."""
+MODEL = "gpt-4o-mini"
+
+# Interpretations are sampled greedily (temperature 0, full top_p) so the
+# same statistics give the same text, which the response cache below relies
+# on. Requests reserve max_tokens of about 1.4 tokens per word the prompt
+# asks for (e.g. 220 for "under 150 words").
+TEMPERATURE = 0.0
+TOP_P = 1.0
+
+# Responses are cached by a hash of the full request. Identical prompts
+# (e.g. re-running an analysis on the same data) return without an API call;
+# call invalidate_cache() for fresh text.
+PROMPT_CACHE_DIR = Path("~/.cache/cointegration_llm").expanduser()
+PROMPT_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds; older disk entries are discarded
+MEMORY_CACHE_SIZE = 512
+
+# Optional approximate tier: when set to a number of significant figures,
+# a prompt that matches a cached one after rounding every decimal number to
+# that precision (e.g. p-value 0.0312 vs 0.0309 at 2 digits) reuses its
+# answer. Off by default, because the reused text quotes the cached numbers.
+APPROXIMATE_CACHE_DIGITS: Optional[int] = None
+_DECIMAL = re.compile(r"-?\d+\.\d+")
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()  # interpret_many_baskets shares the cache across threads
+
+# Maximum chat completions in flight at once from the async interpreters
+MAX_CONCURRENT_REQUESTS = 10
+
+# Rolling/stability frames with fewer rows (windows) than this are reported
+# as too short instead of being sent to the model
+MIN_ROWS_FOR_INTERPRETATION = 10
+
+# Retries for transient failures (429 rate limits, 408/409, 5xx, dropped
+# connections, timeouts). The OpenAI client waits with exponential backoff
+# plus jitter between attempts and honours Retry-After. Failures that remain
+# are reported as "Error calling OpenAI API: ..." text; configuration errors
+# (missing or rejected API key, malformed request) are raised instead.
+MAX_RETRIES = 5
+REQUEST_TIMEOUT = 60.0  # seconds per attempt
+
+# Per-event-loop AsyncOpenAI client and semaphore (neither can cross loops)
+_async_state = weakref.WeakKeyDictionary()
+
+_BLANK_LINES = re.compile(r"\n(?:[ \t]*\n){2,}")
+
+# Shared by every request; built once and kept free of indentation so no
+# input tokens are spent on whitespace
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are an expert quantitative analyst specializing in statistical arbitrage and pairs trading. "
+        "You have deep knowledge of cointegration theory, time series analysis, and practical trading "
+        "implementation. Provide detailed, technical, and actionable insights backed by the specific "
+        "data provided."
+    ),
+}
+
+
+# Comprehensive-report instructions. They are identical on every call and come
+# before the per-run statistics, so the shared prompt prefix can be served from
+# OpenAI's prompt cache (requests are routed together via prompt_cache_key).
+_COMPREHENSIVE_PAIR_INSTRUCTIONS = """You are a quantitative trading analyst providing a comprehensive cointegration analysis report for a pair of stocks. The pair and all of its statistics are listed after these instructions.
+
+PROVIDE A DETAILED ANALYSIS:
+
+1. STATISTICAL ASSESSMENT (4-5 sentences)
+   - Interpret the cointegration strength (p-value in context)
+   - Discuss the half-life and its implications for trading frequency (5 days is fast, 50+ days is slow)
+   - Evaluate the stability score and what drives it
+   - Assess current z-score position - is there an opportunity now?
+   - Comment on whether the relationship is strengthening or weakening
+
+2. HEDGE RATIO & POSITION SIZING (3-4 sentences)
+   - Interpret the static hedge ratio: "For every $1 of the first stock, use $<hedge ratio> of the second stock"
+   - Evaluate hedge ratio stability using CV (CV < 10% is very stable, 10-20% is moderate, >20% is unstable)
+   - Recommend static vs dynamic hedge ratio approach based on CV
+   - Provide specific position sizing guidance
+
+3. DETAILED TRADING STRATEGY (6-8 sentences)
+   - Recommend specific z-score entry thresholds (justify based on distribution)
+   - Recommend specific z-score exit thresholds
+   - Suggest stop-loss levels
+   - Expected holding period based on half-life
+   - Estimated trade frequency based on historical opportunities
+   - Position sizing formula with concrete example ($100k capital)
+   - Transaction cost considerations
+   - When to rebalance the hedge ratio
+
+4. BACKTESTING INTERPRETATION (3-4 sentences, if available)
+   - Evaluate the Sharpe ratio (>1.0 is good, >2.0 is excellent)
+   - Assess the win rate and profit factor
+   - Discuss max drawdown tolerance
+   - Compare theoretical vs actual performance
+
+5. RISK ANALYSIS (4-5 sentences)
+   - Key risks based on stability metrics
+   - Beta drift scenarios and impact
+   - Market conditions that could break the relationship
+   - Maximum position size recommendations
+   - When to stop trading this pair
+
+6. CURRENT ACTION (2-3 sentences)
+   - Based on the current z-score, what should a trader do RIGHT NOW?
+   - Specific entry/exit recommendation
+   - Expected return and timeframe
+
+Total: 1500-1800 words. Be extremely specific with numbers, thresholds, and dollar amounts. Provide actionable, implementable advice.
+"""
+
+_COMPREHENSIVE_BASKET_INSTRUCTIONS = """You are a quantitative trading analyst providing a comprehensive cointegration analysis report for a basket of stocks. The basket and all of its statistics are listed after these instructions.
+
+Please provide:
+
+1. RELATIONSHIP ASSESSMENT (2-3 sentences)
+   - Overall strength of cointegration within the basket
+   - Stability over time based on rolling analysis
+   - Which stocks drive the cointegrating relationships
+
+2. COINTEGRATING VECTOR INTERPRETATION (2-3 sentences)
+   - What the hedge ratios tell us about the relationships
+   - How to construct a mean-reverting portfolio
+   - Which stocks to long vs short based on the vector
+
+3. TRADING STRATEGY RECOMMENDATIONS (4-5 sentences)
+   - Specific basket trading strategy if appropriate
+   - Whether to trade the full basket or focus on pairs
+   - If pairs are found, which pair(s) offer best opportunities
+   - Entry/exit signals and position sizing
+   - Portfolio construction using the cointegrating vector
+
+4. RISKS AND LIMITATIONS (2-3 sentences)
+   - Key risks for this basket strategy
+   - Stability concerns from rolling analysis
+   - Market conditions to monitor
+
+Keep the total response under 500 words. Be specific and actionable. Provide concrete trading recommendations based on the data.
+"""
+
+
+# Instructions for the short interpretations, placed ahead of the data for
+# the same reason as the comprehensive ones: the fixed text forms a shared
+# prompt prefix and only the statistics after it change between calls.
+_ROLLING_PAIR_INSTRUCTIONS = """Explain the rolling cointegration analysis results below to a non-technical investor.
+
+Please explain:
+1. What this means for the relationship between these stocks
+2. Whether this indicates a stable or unstable relationship
+3. Implications for portfolio diversification and risk
+4. Whether these stocks tend to move together or independently
+
+Keep it under 200 words and avoid jargon.
+"""
+
+_ROLLING_BASKET_INSTRUCTIONS = """Explain the rolling cointegration analysis results below to a non-technical investor.
+
+Please explain:
+1. What this means for the relationship between these stocks
+2. Whether this indicates a stable or unstable relationship (consider p-values and how often cointegration occurs)
+3. If cointegrating vectors are provided, explain what the hedge ratios mean for portfolio construction
+4. Implications for portfolio diversification and risk
+5. Whether these stocks tend to move together or independently
+
+Keep it under 250 words and avoid excessive jargon, but be specific about the statistical findings.
+"""
+
+_BASKET_COINTEGRATION_INSTRUCTIONS = """Explain the cointegration test results for multiple stock baskets below to a non-technical investor.
+
+Please explain:
+1. What cointegration rank means (higher = stronger relationship)
+2. Which baskets show the strongest relationships
+3. What this means for portfolio construction
+4. Practical implications for an investor
+
+Keep it under 200 words and use simple language.
+"""
+
+_PAIRS_INSTRUCTIONS = """Explain the cointegrated stock pairs below to a non-technical investor.
+
+Please explain:
+1. What it means for two stocks to be "cointegrated"
+2. Which pairs show the strongest relationship (lower p-value = stronger)
+3. Practical trading or hedging opportunities
+4. Why investors might care about these relationships
+
+Keep it under 200 words and use simple language.
+"""
+
+
+def _get_api_key() -> str:
+    """Read the OpenAI API key from the environment."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key or api_key.strip() == "":
         raise ValueError(
             "OPENAI_API_KEY not found in environment variables. "
             "Please set it in your .env file or environment."
         )
-    return OpenAI(api_key=api_key)
+    return api_key
+
+
+@lru_cache(maxsize=1)
+def _openai_client_for_key(api_key: str):
+    """One OpenAI client per API key, so its HTTP connection pool is reused across calls."""
+    # openai is imported on first use; it is slow to import and unneeded for cache hits
+    from openai import OpenAI
+    return OpenAI(api_key=api_key, max_retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT)
 
 
-def _call_gpt4o_mini(prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+def _get_openai_client():
+    """Return the shared OpenAI client for the API key in the environment."""
+    return _openai_client_for_key(_get_api_key())
+
+
+def _get_async_openai_client():
+    """Return the AsyncOpenAI client and request semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _async_state:
+        from openai import AsyncOpenAI
+        _async_state[loop] = (
+            AsyncOpenAI(api_key=_get_api_key(), max_retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT),
+            asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        )
+    return _async_state[loop]
+
+
+def _compact(prompt: str) -> str:
+    """Drop the surrounding newlines and stacked blank lines left by the prompt templates (they cost input tokens)."""
+    return _BLANK_LINES.sub("\n\n", prompt.strip())
+
+
+def _messages(prompt: str) -> List[Dict[str, str]]:
+    """Chat messages for a prompt: the analyst system prompt plus the user prompt."""
+    return [_SYSTEM_MESSAGE, {"role": "user", "content": _compact(prompt)}]
+
+
+def _optional_args(prompt_cache_key: Optional[str] = None,
+                   response_format: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Extra create() arguments: prompt-cache routing and response format, when given."""
+    args = {}
+    if prompt_cache_key:
+        args["prompt_cache_key"] = prompt_cache_key
+    if response_format:
+        args["response_format"] = response_format
+    return args
+
+
+def _cache_key(prompt: str, max_tokens: int, temperature: float) -> str:
+    """BLAKE2b digest of everything that determines a chat completion."""
+    payload = json.dumps(
+        {"m": MODEL, "msgs": _messages(prompt), "t": temperature, "p": TOP_P, "n": max_tokens},
+        sort_keys=True
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _approximate_prompt(prompt: str, digits: int) -> str:
+    """The prompt with every decimal number rounded to `digits` significant figures."""
+    return _DECIMAL.sub(lambda match: f"{float(match.group()):.{digits}g}", prompt)
+
+
+def _cache_keys(prompt: str, max_tokens: int, temperature: float) -> List[str]:
+    """Cache keys for a request: the exact key, then the approximate one when enabled."""
+    keys = [_cache_key(prompt, max_tokens, temperature)]
+    if APPROXIMATE_CACHE_DIGITS is not None:
+        keys.append(_cache_key(_approximate_prompt(prompt, APPROXIMATE_CACHE_DIGITS), max_tokens, temperature))
+    return keys
+
+
+def _lookup(keys: List[str]) -> Optional[str]:
+    """First cached response among keys, most specific first."""
+    for key in keys:
+        text = _cached_response(key)
+        if text is not None:
+            return text
+    return None
+
+
+def _store_responses(keys: List[str], text: str) -> None:
+    """Cache a response under each of its keys."""
+    for key in keys:
+        _store_response(key, text)
+
+
+def _cached_response(key: str) -> Optional[str]:
+    """Look a response up in memory, then on disk; None on a miss."""
+    with _memory_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+    path = PROMPT_CACHE_DIR / key
+    try:
+        if time.time() - path.stat().st_mtime > PROMPT_CACHE_MAX_AGE:
+            path.unlink()
+            return None
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    _remember(key, text)
+    return text
+
+
+def _remember(key: str, text: str) -> None:
+    """Insert into the in-memory LRU, evicting the oldest entry when full."""
+    with _memory_lock:
+        _memory_cache[key] = text
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _store_response(key: str, text: str) -> None:
+    """Cache a successful response in memory and atomically on disk."""
+    _remember(key, text)
+    try:
+        PROMPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = PROMPT_CACHE_DIR / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, PROMPT_CACHE_DIR / key)
+    except OSError:
+        pass
+
+
+def invalidate_cache() -> None:
+    """Drop all cached LLM responses, in memory and on disk."""
+    with _memory_lock:
+        _memory_cache.clear()
+    if PROMPT_CACHE_DIR.is_dir():
+        for path in PROMPT_CACHE_DIR.iterdir():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _response_text(raw_response) -> str:
+    """
+    Message text of a raw chat completion response.
+
+    Only the message content is used, so the JSON body is decoded directly
+    rather than validated into the SDK's ChatCompletion model.
+    """
+    return json.loads(raw_response.content)["choices"][0]["message"]["content"].strip()
+
+
+def _raise_if_fatal(error: Exception) -> None:
+    """Re-raise errors that no retry can fix: a rejected API key or a malformed request."""
+    import openai
+    if isinstance(error, (openai.AuthenticationError, openai.PermissionDeniedError, openai.BadRequestError)):
+        raise error
+
+
+def _call_gpt4o_mini(prompt: str, max_tokens: int = 500, temperature: float = TEMPERATURE,
+                     prompt_cache_key: Optional[str] = None,
+                     response_format: Optional[Dict[str, str]] = None) -> str:
     """
     Call GPT-4o-mini API with the given prompt.
 
@@ -35,187 +394,378 @@ def _call_gpt4o_mini(prompt: str, max_tokens: int = 500, temperature: float = 0.
         prompt: The prompt to send to the model
         max_tokens: Maximum tokens in the response
         temperature: Sampling temperature (lower = more focused)
+        prompt_cache_key: Optional routing key for OpenAI's prompt cache; requests
+            sharing a long fixed prefix should share a key
+        response_format: Optional response format, e.g. {"type": "json_object"}
+            (the prompt must then ask for JSON)
 
     Returns:
         The model's response as a string
     """
+    keys = _cache_keys(prompt, max_tokens, temperature)
+    cached = _lookup(keys)
+    if cached is not None:
+        return cached
+
+    client = _get_openai_client()
     try:
-        client = _get_openai_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert quantitative analyst specializing in statistical arbitrage
-                    and pairs trading. You have deep knowledge of cointegration theory, time series analysis,
-                    and practical trading implementation. Provide detailed, technical, and actionable insights
-                    backed by the specific data provided."""
-                },
-                {"role": "user", "content": prompt}
-            ],
+        response = client.chat.completions.with_raw_response.create(
+            model=MODEL,
+            messages=_messages(prompt),
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            top_p=TOP_P,
+            **_optional_args(prompt_cache_key, response_format)
         )
-        return response.choices[0].message.content.strip()
+        text = _response_text(response)
     except Exception as e:
+        _raise_if_fatal(e)
         return f"Error calling OpenAI API: {str(e)}"
 
+    _store_responses(keys, text)
+    return text
 
-def interpret_rolling_analysis(results_df: pd.DataFrame, tickers: List[str]) -> str:
+
+async def _call_gpt4o_mini_async(prompt: str, max_tokens: int = 500, temperature: float = TEMPERATURE,
+                                 prompt_cache_key: Optional[str] = None,
+                                 response_format: Optional[Dict[str, str]] = None) -> str:
     """
-    Interpret rolling cointegration analysis results.
+    Non-blocking version of _call_gpt4o_mini.
 
-    Args:
-        results_df: DataFrame with rolling analysis results (from rolling_cointegration_analysis)
-        tickers: List of ticker symbols analyzed
+    At most MAX_CONCURRENT_REQUESTS calls are in flight per event loop, to
+    stay within the account's rate limits when many interpretations are
+    gathered at once.
+    """
+    keys = _cache_keys(prompt, max_tokens, temperature)
+    cached = _lookup(keys)
+    if cached is not None:
+        return cached
+
+    client, semaphore = _get_async_openai_client()
+    try:
+        async with semaphore:
+            response = await client.chat.completions.with_raw_response.create(
+                model=MODEL,
+                messages=_messages(prompt),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=TOP_P,
+                **_optional_args(prompt_cache_key, response_format)
+            )
+        text = _response_text(response)
+    except Exception as e:
+        _raise_if_fatal(e)
+        return f"Error calling OpenAI API: {str(e)}"
+
+    _store_responses(keys, text)
+    return text
+
+
+def _stream_gpt4o_mini(prompt: str, max_tokens: int = 500, temperature: float = TEMPERATURE,
+                       prompt_cache_key: Optional[str] = None) -> Iterator[str]:
+    """
+    Streaming version of _call_gpt4o_mini: yield the response text as it is generated.
+
+    A cached response is yielded in one piece. The complete text is cached
+    once the stream finishes; an error ends the stream with the usual
+    "Error calling OpenAI API" message.
+    """
+    keys = _cache_keys(prompt, max_tokens, temperature)
+    cached = _lookup(keys)
+    if cached is not None:
+        yield cached
+        return
+
+    pieces = []
+    client = _get_openai_client()
+    try:
+        stream = client.chat.completions.create(
+            model=MODEL,
+            messages=_messages(prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=TOP_P,
+            stream=True,
+            **_optional_args(prompt_cache_key)
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                pieces.append(chunk.choices[0].delta.content)
+                yield pieces[-1]
+    except Exception as e:
+        _raise_if_fatal(e)
+        yield f"Error calling OpenAI API: {str(e)}"
+        return
+
+    _store_responses(keys, "".join(pieces).strip())
+
+
+async def _stream_gpt4o_mini_async(prompt: str, max_tokens: int = 500, temperature: float = TEMPERATURE,
+                                   prompt_cache_key: Optional[str] = None) -> AsyncIterator[str]:
+    """Async counterpart of _stream_gpt4o_mini (holds a request slot until the stream ends)."""
+    keys = _cache_keys(prompt, max_tokens, temperature)
+    cached = _lookup(keys)
+    if cached is not None:
+        yield cached
+        return
+
+    pieces = []
+    client, semaphore = _get_async_openai_client()
+    try:
+        async with semaphore:
+            stream = await client.chat.completions.create(
+                model=MODEL,
+                messages=_messages(prompt),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=TOP_P,
+                stream=True,
+                **_optional_args(prompt_cache_key)
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    pieces.append(chunk.choices[0].delta.content)
+                    yield pieces[-1]
+    except Exception as e:
+        _raise_if_fatal(e)
+        yield f"Error calling OpenAI API: {str(e)}"
+        return
+
+    _store_responses(keys, "".join(pieces).strip())
+
+
+def _complete(request: Union[str, Dict[str, Any]]) -> str:
+    """Run a request built by one of the *_request helpers (text is returned as-is)."""
+    if isinstance(request, str):
+        return request
+    return _call_gpt4o_mini(**request)
+
+
+def _stream(request: Union[str, Dict[str, Any]]) -> Iterator[str]:
+    """Streaming counterpart of _complete (text is yielded as a single piece)."""
+    if isinstance(request, str):
+        return iter((request,))
+    return _stream_gpt4o_mini(**request)
+
+
+async def _complete_async(request: Union[str, Dict[str, Any]]) -> str:
+    """Async counterpart of _complete."""
+    if isinstance(request, str):
+        return request
+    return await _call_gpt4o_mini_async(**request)
+
+
+def _pct(mask: np.ndarray) -> float:
+    """Percentage of True entries in a boolean array (NaN when empty)."""
+    return np.count_nonzero(mask) / mask.size * 100 if mask.size else np.nan
+
+
+def _smallest_positions(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k smallest non-NaN values, ascending (ties by position).
+
+    Partitions in O(N) and sorts only the k selected entries, instead of
+    ordering the whole column as DataFrame.nsmallest does.
+    """
+    positions = np.flatnonzero(~np.isnan(values))
+    if positions.size > k:
+        positions = positions[np.argpartition(values[positions], k - 1)[:k]]
+    return positions[np.lexsort((positions, values[positions]))]
+
+
+def _pair_rolling_stats(rolling: pd.DataFrame):
+    """
+    Summarize a rolling pair analysis from one pass over each column.
 
     Returns:
-        Plain English interpretation of the results
+        (pct_cointegrated, avg_pvalue, avg_beta, beta_std), matching the
+        pandas reductions (NaN-skipping, sample standard deviation)
     """
+    pv = rolling['p_value'].to_numpy(dtype=np.float64)
+    avg_beta, beta_std = mean_std(rolling['beta'].to_numpy(dtype=np.float64))
+    return _pct(pv < 0.05), np.nanmean(pv), avg_beta, beta_std
+
+
+def _rolling_analysis_request(results_df: pd.DataFrame, tickers: List[str]) -> Union[str, Dict[str, Any]]:
+    """Build the chat request for interpret_rolling_analysis, or the final text when there is too little data."""
+    tickers_str = ", ".join(tickers)
+    if len(results_df) < MIN_ROWS_FOR_INTERPRETATION:
+        return f"Insufficient data ({len(results_df)} rolling windows) to interpret rolling cointegration for {tickers_str}."
     # Check if this is a pair (has p_value) or basket (has coint_rank)
     is_pair = 'p_value' in results_df.columns
 
     if is_pair:
         # For pairs: use p_value based metrics
-        pct_cointegrated = (results_df['p_value'] < 0.05).mean() * 100
-        avg_pvalue = results_df['p_value'].mean()
-        avg_beta = results_df['beta'].mean()
-        beta_std = results_df['beta'].std()
+        pct_cointegrated, avg_pvalue, avg_beta, beta_std = _pair_rolling_stats(results_df)
+        if np.isnan(avg_pvalue) or np.isnan(avg_beta):
+            return f"Rolling statistics for {tickers_str} contain no valid windows; check data quality."
 
-        prompt = f"""
-Explain these rolling cointegration analysis results for stocks {', '.join(tickers)} to a non-technical investor:
+        prompt = f"""{_ROLLING_PAIR_INSTRUCTIONS}
+Stocks: {tickers_str}
 
 Key Statistics:
 - Stocks were cointegrated {pct_cointegrated:.1f}% of the time periods analyzed
 - Average p-value: {avg_pvalue:.3f}
 - Average hedge ratio: {avg_beta:.3f} ± {beta_std:.3f}
 - Total number of stocks: {len(tickers)}
-
-Please explain:
-1. What this means for the relationship between these stocks
-2. Whether this indicates a stable or unstable relationship
-3. Implications for portfolio diversification and risk
-4. Whether these stocks tend to move together or independently
-
-Keep it under 200 words and avoid jargon.
 """
     else:
         # For baskets: use coint_rank based metrics
-        avg_rank = results_df['coint_rank'].mean()
-        pct_cointegrated = (results_df['coint_rank'] > 0).mean() * 100
-        max_rank = results_df['coint_rank'].max()
-
-        # Extract p-value and critical value information if available
-        avg_pvalue = results_df['p_value_approx'].mean() if 'p_value_approx' in results_df.columns else None
-        avg_trace = results_df['trace_stat'].mean()
-        avg_crit_95 = results_df['crit_val_95'].mean() if 'crit_val_95' in results_df.columns else None
-
-        # Extract cointegrating vectors info
-        vector_cols = [col for col in results_df.columns if '_v1' in col]
-        has_vectors = len(vector_cols) > 0
-
-        # Build hedge ratio info string
+        ranks = results_df['coint_rank'].to_numpy()
+        cointegrated = ranks > 0
+        avg_rank = np.nanmean(ranks)
+        pct_cointegrated = _pct(cointegrated)
+        max_rank = np.nanmax(ranks)
+
+        # Average the test statistics that are present in a single pass over
+        # one float block (p-value and critical value columns are optional)
+        columns = results_df.columns
+        stat_cols = [col for col in ('p_value_approx', 'trace_stat', 'crit_val_95') if col in columns]
+        stat_means = dict(zip(stat_cols, np.nanmean(results_df[stat_cols].to_numpy(dtype=np.float64), axis=0)))
+        avg_pvalue = stat_means.get('p_value_approx')
+        avg_trace = stat_means['trace_stat']
+        avg_crit_95 = stat_means.get('crit_val_95')
+
+        # Extract cointegrating vectors info (column match done by the string accessor)
+        vector_cols = columns[columns.astype(str).str.endswith('_v1')]
+        stock_names = vector_cols.astype(str).str.removesuffix('_v1')
+
+        # Build hedge ratio info string from the average first cointegrating
+        # vector over the cointegrated windows, one reduction for all stocks
         hedge_info = ""
-        if has_vectors:
-            # Get average weights from first cointegrating vector when it exists
-            coint_windows = results_df[results_df['coint_rank'] > 0]
-            if len(coint_windows) > 0:
-                avg_weights = {}
-                for col in vector_cols:
-                    stock = col.replace('_v1', '')
-                    avg_weights[stock] = coint_windows[col].mean()
-
-                hedge_info = "\n\nCointegrating Vector (average hedge ratios when cointegrated):\n"
-                for stock, weight in avg_weights.items():
-                    hedge_info += f"- {stock}: {weight:.3f}\n"
+        if len(vector_cols) and cointegrated.any():
+            avg_weights = np.nanmean(results_df[vector_cols].to_numpy(dtype=np.float64)[cointegrated], axis=0)
+            hedge_info = "\n\nCointegrating Vector (average hedge ratios when cointegrated):\n" + "".join(
+                f"- {stock}: {weight:.3f}\n" for stock, weight in zip(stock_names, avg_weights)
+            )
 
         pvalue_info = f"\n- Average approximate p-value: {avg_pvalue:.3f}" if avg_pvalue else ""
         trace_info = f"\n- Average trace statistic: {avg_trace:.2f}"
         crit_info = f"\n- Average 95% critical value: {avg_crit_95:.2f}" if avg_crit_95 else ""
 
-        prompt = f"""
-Explain these rolling cointegration analysis results for stocks {', '.join(tickers)} to a non-technical investor:
+        prompt = f"""{_ROLLING_BASKET_INSTRUCTIONS}
+Stocks: {tickers_str}
 
 Key Statistics:
 - Average cointegration rank: {avg_rank:.2f}
 - Maximum cointegration rank observed: {max_rank}
 - Stocks were cointegrated {pct_cointegrated:.1f}% of the time periods analyzed{pvalue_info}{trace_info}{crit_info}
 - Total number of stocks: {len(tickers)}{hedge_info}
-
-Please explain:
-1. What this means for the relationship between these stocks
-2. Whether this indicates a stable or unstable relationship (consider p-values and how often cointegration occurs)
-3. If cointegrating vectors are provided, explain what the hedge ratios mean for portfolio construction
-4. Implications for portfolio diversification and risk
-5. Whether these stocks tend to move together or independently
-
-Keep it under 250 words and avoid excessive jargon, but be specific about the statistical findings.
 """
 
-    return _call_gpt4o_mini(prompt, max_tokens=400)
+    return dict(prompt=prompt, max_tokens=280 if is_pair else 350)
 
 
-def interpret_basket_cointegration(summary_df: pd.DataFrame) -> str:
+def interpret_rolling_analysis(results_df: pd.DataFrame, tickers: List[str]) -> str:
     """
-    Interpret basket-level cointegration test results.
+    Interpret rolling cointegration analysis results.
 
     Args:
-        summary_df: Summary DataFrame from test_basket_cointegration
+        results_df: DataFrame with rolling analysis results (from rolling_cointegration_analysis)
+        tickers: List of ticker symbols analyzed
 
     Returns:
         Plain English interpretation of the results
     """
-    cointegrated = summary_df[summary_df['Coint_Rank'] > 0]
+    return _complete(_rolling_analysis_request(results_df, tickers))
+
+
+async def interpret_rolling_analysis_async(results_df: pd.DataFrame, tickers: List[str]) -> str:
+    """Async variant of interpret_rolling_analysis; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_rolling_analysis_request(results_df, tickers))
+
+
+def interpret_rolling_analysis_stream(results_df: pd.DataFrame, tickers: List[str]) -> Iterator[str]:
+    """Streaming variant of interpret_rolling_analysis; yields the text in pieces as it is generated."""
+    return _stream(_rolling_analysis_request(results_df, tickers))
+
+
+def _basket_cointegration_request(summary_df: pd.DataFrame) -> Union[str, Dict[str, Any]]:
+    """Build the chat request for interpret_basket_cointegration, or the final text when there are no baskets."""
+    if len(summary_df) == 0:
+        return "No basket test results to interpret."
+
     total_baskets = len(summary_df)
-    cointegrated_count = len(cointegrated)
-
-    # Format basket info
-    basket_info = []
-    for _, row in summary_df.iterrows():
-        basket_info.append(
-            f"- {row['Basket']}: Rank {row['Coint_Rank']}, "
-            f"{row['Num_Stocks']} stocks, p-value {row['P_Value']:.3f}"
-        )
+    cointegrated_count = np.count_nonzero(summary_df['Coint_Rank'].to_numpy() > 0)
 
-    basket_details = "\n".join(basket_info[:10])  # Limit to first 10
+    # Format basket info (first 10), one column at a time
+    shown = summary_df.head(10)
+    basket_info = (
+        "- " + shown['Basket'].astype(str) + ": Rank " + shown['Coint_Rank'].astype(str) + ", "
+        + shown['Num_Stocks'].astype(str) + " stocks, p-value " + shown['P_Value'].map("{:.3f}".format)
+    )
 
-    prompt = f"""
-Explain these cointegration test results for multiple stock baskets to a non-technical investor:
+    basket_details = "\n".join(basket_info)
 
+    prompt = f"""{_BASKET_COINTEGRATION_INSTRUCTIONS}
 Overall Summary:
 - Total baskets analyzed: {total_baskets}
 - Baskets showing cointegration: {cointegrated_count}
 
 Basket Details:
 {basket_details}
+"""
 
-Please explain:
-1. What cointegration rank means (higher = stronger relationship)
-2. Which baskets show the strongest relationships
-3. What this means for portfolio construction
-4. Practical implications for an investor
+    return dict(prompt=prompt, max_tokens=280)
 
-Keep it under 200 words and use simple language.
-"""
 
-    return _call_gpt4o_mini(prompt, max_tokens=400)
+def interpret_basket_cointegration(summary_df: pd.DataFrame) -> str:
+    """
+    Interpret basket-level cointegration test results.
 
+    Args:
+        summary_df: Summary DataFrame from test_basket_cointegration
 
-def interpret_spread_stability(stability_df: pd.DataFrame, tickers: List[str]) -> str:
+    Returns:
+        Plain English interpretation of the results
     """
-    Interpret spread stability analysis results.
+    return _complete(_basket_cointegration_request(summary_df))
+
+
+async def interpret_basket_cointegration_async(summary_df: pd.DataFrame) -> str:
+    """Async variant of interpret_basket_cointegration; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_basket_cointegration_request(summary_df))
+
+
+def interpret_basket_cointegration_stream(summary_df: pd.DataFrame) -> Iterator[str]:
+    """Streaming variant of interpret_basket_cointegration; yields the text in pieces as it is generated."""
+    return _stream(_basket_cointegration_request(summary_df))
+
+
+def interpret_many_baskets(summary_dfs: List[pd.DataFrame], max_workers: int = 8) -> List[str]:
+    """
+    Interpret several basket summaries concurrently.
+
+    The calls are network-bound and the OpenAI client releases the GIL while
+    waiting, so a thread pool overlaps them; concurrency is capped at
+    MAX_CONCURRENT_REQUESTS to stay within the account's rate limits.
 
     Args:
-        stability_df: DataFrame from analyze_spread_stability
-        tickers: List of the two ticker symbols
+        summary_dfs: Summary DataFrames from test_basket_cointegration
+        max_workers: Maximum number of requests in flight
 
     Returns:
-        Plain English interpretation of hedge ratio stability
+        Interpretations in the same order as summary_dfs
     """
-    avg_hedge = stability_df['hedge_ratio'].mean()
-    std_hedge = stability_df['hedge_ratio'].std()
-    min_hedge = stability_df['hedge_ratio'].min()
-    max_hedge = stability_df['hedge_ratio'].max()
+    workers = max(1, min(max_workers, MAX_CONCURRENT_REQUESTS, len(summary_dfs)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(interpret_basket_cointegration, summary_dfs))
+
+
+async def interpret_many_baskets_async(summary_dfs: List[pd.DataFrame]) -> List[str]:
+    """Async variant of interpret_many_baskets (concurrency is bounded by MAX_CONCURRENT_REQUESTS)."""
+    return list(await asyncio.gather(*(interpret_basket_cointegration_async(df) for df in summary_dfs)))
+
+
+def _spread_stability_request(stability_df: pd.DataFrame, tickers: List[str]) -> Union[str, Dict[str, Any]]:
+    """Build the chat request for interpret_spread_stability, or the final text when there is too little data."""
+    if len(stability_df) < MIN_ROWS_FOR_INTERPRETATION:
+        return (f"Insufficient data ({len(stability_df)} rolling windows) to interpret hedge ratio "
+                f"stability for {tickers[0]} and {tickers[1]}.")
+    hedge = stability_df['hedge_ratio'].to_numpy(dtype=np.float64)
+    avg_hedge, std_hedge = mean_std(hedge)
+    min_hedge = np.nanmin(hedge)
+    max_hedge = np.nanmax(hedge)
 
     # Calculate coefficient of variation as stability metric
     cv = (std_hedge / avg_hedge) * 100 if avg_hedge != 0 else 0
@@ -238,53 +788,116 @@ Please explain:
 Keep it under 150 words and avoid technical jargon.
 """
 
-    return _call_gpt4o_mini(prompt, max_tokens=350)
+    return dict(prompt=prompt, max_tokens=220)
 
 
-def interpret_pairs(pairs_df: pd.DataFrame, basket_name: str = "the basket") -> str:
+def interpret_spread_stability(stability_df: pd.DataFrame, tickers: List[str]) -> str:
     """
-    Interpret cointegrated pairs found within a basket.
+    Interpret spread stability analysis results.
 
     Args:
-        pairs_df: DataFrame from find_cointegrated_pairs
-        basket_name: Name of the basket being analyzed
+        stability_df: DataFrame from analyze_spread_stability
+        tickers: List of the two ticker symbols
 
     Returns:
-        Plain English interpretation of the pairs found
+        Plain English interpretation of hedge ratio stability
     """
+    return _complete(_spread_stability_request(stability_df, tickers))
+
+
+async def interpret_spread_stability_async(stability_df: pd.DataFrame, tickers: List[str]) -> str:
+    """Async variant of interpret_spread_stability; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_spread_stability_request(stability_df, tickers))
+
+
+def interpret_spread_stability_stream(stability_df: pd.DataFrame, tickers: List[str]) -> Iterator[str]:
+    """Streaming variant of interpret_spread_stability; yields the text in pieces as it is generated."""
+    return _stream(_spread_stability_request(stability_df, tickers))
+
+
+def _pairs_request(pairs_df: pd.DataFrame, basket_name: str = "the basket") -> Union[str, Dict[str, Any]]:
+    """Build the chat request for interpret_pairs, or the final text when there are no pairs."""
     if len(pairs_df) == 0:
         return f"No cointegrated pairs were found in {basket_name} at the specified significance level."
 
     # Get top 5 pairs by p-value
-    top_pairs = pairs_df.nsmallest(5, 'p_value')
+    top_pairs = pairs_df.iloc[_smallest_positions(pairs_df['p_value'].to_numpy(dtype=np.float64), 5)]
 
-    pair_details = []
-    for _, row in top_pairs.iterrows():
-        pair_details.append(
-            f"- {row['Stock_1']} & {row['Stock_2']}: "
-            f"p-value {row['p_value']:.4f}, hedge ratio {row['hedge_ratio']:.3f}"
-        )
+    pair_details = (
+        "- " + top_pairs['Stock_1'].astype(str) + " & " + top_pairs['Stock_2'].astype(str) + ": "
+        + "p-value " + top_pairs['p_value'].map("{:.4f}".format)
+        + ", hedge ratio " + top_pairs['hedge_ratio'].map("{:.3f}".format)
+    )
 
     pair_info = "\n".join(pair_details)
 
-    prompt = f"""
-Explain these cointegrated stock pairs found in {basket_name} to a non-technical investor:
+    prompt = f"""{_PAIRS_INSTRUCTIONS}
+Found in: {basket_name}
 
 Total pairs found: {len(pairs_df)}
 
 Top pairs by statistical significance:
 {pair_info}
+"""
+
+    return dict(prompt=prompt, max_tokens=280)
+
+
+def interpret_pairs(pairs_df: pd.DataFrame, basket_name: str = "the basket") -> str:
+    """
+    Interpret cointegrated pairs found within a basket.
+
+    Args:
+        pairs_df: DataFrame from find_cointegrated_pairs
+        basket_name: Name of the basket being analyzed
+
+    Returns:
+        Plain English interpretation of the pairs found
+    """
+    return _complete(_pairs_request(pairs_df, basket_name))
+
+
+async def interpret_pairs_async(pairs_df: pd.DataFrame, basket_name: str = "the basket") -> str:
+    """Async variant of interpret_pairs; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_pairs_request(pairs_df, basket_name))
+
+
+def interpret_pairs_stream(pairs_df: pd.DataFrame, basket_name: str = "the basket") -> Iterator[str]:
+    """Streaming variant of interpret_pairs; yields the text in pieces as it is generated."""
+    return _stream(_pairs_request(pairs_df, basket_name))
+
+
+def _pair_cointegration_request(
+    ticker1: str,
+    ticker2: str,
+    score: float,
+    p_value: float,
+    hedge_ratio: float
+) -> Dict[str, Any]:
+    """Build the chat request for interpret_pair_cointegration."""
+    is_cointegrated = p_value < 0.05
+    strength = "strong" if p_value < 0.01 else "moderate" if p_value < 0.05 else "weak"
+
+    prompt = f"""
+Explain this cointegration test result for stocks {ticker1} and {ticker2} to a non-technical investor:
+
+Test Results:
+- P-value: {p_value:.4f}
+- Test statistic: {score:.3f}
+- Hedge ratio: {hedge_ratio:.3f}
+- Cointegrated (p < 0.05): {'Yes' if is_cointegrated else 'No'}
+- Relationship strength: {strength}
 
 Please explain:
-1. What it means for two stocks to be "cointegrated"
-2. Which pairs show the strongest relationship (lower p-value = stronger)
-3. Practical trading or hedging opportunities
-4. Why investors might care about these relationships
+1. Whether these two stocks have a meaningful statistical relationship
+2. What the hedge ratio tells us (e.g., "For every $1 of {ticker1}, you'd need ${hedge_ratio:.2f} of {ticker2}")
+3. What this means practically for an investor
+4. Whether this relationship is reliable enough for trading strategies
 
-Keep it under 200 words and use simple language.
+Keep it under 150 words and avoid technical terms.
 """
 
-    return _call_gpt4o_mini(prompt, max_tokens=400)
+    return dict(prompt=prompt, max_tokens=220)
 
 
 def interpret_pair_cointegration(
@@ -307,59 +920,166 @@ def interpret_pair_cointegration(
     Returns:
         Plain English interpretation
     """
-    is_cointegrated = p_value < 0.05
-    strength = "strong" if p_value < 0.01 else "moderate" if p_value < 0.05 else "weak"
+    return _complete(_pair_cointegration_request(ticker1, ticker2, score, p_value, hedge_ratio))
 
-    prompt = f"""
-Explain this cointegration test result for stocks {ticker1} and {ticker2} to a non-technical investor:
 
-Test Results:
-- P-value: {p_value:.4f}
-- Test statistic: {score:.3f}
-- Hedge ratio: {hedge_ratio:.3f}
-- Cointegrated (p < 0.05): {'Yes' if is_cointegrated else 'No'}
-- Relationship strength: {strength}
+async def interpret_pair_cointegration_async(
+    ticker1: str,
+    ticker2: str,
+    score: float,
+    p_value: float,
+    hedge_ratio: float
+) -> str:
+    """Async variant of interpret_pair_cointegration; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_pair_cointegration_request(ticker1, ticker2, score, p_value, hedge_ratio))
 
-Please explain:
-1. Whether these two stocks have a meaningful statistical relationship
-2. What the hedge ratio tells us (e.g., "For every $1 of {ticker1}, you'd need ${hedge_ratio:.2f} of {ticker2}")
-3. What this means practically for an investor
-4. Whether this relationship is reliable enough for trading strategies
 
-Keep it under 150 words and avoid technical terms.
-"""
+def interpret_pair_cointegration_stream(
+    ticker1: str,
+    ticker2: str,
+    score: float,
+    p_value: float,
+    hedge_ratio: float
+) -> Iterator[str]:
+    """Streaming variant of interpret_pair_cointegration; yields the text in pieces as it is generated."""
+    return _stream(_pair_cointegration_request(ticker1, ticker2, score, p_value, hedge_ratio))
 
-    return _call_gpt4o_mini(prompt, max_tokens=350)
 
+def _bundle_request(sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge several requests into one JSON-mode request with one answer per section name."""
+    tasks = "\n".join(f"### {name}\n{request['prompt'].strip()}\n" for name, request in sections.items())
+    prompt = f"""Answer each of the {len(sections)} independent tasks below. Respond with a JSON object
+with one key per task ({", ".join(sections)}) whose value is that task's answer as plain text.
 
-def interpret_summary_stats(
+{tasks}"""
+    return dict(
+        prompt=prompt,
+        max_tokens=sum(request['max_tokens'] for request in sections.values()),
+        response_format={"type": "json_object"},
+    )
+
+
+def _split_bundle(text: str, names) -> Dict[str, Optional[str]]:
+    """Answers parsed from a bundled JSON response; None for any the model left out."""
+    if text.startswith("Error calling OpenAI API"):
+        return dict.fromkeys(names, text)
+    try:
+        answers = json.loads(text)
+    except ValueError:
+        answers = {}
+    if not isinstance(answers, dict):
+        answers = {}
+    return {
+        name: answers[name].strip() if isinstance(answers.get(name), str) else None
+        for name in names
+    }
+
+
+def _complete_bundle(sections: Dict[str, Union[str, Dict[str, Any]]]) -> Dict[str, str]:
+    """
+    Run several named requests as one API call.
+
+    Plain-text sections are answered directly; a section missing from the
+    combined answer is requested on its own.
+    """
+    answers = {name: request for name, request in sections.items() if isinstance(request, str)}
+    pending = {name: request for name, request in sections.items() if not isinstance(request, str)}
+    if pending:
+        for name, text in _split_bundle(_complete(_bundle_request(pending)), pending).items():
+            answers[name] = text if text is not None else _complete(pending[name])
+    return {name: answers[name] for name in sections}
+
+
+async def _complete_bundle_async(sections: Dict[str, Union[str, Dict[str, Any]]]) -> Dict[str, str]:
+    """Async counterpart of _complete_bundle."""
+    answers = {name: request for name, request in sections.items() if isinstance(request, str)}
+    pending = {name: request for name, request in sections.items() if not isinstance(request, str)}
+    if pending:
+        answers.update(_split_bundle(await _complete_async(_bundle_request(pending)), pending))
+        missing = [name for name in pending if answers[name] is None]
+        for name, text in zip(missing, await asyncio.gather(*(_complete_async(pending[name]) for name in missing))):
+            answers[name] = text
+    return {name: answers[name] for name in sections}
+
+
+def _pair_bundle_requests(
+    rolling_df: pd.DataFrame,
+    stability_df: pd.DataFrame,
     tickers: List[str],
-    mean_returns: Dict[str, float],
-    volatilities: Dict[str, float],
-    correlations: pd.DataFrame
-) -> str:
+    score: float,
+    p_value: float,
+    hedge_ratio: float
+) -> Dict[str, Union[str, Dict[str, Any]]]:
+    """The individual requests combined by interpret_pair_bundle, by section name."""
+    return {
+        "rolling_analysis": _rolling_analysis_request(rolling_df, tickers),
+        "spread_stability": _spread_stability_request(stability_df, tickers),
+        "pair_cointegration": _pair_cointegration_request(tickers[0], tickers[1], score, p_value, hedge_ratio),
+    }
+
+
+def interpret_pair_bundle(
+    rolling_df: pd.DataFrame,
+    stability_df: pd.DataFrame,
+    tickers: List[str],
+    score: float,
+    p_value: float,
+    hedge_ratio: float
+) -> Dict[str, str]:
     """
-    Interpret basic portfolio statistics.
+    Rolling, spread-stability and pair-test interpretations from a single API call.
+
+    Equivalent to calling interpret_rolling_analysis, interpret_spread_stability
+    and interpret_pair_cointegration for the same pair, but pays for one round
+    trip instead of three. The answers come back as one JSON object; a section
+    missing from it is requested on its own.
 
     Args:
-        tickers: List of ticker symbols
-        mean_returns: Dictionary of ticker -> annualized return
-        volatilities: Dictionary of ticker -> annualized volatility
-        correlations: Correlation matrix
+        rolling_df: DataFrame from rolling_cointegration_analysis for the pair
+        stability_df: DataFrame from analyze_spread_stability
+        tickers: List of the two ticker symbols
+        score: ADF test statistic
+        p_value: P-value from the test
+        hedge_ratio: Calculated hedge ratio (beta)
 
     Returns:
-        Plain English interpretation
+        Dictionary with 'rolling_analysis', 'spread_stability' and
+        'pair_cointegration' interpretations
     """
-    # Format statistics
-    stats_lines = []
-    for ticker in tickers:
-        stats_lines.append(
-            f"- {ticker}: {mean_returns[ticker]*100:.1f}% return, "
-            f"{volatilities[ticker]*100:.1f}% volatility"
-        )
+    return _complete_bundle(_pair_bundle_requests(rolling_df, stability_df, tickers, score, p_value, hedge_ratio))
+
+
+async def interpret_pair_bundle_async(
+    rolling_df: pd.DataFrame,
+    stability_df: pd.DataFrame,
+    tickers: List[str],
+    score: float,
+    p_value: float,
+    hedge_ratio: float
+) -> Dict[str, str]:
+    """Async variant of interpret_pair_bundle; await several with asyncio.gather to overlap API calls."""
+    return await _complete_bundle_async(
+        _pair_bundle_requests(rolling_df, stability_df, tickers, score, p_value, hedge_ratio)
+    )
 
-    stats_info = "\n".join(stats_lines)
-    avg_correlation = correlations.values[correlations.values != 1].mean()
+
+def _summary_stats_request(
+    tickers: List[str],
+    mean_returns: Dict[str, float],
+    volatilities: Dict[str, float],
+    correlations: pd.DataFrame
+) -> Dict[str, Any]:
+    """Build the chat request for interpret_summary_stats."""
+    # Format statistics
+    stats_info = "\n".join(
+        f"- {ticker}: {mean_returns[ticker]*100:.1f}% return, {volatilities[ticker]*100:.1f}% volatility"
+        for ticker in tickers
+    )
+    # Mean of the off-diagonal entries: the diagonal is all ones, so subtract
+    # the trace from the total instead of masking or indexing the matrix
+    corr = correlations.to_numpy(dtype=np.float64)
+    n = corr.shape[0]
+    avg_correlation = (corr.sum() - np.trace(corr)) / (n * (n - 1)) if n > 1 else np.nan
 
     prompt = f"""
 Explain these portfolio statistics to a non-technical investor:
@@ -378,33 +1098,46 @@ Please explain:
 Keep it under 200 words and use simple language.
 """
 
-    return _call_gpt4o_mini(prompt, max_tokens=400)
+    return dict(prompt=prompt, max_tokens=280)
 
 
-def interpret_comprehensive_analysis(results: Dict[str, Any]) -> str:
+def interpret_summary_stats(
+    tickers: List[str],
+    mean_returns: Dict[str, float],
+    volatilities: Dict[str, float],
+    correlations: pd.DataFrame
+) -> str:
     """
-    Comprehensive interpretation of all cointegration analysis results.
-
-    This master function takes all analysis results and generates a single,
-    cohesive interpretation covering:
-    - Overall cointegration assessment
-    - Relationship stability over time
-    - Hedge ratios and trading implications
-    - Spread behavior (for pairs)
-    - Backtesting results
-    - Specific trading strategy recommendations
+    Interpret basic portfolio statistics.
 
     Args:
-        results: Dictionary containing all analysis outputs from
-                comprehensive_cointegration_analysis()
+        tickers: List of ticker symbols
+        mean_returns: Dictionary of ticker -> annualized return
+        volatilities: Dictionary of ticker -> annualized volatility
+        correlations: Correlation matrix
 
     Returns:
-        Comprehensive plain English interpretation with trading strategies
+        Plain English interpretation
     """
+    return _complete(_summary_stats_request(tickers, mean_returns, volatilities, correlations))
+
+
+async def interpret_summary_stats_async(
+    tickers: List[str],
+    mean_returns: Dict[str, float],
+    volatilities: Dict[str, float],
+    correlations: pd.DataFrame
+) -> str:
+    """Async variant of interpret_summary_stats; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_summary_stats_request(tickers, mean_returns, volatilities, correlations))
+
+
+def _comprehensive_analysis_request(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the chat request for interpret_comprehensive_analysis."""
     tickers = results['tickers']
     is_pair = results['is_pair']
 
-    # Calculate enhanced metrics
+    # Calculate enhanced metrics (imported here: cointegration_analysis loads statsmodels)
     from cointegration_analysis import calculate_enhanced_metrics
     enhanced = calculate_enhanced_metrics(results)
 
@@ -421,10 +1154,7 @@ def interpret_comprehensive_analysis(results: Dict[str, Any]) -> str:
         is_cointegrated = coint['is_cointegrated']
 
         # Rolling analysis metrics
-        pct_cointegrated = (rolling['p_value'] < 0.05).mean() * 100
-        avg_pvalue = rolling['p_value'].mean()
-        avg_beta = rolling['beta'].mean()
-        beta_std = rolling['beta'].std()
+        pct_cointegrated, avg_pvalue, avg_beta, beta_std = _pair_rolling_stats(rolling)
 
         # Get backtest results if available
         backtest_info = ""
@@ -444,89 +1174,46 @@ BACKTESTING RESULTS:
 - Avg Holding Period: {bt['avg_holding_days']:.1f} days
 """
 
-        prompt = f"""
-You are a quantitative trading analyst providing a comprehensive cointegration analysis report for stocks {tickers[0]} and {tickers[1]}.
+        prompt = f"""{_COMPREHENSIVE_PAIR_INSTRUCTIONS}
+## PAIR
+• First stock: {tickers[0]}
+• Second stock: {tickers[1]}
 
-=== COINTEGRATION TEST RESULTS ===
+## COINTEGRATION TEST RESULTS
 • Engle-Granger P-value: {p_value:.4f}
 • Test Statistic: {coint['score']:.3f}
 • Result: {'COINTEGRATED' if is_cointegrated else 'NOT COINTEGRATED'} at 5% significance
 • Static Hedge Ratio: {hedge_ratio:.4f}
 
-=== SPREAD CHARACTERISTICS ===
+## SPREAD CHARACTERISTICS
 • Current Spread Value: {enhanced['spread_current']:.4f}
 • Current Z-score: {enhanced['spread_zscore_current']:.2f}
 • Spread Mean: {enhanced['spread_mean']:.4f} ± {enhanced['spread_std']:.4f}
 • Spread Range: [{enhanced['spread_min']:.4f}, {enhanced['spread_max']:.4f}]
 • Half-life of Mean Reversion: {enhanced['halflife_days']:.1f} days
 
-=== Z-SCORE DISTRIBUTION ===
+## Z-SCORE DISTRIBUTION
 • % of time |Z| > 2.0: {enhanced['zscore_extremes']['pct_above_2'] + enhanced['zscore_extremes']['pct_below_neg2']:.1f}%
 • Historical Z-score Range: [{enhanced['zscore_extremes']['min_zscore']:.2f}, {enhanced['zscore_extremes']['max_zscore']:.2f}]
 • Historical Entry Opportunities: {enhanced['historical_entry_opportunities']} times
 • Avg Days Between Entries: {enhanced['avg_days_between_entries']:.1f}
 
-=== ROLLING WINDOW STABILITY ===
+## ROLLING WINDOW STABILITY
 • Cointegrated: {pct_cointegrated:.1f}% of windows
 • Average P-value: {avg_pvalue:.4f}
 • Hedge Ratio: {avg_beta:.4f} ± {beta_std:.4f}
 • Hedge Ratio CV: {enhanced['beta_drift']['beta_cv']:.1f}%
 • Stability Score: {enhanced['stability_score']:.1f}/100
 
-=== RECENT TRENDS ===
+## RECENT TRENDS
 • Recent Avg P-value: {enhanced['recent_trend']['recent_avg_pvalue']:.4f}
 • Historical Avg P-value: {enhanced['recent_trend']['historical_avg_pvalue']:.4f}
 • Trend: {'STRENGTHENING' if enhanced['recent_trend']['relationship_strengthening'] else 'WEAKENING'}
 • Recent Beta Change: {enhanced['beta_drift']['recent_beta_change']:.4f} per period
 {backtest_info}
-
-PROVIDE A DETAILED ANALYSIS:
-
-1. STATISTICAL ASSESSMENT (4-5 sentences)
-   - Interpret the cointegration strength (p-value in context)
-   - Discuss the half-life and its implications for trading frequency (5 days is fast, 50+ days is slow)
-   - Evaluate the stability score and what drives it
-   - Assess current z-score position - is there an opportunity now?
-   - Comment on whether the relationship is strengthening or weakening
-
-2. HEDGE RATIO & POSITION SIZING (3-4 sentences)
-   - Interpret the hedge ratio: "For every $1 of {tickers[0]}, use ${hedge_ratio:.2f} of {tickers[1]}"
-   - Evaluate hedge ratio stability using CV (CV < 10% is very stable, 10-20% is moderate, >20% is unstable)
-   - Recommend static vs dynamic hedge ratio approach based on CV
-   - Provide specific position sizing guidance
-
-3. DETAILED TRADING STRATEGY (6-8 sentences)
-   - Recommend specific z-score entry thresholds (justify based on distribution)
-   - Recommend specific z-score exit thresholds
-   - Suggest stop-loss levels
-   - Expected holding period based on half-life
-   - Estimated trade frequency based on historical opportunities
-   - Position sizing formula with concrete example ($100k capital)
-   - Transaction cost considerations
-   - When to rebalance the hedge ratio
-
-4. BACKTESTING INTERPRETATION (3-4 sentences, if available)
-   - Evaluate the Sharpe ratio (>1.0 is good, >2.0 is excellent)
-   - Assess the win rate and profit factor
-   - Discuss max drawdown tolerance
-   - Compare theoretical vs actual performance
-
-5. RISK ANALYSIS (4-5 sentences)
-   - Key risks based on stability metrics
-   - Beta drift scenarios and impact
-   - Market conditions that could break the relationship
-   - Maximum position size recommendations
-   - When to stop trading this pair
-
-6. CURRENT ACTION (2-3 sentences)
-   - Based on current z-score of {enhanced['spread_zscore_current']:.2f}, what should a trader do RIGHT NOW?
-   - Specific entry/exit recommendation
-   - Expected return and timeframe
-
-Total: 1500-1800 words. Be extremely specific with numbers, thresholds, and dollar amounts. Provide actionable, implementable advice.
 """
 
-        return _call_gpt4o_mini(prompt, max_tokens=2500, temperature=0.3)
+        return dict(prompt=prompt, max_tokens=2500, prompt_cache_key="comprehensive_pair_v1")
 
     else:
         # BASKET ANALYSIS
@@ -540,26 +1227,30 @@ Total: 1500-1800 words. Be extremely specific with numbers, thresholds, and doll
         vectors_df = coint['cointegrating_vectors']
 
         # Rolling analysis metrics
-        avg_rank = rolling['coint_rank'].mean()
-        pct_cointegrated = (rolling['coint_rank'] > 0).mean() * 100
+        ranks = rolling['coint_rank'].to_numpy()
+        avg_rank = np.nanmean(ranks)
+        pct_cointegrated = _pct(ranks > 0)
 
         # Format cointegrating vectors if available
         vectors_info = ""
         if vectors_df is not None and len(vectors_df) > 0:
-            vectors_info = "\n\nCOINTEGRATING VECTOR (Hedge Ratios):\n"
-            for stock in vectors_df.index:
-                vectors_info += f"- {stock}: {vectors_df.iloc[:, 0][stock]:.3f}\n"
+            vectors_info = "\n\nCOINTEGRATING VECTOR (Hedge Ratios):\n" + "".join(
+                f"- {stock}: {weight:.3f}\n" for stock, weight in vectors_df.iloc[:, 0].items()
+            )
 
         # Format pairs info if available
         pairs_info = ""
         if pairs_within is not None and len(pairs_within) > 0:
             pairs_info = f"\n\nCOINTEGRATED PAIRS FOUND: {len(pairs_within)}\n"
             top_pairs = pairs_within.head(3)
-            for _, row in top_pairs.iterrows():
-                pairs_info += f"- {row['Stock_A']} & {row['Stock_B']}: p-value {row['P_Value']:.4f}, hedge ratio {row['Hedge_Ratio']:.3f}\n"
+            pairs_info += "".join(
+                "- " + top_pairs['Stock_A'].astype(str) + " & " + top_pairs['Stock_B'].astype(str)
+                + ": p-value " + top_pairs['P_Value'].map("{:.4f}".format)
+                + ", hedge ratio " + top_pairs['Hedge_Ratio'].map("{:.3f}".format) + "\n"
+            )
 
-        prompt = f"""
-You are a quantitative trading analyst providing a comprehensive cointegration analysis report for a basket of {len(tickers)} stocks: {', '.join(tickers)}.
+        prompt = f"""{_COMPREHENSIVE_BASKET_INSTRUCTIONS}
+BASKET ({len(tickers)} stocks): {', '.join(tickers)}
 
 COINTEGRATION TEST RESULTS:
 - Cointegration Rank: {rank} (out of possible {len(tickers)-1})
@@ -570,32 +1261,247 @@ ROLLING ANALYSIS (Time-Varying Relationship):
 - Average cointegration rank: {avg_rank:.2f}
 - Cointegrated {pct_cointegrated:.1f}% of time periods analyzed
 {pairs_info}
+"""
 
-Please provide:
+    return dict(prompt=prompt, max_tokens=800, prompt_cache_key="comprehensive_basket_v1")
 
-1. RELATIONSHIP ASSESSMENT (2-3 sentences)
-   - Overall strength of cointegration within the basket
-   - Stability over time based on rolling analysis
-   - Which stocks drive the cointegrating relationships
 
-2. COINTEGRATING VECTOR INTERPRETATION (2-3 sentences)
-   - What the hedge ratios tell us about the relationships
-   - How to construct a mean-reverting portfolio
-   - Which stocks to long vs short based on the vector
+def interpret_comprehensive_analysis(results: Dict[str, Any]) -> str:
+    """
+    Comprehensive interpretation of all cointegration analysis results.
 
-3. TRADING STRATEGY RECOMMENDATIONS (4-5 sentences)
-   - Specific basket trading strategy if appropriate
-   - Whether to trade the full basket or focus on pairs
-   - If pairs are found, which pair(s) offer best opportunities
-   - Entry/exit signals and position sizing
-   - Portfolio construction using the cointegrating vector
+    This master function takes all analysis results and generates a single,
+    cohesive interpretation covering:
+    - Overall cointegration assessment
+    - Relationship stability over time
+    - Hedge ratios and trading implications
+    - Spread behavior (for pairs)
+    - Backtesting results
+    - Specific trading strategy recommendations
 
-4. RISKS AND LIMITATIONS (2-3 sentences)
-   - Key risks for this basket strategy
-   - Stability concerns from rolling analysis
-   - Market conditions to monitor
+    Args:
+        results: Dictionary containing all analysis outputs from
+                comprehensive_cointegration_analysis()
 
-Keep the total response under 500 words. Be specific and actionable. Provide concrete trading recommendations based on the data.
-"""
+    Returns:
+        Comprehensive plain English interpretation with trading strategies
+    """
+    return _complete(_comprehensive_analysis_request(results))
+
+
+async def interpret_comprehensive_analysis_async(results: Dict[str, Any]) -> str:
+    """Async variant of interpret_comprehensive_analysis; await several with asyncio.gather to overlap API calls."""
+    return await _complete_async(_comprehensive_analysis_request(results))
+
+
+def interpret_comprehensive_analysis_stream(results: Dict[str, Any]) -> Iterator[str]:
+    """
+    Streaming variant of interpret_comprehensive_analysis.
+
+    Yields the report in pieces as the model generates it, so a UI can show
+    the first lines after the first token instead of after the full
+    (multi-second) generation. Joining the pieces gives the same text.
+
+    Args:
+        results: Dictionary containing all analysis outputs from
+                comprehensive_cointegration_analysis()
+
+    Returns:
+        Iterator over pieces of the interpretation
+    """
+    return _stream(_comprehensive_analysis_request(results))
+
+
+async def interpret_comprehensive_analysis_stream_async(results: Dict[str, Any]) -> AsyncIterator[str]:
+    """Async variant of interpret_comprehensive_analysis_stream; iterate with async for."""
+    async for piece in _stream_gpt4o_mini_async(**_comprehensive_analysis_request(results)):
+        yield piece
+
+
+# Request builders by name, for build_request / the Batch API helpers
+_REQUEST_BUILDERS = {
+    "rolling_analysis": _rolling_analysis_request,
+    "basket_cointegration": _basket_cointegration_request,
+    "spread_stability": _spread_stability_request,
+    "pairs": _pairs_request,
+    "pair_cointegration": _pair_cointegration_request,
+    "summary_stats": _summary_stats_request,
+    "comprehensive_analysis": _comprehensive_analysis_request,
+}
+
+# Final states of an OpenAI batch job
+_BATCH_DONE = ("completed", "failed", "expired", "cancelled")
+
+
+def build_request(kind: str, *args, **kwargs) -> Union[str, Dict[str, Any]]:
+    """
+    Build the request an interpret_* function would send, for submit_batch.
 
-    return _call_gpt4o_mini(prompt, max_tokens=800)
+    Args:
+        kind: Interpretation name, e.g. "rolling_analysis" for interpret_rolling_analysis
+        *args, **kwargs: The arguments that interpret function takes
+
+    Returns:
+        The chat request, or the final text when no model call is needed
+    """
+    return _REQUEST_BUILDERS[kind](*args, **kwargs)
+
+
+# JSON fields for interpret_structured, one per numbered point of each prompt
+_STRUCTURED_KEYS = {
+    "rolling_analysis": ("relationship", "stability", "portfolio_implication", "conclusion"),
+    "basket_cointegration": ("rank_meaning", "strongest_baskets", "portfolio_construction", "conclusion"),
+    "spread_stability": ("hedge_ratio_meaning", "stability", "trading_implication", "reliability"),
+    "pairs": ("cointegration_meaning", "strongest_pairs", "opportunities", "conclusion"),
+    "pair_cointegration": ("relationship", "hedge_ratio_meaning", "practical_meaning", "reliability"),
+    "summary_stats": ("performance", "correlation", "diversification", "risks"),
+}
+
+
+def _structured_request(request: Dict[str, Any], keys) -> Dict[str, Any]:
+    """JSON-mode version of a request; JSON is denser than prose, so it gets a smaller budget."""
+    prompt = (f"{request['prompt'].rstrip()}\n\nRespond with a JSON object with the keys "
+              f"{', '.join(keys)}, each holding that part of the explanation as plain text.")
+    return dict(request, prompt=prompt, max_tokens=request['max_tokens'] * 3 // 4,
+                response_format={"type": "json_object"})
+
+
+def interpret_structured(kind: str, *args, **kwargs) -> Dict[str, Optional[str]]:
+    """
+    Structured variant of the short interpret_* functions.
+
+    Returns the explanation as separate sections instead of free text, so
+    reports or dashboards can use them without parsing prose.
+
+    Args:
+        kind: Interpretation name, e.g. "rolling_analysis" for interpret_rolling_analysis
+        *args, **kwargs: The arguments that interpret function takes
+
+    Returns:
+        Section name -> text (None for a section the model left out). When no
+        model call is needed, or the call fails, every section holds that message.
+    """
+    keys = _STRUCTURED_KEYS[kind]
+    request = build_request(kind, *args, **kwargs)
+    if isinstance(request, str):
+        return dict.fromkeys(keys, request)
+    return _split_bundle(_complete(_structured_request(request, keys)), keys)
+
+
+async def interpret_structured_async(kind: str, *args, **kwargs) -> Dict[str, Optional[str]]:
+    """Async variant of interpret_structured; await several with asyncio.gather to overlap API calls."""
+    keys = _STRUCTURED_KEYS[kind]
+    request = build_request(kind, *args, **kwargs)
+    if isinstance(request, str):
+        return dict.fromkeys(keys, request)
+    return _split_bundle(await _complete_async(_structured_request(request, keys)), keys)
+
+
+def _batch_body(prompt: str, max_tokens: int = 500, temperature: float = TEMPERATURE,
+                prompt_cache_key: Optional[str] = None,
+                response_format: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Chat completion body for a request (same defaults as _call_gpt4o_mini)."""
+    return dict(
+        model=MODEL,
+        messages=_messages(prompt),
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=TOP_P,
+        **_optional_args(prompt_cache_key, response_format)
+    )
+
+
+def _batch_cache_keys(prompt: str, max_tokens: int = 500, temperature: float = TEMPERATURE, **_) -> List[str]:
+    """Response cache keys for a request (same defaults as _call_gpt4o_mini)."""
+    return _cache_keys(prompt, max_tokens, temperature)
+
+
+def submit_batch(requests: Dict[str, Union[str, Dict[str, Any]]]) -> Optional[str]:
+    """
+    Submit interpretation requests to the OpenAI Batch API.
+
+    Batch jobs finish within 24 hours at half the price of regular calls,
+    which suits offline reports with no one waiting on the answers.
+    Plain-text requests and responses already in the cache are not uploaded.
+
+    Args:
+        requests: Requests from build_request, keyed by a unique name
+
+    Returns:
+        The batch id to pass to collect_batch, or None if nothing needed submitting
+    """
+    lines = [
+        json.dumps({
+            "custom_id": name,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _batch_body(**request),
+        })
+        for name, request in requests.items()
+        if not isinstance(request, str) and _lookup(_batch_cache_keys(**request)) is None
+    ]
+    if not lines:
+        return None
+
+    client = _get_openai_client()
+    batch_file = client.files.create(
+        file=("interpretations.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+
+def collect_batch(batch_id: Optional[str], requests: Dict[str, Union[str, Dict[str, Any]]],
+                  poll_interval: float = 60.0) -> Dict[str, str]:
+    """
+    Wait for a batch from submit_batch and return every interpretation.
+
+    Successful answers are added to the response cache, so later
+    interpret_* calls with the same inputs return them immediately.
+
+    Args:
+        batch_id: Id returned by submit_batch (None when nothing was submitted)
+        requests: The same requests that were passed to submit_batch
+        poll_interval: Seconds between status checks
+
+    Returns:
+        Interpretations keyed like requests; failed ones hold an error message
+    """
+    answers = {}
+    status = "completed"
+    if batch_id is not None:
+        client = _get_openai_client()
+        batch = client.batches.retrieve(batch_id)
+        while batch.status not in _BATCH_DONE:
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch_id)
+        status = batch.status
+
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    text = response["body"]["choices"][0]["message"]["content"].strip()
+                    answers[record["custom_id"]] = text
+                    _store_responses(_batch_cache_keys(**requests[record["custom_id"]]), text)
+                else:
+                    error = record.get("error") or response.get("body", {}).get("error")
+                    answers[record["custom_id"]] = f"Error calling OpenAI API: {error}"
+
+    for name, request in requests.items():
+        if name in answers:
+            continue
+        if isinstance(request, str):
+            answers[name] = request
+        else:
+            cached = _lookup(_batch_cache_keys(**request))
+            answers[name] = cached if cached is not None else f"Error calling OpenAI API: batch {status} without this response"
+    return {name: answers[name] for name in requests}
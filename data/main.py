@@ -4,8 +4,11 @@ Main script for running cointegration analysis on stock baskets.
 This script demonstrates how to use the cointegration analysis modules.
 """
 
+import asyncio
+import threading
 import warnings
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 warnings.filterwarnings('ignore')
 
@@ -13,41 +16,52 @@ warnings.filterwarnings('ignore')
 load_dotenv()
 
 from config import ALL_BASKETS, basket_1, basket_2, basket_3
-from data_loader import get_close_price_data, download_all_baskets, load_all_csv
-from llm_interpreter import (
-    interpret_rolling_analysis,
-    interpret_basket_cointegration,
-    interpret_spread_stability,
-    interpret_pairs,
-    interpret_pair_cointegration
-)
 
 # Create plots directory if it doesn't exist
 PLOTS_DIR = "plots"
 if not os.path.exists(PLOTS_DIR):
     os.makedirs(PLOTS_DIR)
-from cointegration_analysis import (
-    test_basket_cointegration,
-    analyze_basket,
-    test_pair_cointegration,
-    get_hedge_ratio,
-    find_cointegrated_pairs
-)
-from rolling_analysis import (
-    rolling_cointegration_analysis,
-    batch_rolling_analysis,
-    calculate_spread,
-    calculate_zscore,
-    analyze_spread_stability
-)
-from visualization import (
-    plot_price_series,
-    plot_rolling_results,
-    plot_spread,
-    plot_zscore,
-    plot_spread_analysis,
-    plot_cointegration_heatmap
-)
+
+# The analysis modules pull in yfinance, statsmodels, matplotlib and openai,
+# which take over a second to import; each example imports only what it uses.
+
+# pyplot keeps global figure state, so examples running in threads take turns
+# drawing; streamed interpretations likewise take turns on the console
+_PLOT_LOCK = threading.Lock()
+_PRINT_LOCK = threading.Lock()
+
+# Baskets loaded from the saved CSVs, shared by the examples that need them
+_all_data = None
+_all_data_lock = threading.Lock()
+
+
+def _get_all_data():
+    """
+    Load the saved baskets once and reuse them across examples.
+
+    Returns a new dictionary each time, but the DataFrames are shared and
+    must be treated as read-only.
+    """
+    global _all_data
+    with _all_data_lock:
+        if _all_data is None:
+            from data_loader import load_all_csv
+            _all_data = load_all_csv()
+        return dict(_all_data)
+
+
+def _print_stream(pieces):
+    """Print an AI interpretation as it is generated."""
+    pieces = iter(pieces)
+    first = next(pieces, "")  # sends the request before waiting for the console
+    with _PRINT_LOCK:
+        print("\n" + "=" * 70)
+        print("AI INTERPRETATION:")
+        print("=" * 70)
+        print(first, end="", flush=True)
+        for piece in pieces:
+            print(piece, end="", flush=True)
+        print()
 
 
 def example_1_download_data():
@@ -56,23 +70,35 @@ def example_1_download_data():
     print("EXAMPLE 1: Download Data for All Baskets")
     print("=" * 70)
 
+    from data_loader import download_all_baskets
+
     # Download all baskets
     all_data = download_all_baskets(ALL_BASKETS, period="1y", max_missing=25)
 
+    # The saved files changed, so reload them on next use
+    global _all_data
+    _all_data = None
+
     return all_data
 
 
-def example_2_test_cointegration(use_llm=True):
-    """Example 2: Test cointegration for all baskets."""
+def example_2_test_cointegration(use_llm=True, max_workers=None):
+    """
+    Example 2: Test cointegration for all baskets.
+
+    max_workers is passed to test_basket_cointegration (1 = no process pool).
+    """
     print("\n" + "=" * 70)
     print("EXAMPLE 2: Test Cointegration for All Baskets")
     print("=" * 70)
 
+    from cointegration_analysis import test_basket_cointegration
+
     # Load all CSV data
-    all_data = load_all_csv()
+    all_data = _get_all_data()
 
     # Test cointegration
-    summary = test_basket_cointegration(all_data, k_ar_diff=5, crit_level=1)
+    summary = test_basket_cointegration(all_data, k_ar_diff=5, crit_level=1, max_workers=max_workers)
 
     print("\n" + "=" * 70)
     print("Summary:")
@@ -86,11 +112,8 @@ def example_2_test_cointegration(use_llm=True):
 
     # LLM Interpretation
     if use_llm:
-        print("\n" + "=" * 70)
-        print("AI INTERPRETATION:")
-        print("=" * 70)
-        interpretation = interpret_basket_cointegration(summary)
-        print(interpretation)
+        from llm_interpreter import interpret_basket_cointegration_stream
+        _print_stream(interpret_basket_cointegration_stream(summary))
 
     return summary
 
@@ -101,6 +124,10 @@ def example_3_analyze_pair(use_llm=True):
     print("EXAMPLE 3: Analyze Specific Pair (NET vs SNOW)")
     print("=" * 70)
 
+    from data_loader import get_close_price_data
+    from cointegration_analysis import test_pair_cointegration, get_hedge_ratio
+    from visualization import plot_price_series, plot_spread_analysis
+
     # Download data for the pair
     tickers = ["NET", "SNOW"]
     data = get_close_price_data(tickers, period="1y")
@@ -116,23 +143,21 @@ def example_3_analyze_pair(use_llm=True):
     print(f"  Test Statistic: {score:.3f}")
     print(f"  Hedge Ratio: {beta:.3f}")
 
-    # Plot prices
-    plot_price_series(data, title="NET vs SNOW - Log Prices",
-                     save_path=os.path.join(PLOTS_DIR, "net_snow_prices.png"))
+    with _PLOT_LOCK:
+        # Plot prices
+        plot_price_series(data, title="NET vs SNOW - Log Prices",
+                         save_path=os.path.join(PLOTS_DIR, "net_snow_prices.png"))
 
-    # Analyze spread
-    plot_spread_analysis(data, hedge_ratio=beta, zscore_window=20,
-                        save_path=os.path.join(PLOTS_DIR, "net_snow_spread_analysis.png"))
+        # Analyze spread
+        plot_spread_analysis(data, hedge_ratio=beta, zscore_window=20,
+                            save_path=os.path.join(PLOTS_DIR, "net_snow_spread_analysis.png"))
 
     # LLM Interpretation
     if use_llm:
-        print("\n" + "=" * 70)
-        print("AI INTERPRETATION:")
-        print("=" * 70)
-        interpretation = interpret_pair_cointegration(
+        from llm_interpreter import interpret_pair_cointegration_stream
+        _print_stream(interpret_pair_cointegration_stream(
             tickers[0], tickers[1], score, p_value, beta
-        )
-        print(interpretation)
+        ))
 
     return data, beta
 
@@ -143,6 +168,10 @@ def example_4_rolling_analysis_pair(use_llm=True):
     print("EXAMPLE 4: Rolling Analysis for Pair (NET vs SNOW)")
     print("=" * 70)
 
+    from data_loader import get_close_price_data
+    from rolling_analysis import rolling_cointegration_analysis
+    from visualization import plot_rolling_results
+
     # Download data
     tickers = ["NET", "SNOW"]
     data = get_close_price_data(tickers, period="2y")
@@ -151,8 +180,9 @@ def example_4_rolling_analysis_pair(use_llm=True):
     results = rolling_cointegration_analysis(data, window=180, step_size=21)
 
     # Plot results
-    plot_rolling_results(results, tickers, window=180, step_size=21,
-                        save_path=os.path.join(PLOTS_DIR, "net_snow_rolling_analysis.png"))
+    with _PLOT_LOCK:
+        plot_rolling_results(results, tickers, window=180, step_size=21,
+                            save_path=os.path.join(PLOTS_DIR, "net_snow_rolling_analysis.png"))
 
     print(f"\nRolling Analysis Summary:")
     print(f"  Average cointegration rank: {results['coint_rank'].mean():.2f}")
@@ -160,11 +190,8 @@ def example_4_rolling_analysis_pair(use_llm=True):
 
     # LLM Interpretation
     if use_llm:
-        print("\n" + "=" * 70)
-        print("AI INTERPRETATION:")
-        print("=" * 70)
-        interpretation = interpret_rolling_analysis(results, tickers)
-        print(interpretation)
+        from llm_interpreter import interpret_rolling_analysis_stream
+        _print_stream(interpret_rolling_analysis_stream(results, tickers))
 
     return results
 
@@ -175,6 +202,10 @@ def example_5_rolling_analysis_basket(use_llm=True):
     print("EXAMPLE 5: Rolling Analysis for Basket")
     print("=" * 70)
 
+    from data_loader import get_close_price_data
+    from rolling_analysis import rolling_cointegration_analysis
+    from visualization import plot_rolling_results
+
     # Download data for basket
     data = get_close_price_data(basket_1, period="2y")
 
@@ -182,8 +213,9 @@ def example_5_rolling_analysis_basket(use_llm=True):
     results = rolling_cointegration_analysis(data, window=252, step_size=21)
 
     # Plot results
-    plot_rolling_results(results, data.columns.tolist(), window=252, step_size=21,
-                        save_path=os.path.join(PLOTS_DIR, "basket1_rolling_analysis.png"))
+    with _PLOT_LOCK:
+        plot_rolling_results(results, data.columns.tolist(), window=252, step_size=21,
+                            save_path=os.path.join(PLOTS_DIR, "basket1_rolling_analysis.png"))
 
     print(f"\nRolling Analysis Summary:")
     print(f"  Average cointegration rank: {results['coint_rank'].mean():.2f}")
@@ -191,11 +223,8 @@ def example_5_rolling_analysis_basket(use_llm=True):
 
     # LLM Interpretation
     if use_llm:
-        print("\n" + "=" * 70)
-        print("AI INTERPRETATION:")
-        print("=" * 70)
-        interpretation = interpret_rolling_analysis(results, data.columns.tolist())
-        print(interpretation)
+        from llm_interpreter import interpret_rolling_analysis_stream
+        _print_stream(interpret_rolling_analysis_stream(results, data.columns.tolist()))
 
     return results
 
@@ -206,8 +235,10 @@ def example_6_batch_rolling_analysis():
     print("EXAMPLE 6: Batch Rolling Analysis")
     print("=" * 70)
 
+    from rolling_analysis import batch_rolling_analysis
+
     # Load all CSV data
-    all_data = load_all_csv()
+    all_data = _get_all_data()
 
     # Run batch analysis (limit to first 3 for demonstration)
     limited_data = {k: all_data[k] for k in list(all_data.keys())[:3]}
@@ -216,17 +247,23 @@ def example_6_batch_rolling_analysis():
     return results
 
 
-def example_7_find_pairs_in_basket(use_llm=True):
-    """Example 7: Find all cointegrated pairs within a basket."""
+def example_7_find_pairs_in_basket(use_llm=True, max_workers=None):
+    """
+    Example 7: Find all cointegrated pairs within a basket.
+
+    max_workers is passed to find_cointegrated_pairs (1 = no process pool).
+    """
     print("\n" + "=" * 70)
     print("EXAMPLE 7: Find Cointegrated Pairs in Basket")
     print("=" * 70)
 
+    from cointegration_analysis import find_cointegrated_pairs
+
     # Load all data
-    all_data = load_all_csv()
+    all_data = _get_all_data()
 
     # Find pairs in basket_1
-    pairs = find_cointegrated_pairs(basket_1, all_data, p_threshold=0.05)
+    pairs = find_cointegrated_pairs(basket_1, all_data, p_threshold=0.05, max_workers=max_workers)
 
     if len(pairs) > 0:
         print("\nCointegrated Pairs:")
@@ -234,11 +271,8 @@ def example_7_find_pairs_in_basket(use_llm=True):
 
     # LLM Interpretation
     if use_llm:
-        print("\n" + "=" * 70)
-        print("AI INTERPRETATION:")
-        print("=" * 70)
-        interpretation = interpret_pairs(pairs, basket_name="Basket 1")
-        print(interpretation)
+        from llm_interpreter import interpret_pairs_stream
+        _print_stream(interpret_pairs_stream(pairs, basket_name="Basket 1"))
 
     return pairs
 
@@ -249,6 +283,9 @@ def example_8_spread_stability(use_llm=True):
     print("EXAMPLE 8: Spread Stability Analysis")
     print("=" * 70)
 
+    from data_loader import get_close_price_data
+    from rolling_analysis import analyze_spread_stability
+
     # Download data
     tickers = ["NET", "SNOW"]
     data = get_close_price_data(tickers, period="2y")
@@ -257,18 +294,21 @@ def example_8_spread_stability(use_llm=True):
     stability = analyze_spread_stability(data, window=180, step_size=21)
 
     # Plot hedge ratio over time
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
     import matplotlib.pyplot as plt
-    plt.figure(figsize=(12, 5))
-    plt.plot(stability.index, stability['hedge_ratio'], linewidth=2, color='purple')
-    plt.xlabel('Date', fontsize=11)
-    plt.ylabel('Hedge Ratio', fontsize=11)
-    plt.title('Hedge Ratio Stability Over Time', fontsize=13, fontweight='bold')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    save_path = os.path.join(PLOTS_DIR, "hedge_ratio_stability.png")
-    plt.savefig(save_path, dpi=150, bbox_inches='tight')
-    print(f"  Saved plot to {save_path}")
-    plt.close()
+    with _PLOT_LOCK:
+        plt.figure(figsize=(12, 5))
+        plt.plot(stability.index, stability['hedge_ratio'], linewidth=2, color='purple')
+        plt.xlabel('Date', fontsize=11)
+        plt.ylabel('Hedge Ratio', fontsize=11)
+        plt.title('Hedge Ratio Stability Over Time', fontsize=13, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        save_path = os.path.join(PLOTS_DIR, "hedge_ratio_stability.png")
+        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        print(f"  Saved plot to {save_path}")
+        plt.close()
 
     print(f"\nHedge Ratio Statistics:")
     print(f"  Average: {stability['hedge_ratio'].mean():.3f}")
@@ -277,13 +317,128 @@ def example_8_spread_stability(use_llm=True):
 
     # LLM Interpretation
     if use_llm:
+        from llm_interpreter import interpret_spread_stability_stream
+        _print_stream(interpret_spread_stability_stream(stability, tickers))
+
+    return stability
+
+
+async def _gather(*interpretations):
+    """Await interpretation coroutines together so their API calls overlap."""
+    return await asyncio.gather(*interpretations)
+
+
+def example_9_concurrent_interpretations():
+    """
+    Example 9: Run examples 2-5, 7 and 8, then request all interpretations at once.
+
+    The three NET/SNOW interpretations share one bundled API call, and that
+    call overlaps with the basket ones.
+    """
+    from cointegration_analysis import test_pair_cointegration
+    from llm_interpreter import (
+        interpret_basket_cointegration_async,
+        interpret_pair_bundle_async,
+        interpret_rolling_analysis_async,
+        interpret_pairs_async
+    )
+
+    summary = example_2_test_cointegration(use_llm=False)
+    data, beta = example_3_analyze_pair(use_llm=False)
+    score, p_value, _ = test_pair_cointegration(data)
+    results_pair = example_4_rolling_analysis_pair(use_llm=False)
+    results_basket = example_5_rolling_analysis_basket(use_llm=False)
+    pairs = example_7_find_pairs_in_basket(use_llm=False)
+    stability = example_8_spread_stability(use_llm=False)
+
+    pair = ["NET", "SNOW"]
+    basket_text, pair_texts, basket_rolling_text, pairs_text = asyncio.run(_gather(
+        interpret_basket_cointegration_async(summary),
+        interpret_pair_bundle_async(results_pair, stability, pair, score, p_value, beta),
+        interpret_rolling_analysis_async(results_basket, basket_1),
+        interpret_pairs_async(pairs, basket_name="Basket 1"),
+    ))
+    interpretations = {
+        "Basket Cointegration": basket_text,
+        "Pair Cointegration (NET vs SNOW)": pair_texts["pair_cointegration"],
+        "Rolling Analysis (NET vs SNOW)": pair_texts["rolling_analysis"],
+        "Rolling Analysis (Basket 1)": basket_rolling_text,
+        "Cointegrated Pairs (Basket 1)": pairs_text,
+        "Spread Stability (NET vs SNOW)": pair_texts["spread_stability"],
+    }
+
+    for title, interpretation in interpretations.items():
         print("\n" + "=" * 70)
-        print("AI INTERPRETATION:")
+        print(f"AI INTERPRETATION: {title}")
         print("=" * 70)
-        interpretation = interpret_spread_stability(stability, tickers)
         print(interpretation)
 
-    return stability
+    return interpretations
+
+
+def example_10_batch_interpretations(poll_interval=60.0):
+    """
+    Example 10: Run examples 2-5, 7 and 8 and interpret them through the Batch API.
+
+    For offline reports: the job completes within 24 hours at half the cost
+    of regular calls, and the answers land in the response cache.
+    """
+    from cointegration_analysis import test_pair_cointegration
+    from llm_interpreter import build_request, submit_batch, collect_batch
+
+    summary = example_2_test_cointegration(use_llm=False)
+    data, beta = example_3_analyze_pair(use_llm=False)
+    score, p_value, _ = test_pair_cointegration(data)
+    results_pair = example_4_rolling_analysis_pair(use_llm=False)
+    results_basket = example_5_rolling_analysis_basket(use_llm=False)
+    pairs = example_7_find_pairs_in_basket(use_llm=False)
+    stability = example_8_spread_stability(use_llm=False)
+
+    pair = ["NET", "SNOW"]
+    requests = {
+        "Basket Cointegration": build_request("basket_cointegration", summary),
+        "Pair Cointegration (NET vs SNOW)": build_request("pair_cointegration", pair[0], pair[1], score, p_value, beta),
+        "Rolling Analysis (NET vs SNOW)": build_request("rolling_analysis", results_pair, pair),
+        "Rolling Analysis (Basket 1)": build_request("rolling_analysis", results_basket, basket_1),
+        "Cointegrated Pairs (Basket 1)": build_request("pairs", pairs, basket_name="Basket 1"),
+        "Spread Stability (NET vs SNOW)": build_request("spread_stability", stability, pair),
+    }
+
+    batch_id = submit_batch(requests)
+    print(f"\nSubmitted batch {batch_id}; waiting for results...")
+    interpretations = collect_batch(batch_id, requests, poll_interval=poll_interval)
+
+    for title, interpretation in interpretations.items():
+        print("\n" + "=" * 70)
+        print(f"AI INTERPRETATION: {title}")
+        print("=" * 70)
+        print(interpretation)
+
+    return interpretations
+
+
+def example_11_concurrent_examples(use_llm=True, max_workers=8):
+    """
+    Example 11: Run examples 2-5, 7 and 8 at the same time in a thread pool.
+
+    The examples are independent and spend most of their time waiting on
+    yfinance downloads and OpenAI calls, which release the GIL, so threads
+    overlap them. Their headers and tables may interleave on the console.
+    Examples 2 and 7 test serially (max_workers=1): forking worker
+    processes from a multithreaded process can deadlock.
+    """
+    examples = [
+        (example_2_test_cointegration, {'max_workers': 1}),
+        (example_3_analyze_pair, {}),
+        (example_4_rolling_analysis_pair, {}),
+        (example_5_rolling_analysis_basket, {}),
+        (example_7_find_pairs_in_basket, {'max_workers': 1}),
+        (example_8_spread_stability, {}),
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {example.__name__: executor.submit(example, use_llm, **kwargs)
+                   for example, kwargs in examples}
+        return {name: future.result() for name, future in futures.items()}
 
 
 def main():
@@ -322,6 +477,15 @@ def main():
     # Example 8: Spread stability analysis
     # stability = example_8_spread_stability()
 
+    # Example 9: Examples 2-5, 7 and 8 with all LLM interpretations requested concurrently
+    # interpretations = example_9_concurrent_interpretations()
+
+    # Example 10: The same interpretations as a discounted offline Batch API job
+    # interpretations = example_10_batch_interpretations()
+
+    # Example 11: Examples 2-5, 7 and 8 run concurrently
+    # results = example_11_concurrent_examples()
+
     print("\n" + "=" * 70)
     print("Analysis Complete!")
     print("=" * 70)
@@ -1,7 +1,29 @@
 """
 Parameter validation for backtesting to ensure valid configurations.
+
+Pure-Python and stdlib-only so optimizers and worker processes can validate
+parameters without paying for the pandas/statsmodels imports of the
+analysis modules; keep heavy scientific imports out of this file.
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
+__all__ = [
+    "validate_backtest_parameters",
+    "validate_batch",
+    "suggest_parameters",
+    "suggest_parameters_array",
+    "print_validation_results",
+    "print_suggested_parameters",
+]
+
+# Approximate trading days per yfinance period string (read-only, shared by every call)
+_PERIOD_TO_DAYS = MappingProxyType({
+    '1mo': 21, '2mo': 42, '3mo': 63, '6mo': 126,
+    '1y': 252, '2y': 504, '5y': 1260, '10y': 2520
+})
+
 
 def validate_backtest_parameters(
     period: str,
@@ -11,7 +33,8 @@ def validate_backtest_parameters(
     backtest_method: str = "walk_forward",
     train_window: int = None,
     test_window: int = None,
-    zscore_window: int = 20
+    zscore_window: int = 20,
+    fail_fast: bool = False
 ) -> dict:
     """
     Validate that backtest parameters are compatible with the data.
@@ -34,6 +57,9 @@ def validate_backtest_parameters(
         Testing window for walk-forward
     zscore_window : int
         Z-score calculation window
+    fail_fast : bool
+        Return at the first hard error instead of running every check
+        (default False)
 
     Returns:
     --------
@@ -47,19 +73,14 @@ def validate_backtest_parameters(
         'recommendations': []
     }
 
-    # Parse period to estimate expected days
-    period_to_days = {
-        '1mo': 21, '2mo': 42, '3mo': 63, '6mo': 126,
-        '1y': 252, '2y': 504, '5y': 1260, '10y': 2520
-    }
-    expected_days = period_to_days.get(period, data_length)
-
     # Check 1: Basic data requirements
     if data_length < 40:
         results['valid'] = False
         results['errors'].append(
             f"Insufficient data: {data_length} days. Need at least 40 days for backtesting."
         )
+        if fail_fast:
+            return results
 
     # Check 2: Z-score window
     if zscore_window >= data_length:
@@ -67,6 +88,8 @@ def validate_backtest_parameters(
         results['errors'].append(
             f"Z-score window ({zscore_window}) >= data length ({data_length})"
         )
+        if fail_fast:
+            return results
     elif zscore_window < 10:
         results['warnings'].append(
             f"Z-score window ({zscore_window}) is small. Consider 20+ days for stability."
@@ -82,6 +105,8 @@ def validate_backtest_parameters(
         results['errors'].append(
             f"Rolling window ({window}) >= data length ({data_length})"
         )
+        if fail_fast:
+            return results
     elif window < 30:
         results['warnings'].append(
             f"Rolling window ({window}) is small. Cointegration tests may be unreliable with <30 days."
@@ -98,6 +123,8 @@ def validate_backtest_parameters(
     if step_size <= 0:
         results['valid'] = False
         results['errors'].append(f"Step size must be positive (got {step_size})")
+        if fail_fast:
+            return results
     elif step_size >= window:
         results['warnings'].append(
             f"Step size ({step_size}) >= window ({window}). Windows won't overlap."
@@ -143,6 +170,8 @@ def validate_backtest_parameters(
                 f"Train window ({train_window}) + test window ({test_window}) = {min_total} "
                 f"exceeds data length ({data_length})"
             )
+            if fail_fast:
+                return results
 
         # Calculate number of walk-forward periods
         num_periods = (data_length - train_window) // step_size
@@ -151,6 +180,8 @@ def validate_backtest_parameters(
             results['errors'].append(
                 f"Cannot create any walk-forward periods. Need more data or smaller windows."
             )
+            if fail_fast:
+                return results
         elif num_periods < 3:
             results['warnings'].append(
                 f"Only {num_periods} walk-forward periods. Need 5+ for robust testing."
@@ -189,6 +220,7 @@ def validate_backtest_parameters(
             )
 
     # Check 8: Overall data quality expectations
+    expected_days = _PERIOD_TO_DAYS.get(period, data_length)
     if data_length < expected_days * 0.7:
         results['warnings'].append(
             f"Only {data_length} days retrieved for period '{period}' (expected ~{expected_days}). "
@@ -208,6 +240,41 @@ def validate_backtest_parameters(
     return results
 
 
+def validate_batch(configs):
+    """
+    Prescreen many parameter combinations with the hard checks 1-4 at once.
+
+    Applies the error conditions of validate_backtest_parameters that only
+    need data_length, zscore_window, window and step_size as array
+    comparisons, so an optimizer can drop impossible combinations before
+    running the full per-config validation on the survivors. NumPy is
+    imported here rather than at module level to keep this module
+    stdlib-only at import time.
+
+    Parameters:
+    -----------
+    configs : np.ndarray or pd.DataFrame
+        Structured array (or DataFrame) with 'data_length', 'window',
+        'step_size' and 'zscore_window' fields, one row per combination
+
+    Returns:
+    --------
+    np.ndarray or pd.DataFrame
+        The rows of configs that pass checks 1-4
+    """
+    import numpy as np
+
+    data_length = np.asarray(configs['data_length'])
+    window = np.asarray(configs['window'])
+    keep = (
+        (data_length >= 40)
+        & (np.asarray(configs['zscore_window']) < data_length)
+        & (window < data_length)
+        & (np.asarray(configs['step_size']) > 0)
+    )
+    return configs[keep]
+
+
 def print_validation_results(results: dict):
     """Print validation results in a user-friendly format."""
     print("\n" + "=" * 70)
@@ -254,8 +321,14 @@ def suggest_parameters(data_length: int, backtest_method: str = "walk_forward")
     Returns:
     --------
     dict
-        Suggested parameters
+        Suggested parameters (a fresh dict the caller may modify)
     """
+    return dict(_suggest_parameters(data_length, backtest_method))
+
+
+@lru_cache(maxsize=256)
+def _suggest_parameters(data_length: int, backtest_method: str) -> MappingProxyType:
+    """Memoized, read-only suggest_parameters table per (data_length, method)."""
     suggestions = {
         'zscore_window': 20,
         'method': backtest_method
@@ -308,7 +381,87 @@ def suggest_parameters(data_length: int, backtest_method: str = "walk_forward")
         suggestions['rolling_step'] = max(10, data_length // 15)
         suggestions['note'] = "Simple backtest - ensure you understand the limitations"
 
-    return suggestions
+    return MappingProxyType(suggestions)
+
+
+def suggest_parameters_array(data_lengths, backtest_method: str = "walk_forward"):
+    """
+    suggest_parameters for many data lengths at once, as a table.
+
+    The window formulas are evaluated with NumPy over the whole array of
+    data lengths instead of one Python call per length. NumPy and pandas are
+    imported here rather than at module level to keep this module
+    stdlib-only at import time.
+
+    Parameters:
+    -----------
+    data_lengths : array-like of int
+        Numbers of days of data available
+    backtest_method : str
+        Backtesting method to use
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per data length with the keys of suggest_parameters as
+        columns; keys a row's method does not use are missing (NA/NaN)
+    """
+    import numpy as np
+    import pandas as pd
+
+    days = np.asarray(data_lengths, dtype=np.int64)
+    missing = np.full(len(days), -1)
+    method = np.full(len(days), backtest_method, dtype=object)
+    train_window = test_window = step_size = missing
+    train_pct = np.full(len(days), np.nan)
+
+    if backtest_method == "walk_forward":
+        # Tiers of suggest_parameters: 500+, 300+, 150+ days, else train/test split
+        tiers = [days >= 500, days >= 300, days >= 150]
+        short = ~(tiers[0] | tiers[1] | tiers[2])
+        train_window = np.select(tiers, [252, 180, 90], -1)
+        test_window = np.select(tiers, [63, 45, 30], -1)
+        step_size = np.select(tiers, [21, 15, 10], -1)
+        rolling_window = np.select(tiers, [252, 126, 63], np.maximum(30, days // 5))
+        rolling_step = np.select(tiers, [21, 21, 10], np.maximum(5, days // 20))
+        method[short] = "train_test_split"
+        train_pct[short] = 0.6
+        tier_notes = np.select(tiers, [
+            "Standard configuration for 2+ years of data",
+            "Adjusted for 1-2 years of data",
+            "Minimum viable for walk-forward (6mo-1yr data)",
+        ], "")
+        note = [
+            f"Only {d} days - train/test split recommended instead of walk-forward" if s else n
+            for d, s, n in zip(days.tolist(), short, tier_notes.tolist())
+        ]
+
+    elif backtest_method == "train_test_split":
+        train_pct[:] = 0.6
+        rolling_window = np.minimum(252, np.maximum(63, days // 4))
+        rolling_step = np.maximum(10, days // 20)
+        note = ["Train/test split - simpler than walk-forward"] * len(days)
+
+    else:  # simple
+        rolling_window = np.minimum(252, np.maximum(63, days // 3))
+        rolling_step = np.maximum(10, days // 15)
+        note = ["Simple backtest - ensure you understand the limitations"] * len(days)
+
+    def optional(values):
+        return pd.array(np.where(values < 0, None, values), dtype="Int64")
+
+    return pd.DataFrame({
+        'data_length': days,
+        'zscore_window': np.full(len(days), 20),
+        'method': method,
+        'train_window': optional(train_window),
+        'test_window': optional(test_window),
+        'step_size': optional(step_size),
+        'rolling_window': rolling_window,
+        'rolling_step': rolling_step,
+        'train_pct': train_pct,
+        'note': note,
+    })
 
 
 def print_suggested_parameters(suggestions: dict):
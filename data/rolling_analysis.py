@@ -2,10 +2,505 @@
 Rolling window cointegration analysis for time-varying relationship detection.
 """
 
+import inspect
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.stattools import coint
-from statsmodels.tsa.vector_ar.vecm import coint_johansen
+from scipy import linalg
+from scipy.special import ndtr
+from statsmodels.tsa.coint_tables import c_sjt
+from statsmodels.tsa.stattools import adfuller
+
+# Moving-window statistics run in bottleneck's single-pass C kernels when it
+# is installed; pandas rolling windows are used without it
+try:
+    import bottleneck as bn
+    _HAS_BOTTLENECK = True
+except ImportError:
+    _HAS_BOTTLENECK = False
+
+
+def _ols_fit(x, y):
+    """
+    Closed-form simple linear regression y = beta * x + alpha.
+
+    Equivalent to np.polyfit(x, y, 1) without building a Vandermonde
+    matrix and solving it by least squares.
+
+    Returns:
+    --------
+    tuple
+        (beta, alpha)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    beta = (dx * (y - y_mean)).sum() / (dx * dx).sum()
+    return beta, y_mean - beta * x_mean
+
+
+def _summary_stats(values):
+    """
+    NaN-skipping (min, max, mean, std with ddof=1) of a 1-D array.
+
+    Computed once on the raw array with bottleneck's reductions when it is
+    installed (NumPy nan-reductions otherwise) instead of four pandas
+    Series reductions; values match pandas' skipna results.
+    """
+    if values.size == 0:
+        return np.nan, np.nan, np.nan, np.nan
+    if _HAS_BOTTLENECK:
+        return bn.nanmin(values), bn.nanmax(values), bn.nanmean(values), bn.nanstd(values, ddof=1)
+    return np.nanmin(values), np.nanmax(values), np.nanmean(values), np.nanstd(values, ddof=1)
+
+
+def _rolling_pair_moments(values, window, step_size):
+    """
+    Means and centered cross-products of two columns for every rolling window.
+
+    Cumulative sums of the data and of their pairwise products give each
+    window's sums by differencing, so sliding by step_size costs O(1) per
+    window instead of rescanning all window rows. Windows with missing
+    prices come out as NaN without affecting the others.
+
+    Returns:
+    --------
+    tuple
+        (ends, means, cross): exclusive window end indices, (windows, 2)
+        column means and (windows, 2, 2) centered cross-products
+    """
+    n = len(values)
+    ends = np.arange(window, n + 1, step_size)
+    starts = ends - window
+
+    # Shift toward zero so the differenced running sums keep their precision
+    center = np.nanmean(values, axis=0)
+    shifted = values - center
+    bad_rows = ~np.isfinite(shifted).all(axis=1)
+    shifted[bad_rows] = 0.0
+    sum_bad = np.concatenate([[0], np.cumsum(bad_rows)])
+
+    sum_v = np.zeros((n + 1, 2))
+    sum_vv = np.zeros((n + 1, 2, 2))
+    np.cumsum(shifted, axis=0, out=sum_v[1:])
+    np.cumsum(shifted[:, :, None] * shifted[:, None, :], axis=0, out=sum_vv[1:])
+
+    total = sum_v[ends] - sum_v[starts]
+    cross = sum_vv[ends] - sum_vv[starts] - total[:, :, None] * total[:, None, :] / window
+    means = total / window + center
+
+    missing = sum_bad[ends] > sum_bad[starts]
+    means[missing] = np.nan
+    cross[missing] = np.nan
+    return ends, means, cross
+
+
+def _rolling_hedge_ratios(values, window, step_size):
+    """
+    Hedge ratios of column 0 on column 1 for every rolling window.
+
+    Returns:
+    --------
+    tuple
+        (ends, betas, alphas): exclusive window end indices and the slope
+        and intercept of each window
+    """
+    ends, means, cross = _rolling_pair_moments(values, window, step_size)
+    betas = cross[:, 0, 1] / cross[:, 1, 1]
+    return ends, betas, means[:, 0] - betas * means[:, 1]
+
+
+def _rolling_johansen_moments(values, window, step_size, k_ar_diff):
+    """
+    Johansen product-moment matrices for every rolling window (det_order=0).
+
+    Each regression row of coint_johansen depends only on its position in the
+    full sample: [dx_t, dx_{t-1}, ..., dx_{t-k}, x_{t-k+1}]. Cumulative sums of
+    those rows and of their outer products give every window's centered
+    cross-products by differencing, so the data are scanned once instead of
+    once per window. The lagged-difference regressors are then partialled out
+    on the small moment matrices.
+
+    Returns:
+    --------
+    list of tuple
+        (window_end, s00, sk0, skk, t) per window, where window_end is the
+        exclusive end index and s00/sk0/skk match coint_johansen's moments
+    """
+    n, neqs = values.shape
+    # Shift levels toward zero so the running sums keep their precision
+    levels = values - np.nanmean(values, axis=0)
+    diffs = np.diff(levels, axis=0)
+
+    # Row j of features holds the regression row for difference index g = j + k
+    n_rows = n - 1 - k_ar_diff
+    features = np.hstack(
+        [diffs[k_ar_diff - lag:k_ar_diff - lag + n_rows] for lag in range(k_ar_diff + 1)]
+        + [levels[1:1 + n_rows]]
+    )
+    # Rows with missing prices are zeroed in the sums and counted, so only the
+    # windows that contain them fail instead of poisoning every later window
+    bad_rows = ~np.isfinite(features).all(axis=1)
+    features[bad_rows] = 0.0
+    sum_bad = np.concatenate([[0], np.cumsum(bad_rows)])
+
+    sum_f = np.zeros((n_rows + 1, features.shape[1]))
+    sum_ff = np.zeros((n_rows + 1, features.shape[1], features.shape[1]))
+    np.cumsum(features, axis=0, out=sum_f[1:])
+    np.cumsum(features[:, :, None] * features[:, None, :], axis=0, out=sum_ff[1:])
+
+    d, z, l = slice(0, neqs), slice(neqs, neqs * (k_ar_diff + 1)), slice(neqs * (k_ar_diff + 1), None)
+    t = window - 1 - k_ar_diff
+    moments = []
+    for end in range(window, n + 1, step_size):
+        start = end - window
+        if sum_bad[start + t] > sum_bad[start]:
+            nan_block = np.full((neqs, neqs), np.nan)
+            moments.append((end, nan_block, nan_block, nan_block, t))
+            continue
+
+        total = sum_f[start + t] - sum_f[start]
+        cross = sum_ff[start + t] - sum_ff[start] - np.outer(total, total) / t
+
+        # Residual moments after regressing on the lagged differences
+        if k_ar_diff > 0:
+            proj = np.linalg.pinv(cross[z, z])
+            czd, czl = cross[z, d], cross[z, l]
+            s00 = cross[d, d] - czd.T @ proj @ czd
+            sk0 = cross[l, d] - czl.T @ proj @ czd
+            skk = cross[l, l] - czl.T @ proj @ czl
+        else:
+            s00, sk0, skk = cross[d, d], cross[l, d], cross[l, l]
+        moments.append((end, s00 / t, sk0 / t, skk / t, t))
+
+    return moments
+
+
+# Approximate Johansen p-value when the leading trace statistic exceeds
+# none, the 90%, the 95% or the 99% critical value
+_APPROX_PVALUES = np.array([0.15, 0.075, 0.025, 0.005])
+
+
+@lru_cache(maxsize=16)
+def _trace_critical_values(neqs, det_order):
+    """
+    Johansen trace critical values (90/95/99%) for each rank hypothesis.
+
+    The table depends only on the system size and det_order, so it is built
+    once per combination. The returned array is read-only.
+    """
+    cvt = np.array([c_sjt(neqs - i, det_order) for i in range(neqs)])
+    cvt.flags.writeable = False
+    return cvt
+
+
+def _johansen_from_moments(s00, sk0, skk, t, det_order=0):
+    """
+    Johansen eigen-decomposition and trace statistics from product moments.
+
+    Mirrors the second half of statsmodels' coint_johansen, but solves the
+    symmetric generalized eigenproblem with LAPACK directly instead of a
+    general eig followed by Cholesky re-normalization.
+
+    Returns:
+    --------
+    tuple
+        (lr1, cvt, evec)
+    """
+    neqs = s00.shape[0]
+    sig = sk0 @ linalg.solve(s00, sk0.T, assume_a='pos')
+
+    # Symmetric-definite problem sig v = a skk v; eigh returns vectors already
+    # normalized so that v' skk v = I (the Cholesky step in statsmodels)
+    au, dt = linalg.eigh(sig, skk, driver='gvd', overwrite_a=True, overwrite_b=True)
+
+    a = au[::-1]
+    evec = dt[:, ::-1]
+    # Normalize by first non-zero element, as statsmodels does
+    non_zero = evec.flat != 0
+    if np.any(non_zero):
+        evec *= np.sign(evec.flat[non_zero][0])
+
+    log_rest = np.log(1 - a)
+    lr1 = -t * np.cumsum(log_rest[::-1])[::-1]
+    cvt = _trace_critical_values(neqs, det_order)
+    return lr1, cvt, evec
+
+
+def _johansen_batch(s00, sk0, skk, t, det_order=0):
+    """
+    Johansen trace statistics and vectors for a stack of same-size windows.
+
+    Every window of a basket has the same N x N shape, so the whole sweep is
+    solved with stacked LAPACK calls instead of one small solve per window.
+    The generalized problem sig v = a skk v is reduced to a standard
+    symmetric one through the Cholesky factor skk = L L'.
+
+    Raises np.linalg.LinAlgError if any window is singular; callers then fall
+    back to _johansen_from_moments window by window.
+
+    Returns:
+    --------
+    tuple
+        (lr1, cvt, evec) with lr1 of shape (windows, N) and evec of shape
+        (windows, N, N)
+    """
+    if not (np.isfinite(s00).all() and np.isfinite(sk0).all() and np.isfinite(skk).all()):
+        raise np.linalg.LinAlgError("Moments contain infs or NaNs")
+
+    neqs = s00.shape[-1]
+    sig = sk0 @ np.linalg.solve(s00, np.swapaxes(sk0, -1, -2))
+    l_inv = np.linalg.inv(np.linalg.cholesky(skk))
+    l_inv_t = np.swapaxes(l_inv, -1, -2)
+    au, vec = np.linalg.eigh(l_inv @ sig @ l_inv_t)
+
+    a = au[:, ::-1]
+    evec = (l_inv_t @ vec)[:, :, ::-1]
+    # Normalize each window by its first non-zero element, as statsmodels does
+    flat = evec.reshape(len(evec), -1)
+    first = flat[np.arange(len(flat)), np.argmax(flat != 0, axis=1)]
+    evec *= np.where(first < 0, -1.0, 1.0)[:, None, None]
+
+    lr1 = -t * np.cumsum(np.log(1 - a)[:, ::-1], axis=1)[:, ::-1]
+    return lr1, _trace_critical_values(neqs, det_order), evec
+
+
+def _adf_design(levels, diffs, n_lags, n_rows):
+    """
+    ADF regressors for the last n_rows differences of every column.
+
+    Returns:
+    --------
+    np.ndarray
+        (columns, n_rows, n_lags + 1) array holding the lagged level followed
+        by n_lags lagged differences, the column layout adfuller uses
+    """
+    end = len(diffs)
+    design = np.empty((levels.shape[1], n_rows, n_lags + 1))
+    design[:, :, 0] = levels[end - n_rows:end].T
+    for lag in range(1, n_lags + 1):
+        design[:, :, lag] = diffs[end - n_rows - lag:end - lag].T
+    return design
+
+
+def _adf_ols(design, target):
+    """
+    Stacked OLS of target on design per column (batched matrix products).
+
+    Returns:
+    --------
+    tuple
+        (coef, ssr, inverse Gram matrices)
+    """
+    gram = np.swapaxes(design, 1, 2) @ design
+    moment = np.swapaxes(design, 1, 2) @ target[:, :, None]
+    inv_gram = np.linalg.inv(gram)
+    coef = inv_gram @ moment
+    resid = target - (design @ coef)[:, :, 0]
+    return coef[:, :, 0], np.einsum('kt,kt->k', resid, resid), inv_gram
+
+
+def _adf_tau_batch(levels):
+    """
+    ADF t-statistics (no constant, lag length by AIC) for every column at once.
+
+    Matches adfuller(column, regression="n", autolag="aic")[0]: the lag
+    length is chosen by AIC on the rows common to every candidate lag, then
+    the chosen regression is refit on all the rows it can use. Each step is
+    solved for all columns through stacked normal equations instead of one
+    statsmodels OLS model per column and lag.
+
+    Raises np.linalg.LinAlgError if any regression is singular.
+
+    Returns:
+    --------
+    np.ndarray
+        ADF statistic per column
+    """
+    n_obs, n_series = levels.shape
+    max_lag = min(n_obs // 2 - 1, int(np.ceil(12.0 * np.power(n_obs / 100.0, 1 / 4.0))))
+    if max_lag < 0:
+        raise ValueError("sample size is too short to use selected regression component")
+    diffs = np.diff(levels, axis=0)
+
+    # Lag search: AIC up to constants is n * log(ssr) + 2 * regressors. The
+    # Gram matrix of the longest lag holds every shorter one as a sub-block,
+    # and each ssr follows from the normal equations without residuals
+    n_rows = len(diffs) - max_lag
+    design = _adf_design(levels, diffs, max_lag, n_rows)
+    target = np.ascontiguousarray(diffs[len(diffs) - n_rows:].T)
+    gram = np.swapaxes(design, 1, 2) @ design
+    moment = np.swapaxes(design, 1, 2) @ target[:, :, None]
+    total = np.einsum('kt,kt->k', target, target)
+    aic = np.empty((max_lag + 1, n_series))
+    for n_lags in range(max_lag + 1):
+        m = n_lags + 1
+        coef = np.linalg.solve(gram[:, :m, :m], moment[:, :m])
+        ssr = total - np.einsum('ki,ki->k', moment[:, :m, 0], coef[:, :, 0])
+        aic[n_lags] = n_rows * np.log(ssr) + 2 * m
+    best = np.argmin(aic, axis=0)
+
+    # Refit each column at its chosen lag on the longest sample
+    tau = np.empty(n_series)
+    for n_lags in np.unique(best):
+        cols = np.flatnonzero(best == n_lags)
+        n_rows = len(diffs) - n_lags
+        design = _adf_design(levels[:, cols], diffs[:, cols], n_lags, n_rows)
+        coef, ssr, inv_gram = _adf_ols(design, np.ascontiguousarray(diffs[len(diffs) - n_rows:, cols].T))
+        sigma2 = ssr / (n_rows - (n_lags + 1))
+        tau[cols] = coef[:, 0] / np.sqrt(sigma2 * inv_gram[:, 0, 0])
+    return tau
+
+
+# MacKinnon (1994) response surface for the Engle-Granger test of two
+# variables with a constant, as in statsmodels' mackinnonp(regression="c", N=2):
+# scores beyond the bounds map to p = 0 / 1, and scores below/above the
+# switch point use the small-p / large-p polynomial (lowest order first)
+_EG_TAU_MIN = -18.86
+_EG_TAU_MAX = 0.92
+_EG_TAU_STAR = -2.62
+_EG_SMALLP = np.array([2.92, 1.5012, 0.039796])
+_EG_LARGEP = np.array([2.1945, 0.64695, -0.29198, -0.042377])
+
+
+def _mackinnonp_batch(scores):
+    """
+    Approximate Engle-Granger p-values for an array of ADF statistics.
+
+    Same values as mackinnonp(score, regression="c", N=2) element by
+    element, evaluated with two polynomials and one normal CDF call
+    instead of a Python-level call per score.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    # Clip first so infinite scores (colinear pairs) stay finite in the polynomials
+    bounded = np.clip(scores, _EG_TAU_MIN, _EG_TAU_MAX)
+    z = np.where(bounded <= _EG_TAU_STAR,
+                 np.polynomial.polynomial.polyval(bounded, _EG_SMALLP),
+                 np.polynomial.polynomial.polyval(bounded, _EG_LARGEP))
+    return np.where(scores < _EG_TAU_MIN, 0.0, np.where(scores > _EG_TAU_MAX, 1.0, ndtr(z)))
+
+
+def _engle_granger_batch(y, resid):
+    """
+    Engle-Granger tests for many pairs at once from their fitted residuals.
+
+    Column k of resid holds the cointegrating-regression residuals of column
+    k of y; the statistics match statsmodels' coint column by column, but the ADF
+    regressions of all pairs are solved together.
+
+    Raises np.linalg.LinAlgError or ValueError when the batch cannot be
+    solved (missing data, a singular regression); callers then fall back to
+    testing pairs one at a time.
+
+    Returns:
+    --------
+    tuple
+        (scores, p_values) arrays, one entry per column; NaN for a constant
+        column of y
+    """
+    if not np.isfinite(resid).all():
+        raise ValueError("Residuals contain infs or NaNs")
+
+    y_centered = y - y.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsquared = 1 - np.einsum('tk,tk->k', resid, resid) / np.einsum('tk,tk->k', y_centered, y_centered)
+
+    # Almost perfectly colinear pairs score -inf, as in coint; a constant
+    # column leaves R-squared undefined and scores NaN
+    testable = rsquared < 1 - 100 * np.sqrt(np.finfo(np.double).eps)
+    scores = np.where(np.isfinite(rsquared), -np.inf, np.nan)
+    if testable.any():
+        scores[testable] = _adf_tau_batch(resid[:, testable])
+    return scores, _mackinnonp_batch(scores)
+
+
+# Newer statsmodels warns unless the plain-tuple adfuller return is requested
+_ADF_TUPLE_KWARGS = (
+    {"result_object": False} if "result_object" in inspect.signature(adfuller).parameters else {}
+)
+
+
+def _engle_granger(y, x, beta, alpha):
+    """
+    Engle-Granger test for y on x given an already fitted hedge ratio.
+
+    Same statistic and MacKinnon p-value as statsmodels' coint (constant
+    trend, two variables), but reuses beta/alpha instead of re-running the
+    cointegrating regression.
+
+    Raises ValueError on missing data (NaN/inf prices or hedge ratio), as
+    coint and _engle_granger_batch do.
+
+    Returns:
+    --------
+    tuple
+        (score, p_value); both NaN when y is constant and the fit is undefined
+    """
+    if not (np.isfinite(y).all() and np.isfinite(x).all()):
+        raise ValueError("exog contains inf or nans")
+    resid = y - beta * x - alpha
+    if not np.isfinite(resid).all():
+        raise ValueError("Residuals contain infs or NaNs")
+    y_centered = y - y.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsquared = 1 - np.dot(resid, resid) / np.dot(y_centered, y_centered)
+
+    if not np.isfinite(rsquared):
+        return np.nan, np.nan
+    # Almost perfectly colinear series: coint reports -inf as well
+    if rsquared < 1 - 100 * np.sqrt(np.finfo(np.double).eps):
+        score = adfuller(resid, autolag="aic", regression="n", **_ADF_TUPLE_KWARGS)[0]
+    else:
+        score = -np.inf
+    return score, float(_mackinnonp_batch(score))
+
+
+@lru_cache(maxsize=32)
+def _rolling_johansen_from_bytes(data_bytes, shape, window, step_size):
+    """
+    Johansen statistics and vectors for every rolling window (k_ar_diff=1).
+
+    The price matrix is passed as raw bytes so the sweep is memoized on the
+    data itself: analyzing the same basket again reuses the result. Windows
+    are solved together, falling back to one solve per window when some
+    have missing data or one is singular, so only the offending windows
+    report errors. The returned lists are shared and must not be modified.
+
+    Returns:
+    --------
+    tuple
+        (ends, solutions): exclusive window end indices and, per window,
+        (lr1, evec) or the exception raised while solving it
+    """
+    values = np.frombuffer(data_bytes, dtype=np.float64).reshape(shape)
+    moments = _rolling_johansen_moments(values, window, step_size, k_ar_diff=1)
+
+    solved = {}
+    complete = [w for w, m in enumerate(moments) if np.isfinite(m[1]).all()]
+    if complete:
+        try:
+            lr1_all, _, evec_all = _johansen_batch(
+                *(np.stack([moments[w][k] for w in complete]) for k in (1, 2, 3)),
+                moments[0][4]
+            )
+            solved = {w: (lr1_all[j], evec_all[j]) for j, w in enumerate(complete)}
+        except np.linalg.LinAlgError:
+            solved = {}
+
+    ends, solutions = [], []
+    for w, (i, s00, sk0, skk, t) in enumerate(moments):
+        ends.append(i)
+        if w in solved:
+            solutions.append(solved[w])
+            continue
+        try:
+            lr1, _, evec = _johansen_from_moments(s00, sk0, skk, t)
+            solutions.append((lr1, evec))
+        except Exception as e:
+            solutions.append(e)
+    return ends, solutions
 
 
 def rolling_cointegration_analysis(data, window=252, step_size=21, crit_level=1):
@@ -29,100 +524,115 @@ def rolling_cointegration_analysis(data, window=252, step_size=21, crit_level=1)
         Rolling test results with cointegrating vectors
     """
     n_stocks = len(data.columns)
-    results = []
 
     if n_stocks == 2:
         # PAIRS: Use Engle-Granger test
-        print(f"\nRunning rolling cointegration for pair: {' vs '.join(data.columns)}")
-        print(f"Window: {window} days, Step: {step_size} days")
-        print(f"Total windows: {(len(data) - window) // step_size + 1}\n")
-
-        for i in range(window, len(data) + 1, step_size):
-            window_data = data.iloc[i-window:i]
-
-            # Engle-Granger test
-            score, p_value, _ = coint(window_data.iloc[:, 0], window_data.iloc[:, 1])
-
-            # Calculate beta (hedge ratio)
-            beta = np.polyfit(window_data.iloc[:, 1], window_data.iloc[:, 0], 1)[0]
-
-            results.append({
-                'date': data.index[i-1],
-                'p_value': p_value,
-                'beta': beta,
-                'cointegrated': p_value < 0.05
-            })
-
-        # Summary statistics
-        results_df = pd.DataFrame(results).set_index('date')
-        pct_coint = (results_df['p_value'] < 0.05).mean() * 100
-
-        print(f"Summary:")
-        print(f"  Cointegrated {pct_coint:.1f}% of the time")
-        print(f"  Beta: {results_df['beta'].mean():.3f} ± {results_df['beta'].std():.3f}")
-        print(f"  Beta range: [{results_df['beta'].min():.3f}, {results_df['beta'].max():.3f}]")
+        print(f"\nRunning rolling cointegration for pair: {' vs '.join(data.columns)}\n"
+              f"Window: {window} days, Step: {step_size} days\n"
+              f"Total windows: {(len(data) - window) // step_size + 1}\n")
+
+        # Hedge ratios (betas) of every window at once
+        values = data.to_numpy(dtype=np.float64)
+        ends, betas, alphas = _rolling_hedge_ratios(values, window, step_size)
+
+        # Engle-Granger tests of all windows as one batch of ADF regressions,
+        # or window by window if the batch cannot be solved; both reuse the
+        # rolling hedge ratios instead of refitting the cointegrating
+        # regression. The windows are a zero-copy strided view of the prices.
+        # Windows that cannot be tested (missing prices) are NaN and reported
+        # together
+        p_values = np.full(len(ends), np.nan)
+        if len(ends):
+            windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)[::step_size]
+            y, x = windows[:, 0], windows[:, 1]
+            try:
+                _, p_values = _engle_granger_batch(y.T, (y - betas[:, None] * x - alphas[:, None]).T)
+            except (np.linalg.LinAlgError, ValueError):
+                log = []
+                for w, i in enumerate(ends):
+                    try:
+                        p_values[w] = _engle_granger(y[w], x[w], betas[w], alphas[w])[1]
+                    except (np.linalg.LinAlgError, ValueError) as e:
+                        log.append(f"  Error at window ending {data.index[i-1]}: {e}")
+                if log:
+                    print("\n".join(log))
+
+        # One column array per statistic, indexed by each window's last date;
+        # 'cointegrated' is NaN where the window could not be tested
+        results_df = pd.DataFrame({
+            'p_value': p_values,
+            'beta': betas,
+            'cointegrated': pd.Series(p_values < 0.05).where(~np.isnan(p_values)).to_numpy()
+        }, index=pd.Index(data.index[ends - 1], name='date'))
+
+        # Summary statistics, printed in one write (none without windows)
+        if len(results_df):
+            pct_coint = np.count_nonzero(p_values < 0.05) / len(p_values) * 100
+            beta_min, beta_max, beta_mean, beta_std = _summary_stats(betas)
+
+            print(f"Summary:\n"
+                  f"  Cointegrated {pct_coint:.1f}% of the time\n"
+                  f"  Beta: {beta_mean:.3f} ± {beta_std:.3f}\n"
+                  f"  Beta range: [{beta_min:.3f}, {beta_max:.3f}]")
 
     else:
         # BASKETS: Use Johansen test
-        print(f"\nRunning rolling cointegration for basket: {', '.join(data.columns)}")
-        print(f"Window: {window} days, Step: {step_size} days")
-        print(f"Total windows: {(len(data) - window) // step_size + 1}\n")
-
-        for i in range(window, len(data) + 1, step_size):
-            window_data = data.iloc[i-window:i]
-
-            try:
-                # Johansen test
-                result = coint_johansen(window_data, det_order=0, k_ar_diff=1)
-                coint_rank = sum(result.lr1 > result.cvt[:, crit_level])
-                max_trace = result.lr1[0] if len(result.lr1) > 0 else 0
-
-                # Calculate approximate p-value based on trace statistic and critical values
-                # Using the ratio of trace stat to critical value as a proxy
-                if len(result.lr1) > 0 and len(result.cvt) > 0:
-                    # If trace stat exceeds 99% critical value, p-value < 0.01
-                    # If it exceeds 95% critical value, p-value < 0.05
-                    # If it exceeds 90% critical value, p-value < 0.10
-                    if result.lr1[0] > result.cvt[0, 2]:  # 99% critical value
-                        approx_pvalue = 0.005
-                    elif result.lr1[0] > result.cvt[0, 1]:  # 95% critical value
-                        approx_pvalue = 0.025
-                    elif result.lr1[0] > result.cvt[0, 0]:  # 90% critical value
-                        approx_pvalue = 0.075
-                    else:
-                        approx_pvalue = 0.15
-                else:
-                    approx_pvalue = np.nan
-
-                # Store cointegrating vectors if they exist
-                vectors_dict = {}
-                if coint_rank > 0:
-                    for j in range(coint_rank):
-                        for k, stock in enumerate(window_data.columns):
-                            vectors_dict[f'{stock}_v{j+1}'] = result.evec[k, j]
-
-                results.append({
-                    'date': data.index[i-1],
-                    'trace_stat': max_trace,
-                    'coint_rank': coint_rank,
-                    'p_value_approx': approx_pvalue,
-                    'crit_val_90': result.cvt[0, 0] if len(result.cvt) > 0 else np.nan,
-                    'crit_val_95': result.cvt[0, 1] if len(result.cvt) > 0 else np.nan,
-                    'crit_val_99': result.cvt[0, 2] if len(result.cvt) > 0 else np.nan,
-                    **vectors_dict
-                })
-
-            except Exception as e:
-                print(f"  Error at window ending {data.index[i-1]}: {e}")
-
-        # Summary statistics
-        results_df = pd.DataFrame(results).set_index('date')
-        avg_rank = results_df['coint_rank'].mean()
-
-        print(f"Summary:")
-        print(f"  Average cointegration rank: {avg_rank:.2f}")
-        print(f"  Max rank observed: {results_df['coint_rank'].max()}")
-        print(f"  % of windows with cointegration: {(results_df['coint_rank'] > 0).mean()*100:.1f}%")
+        print(f"\nRunning rolling cointegration for basket: {', '.join(data.columns)}\n"
+              f"Window: {window} days, Step: {step_size} days\n"
+              f"Total windows: {(len(data) - window) // step_size + 1}\n")
+
+        # Sweep cached on the price bytes, so re-running a basket reuses it;
+        # every window shares one critical-value table
+        values = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+        ends, solutions = _rolling_johansen_from_bytes(values.tobytes(), values.shape, window, step_size)
+        cvt = _trace_critical_values(n_stocks, 0)
+
+        # Windows that could not be solved are reported together and left out
+        solved = []
+        log = []
+        for i, solution in zip(ends, solutions):
+            if isinstance(solution, Exception):
+                log.append(f"  Error at window ending {data.index[i-1]}: {solution}")
+            else:
+                solved.append(i)
+        if log:
+            print("\n".join(log))
+        good = [solution for solution in solutions if not isinstance(solution, Exception)]
+
+        # Stack the windows' statistics (windows, N) and vectors (windows, N, N)
+        lr1 = np.array([solution[0] for solution in good]).reshape(len(good), n_stocks)
+        evec = np.array([solution[1] for solution in good]).reshape(len(good), n_stocks, n_stocks)
+        coint_rank = np.count_nonzero(lr1 > cvt[:, crit_level], axis=1)
+        max_trace = lr1[:, 0]
+
+        # Approximate p-value from how many of the (ascending) 90/95/99%
+        # critical values the leading trace statistic exceeds
+        approx_pvalue = _APPROX_PVALUES[np.searchsorted(cvt[0], max_trace, side='left')]
+
+        # Cointegrating vectors, NaN in windows whose rank is below the vector's
+        vectors = {
+            f'{stock}_v{j+1}': np.where(coint_rank > j, evec[:, k, j], np.nan)
+            for j in range(coint_rank.max(initial=0))
+            for k, stock in enumerate(data.columns)
+        }
+
+        # Summary statistics; the critical values are the same for every window
+        results_df = pd.DataFrame({
+            'trace_stat': max_trace,
+            'coint_rank': coint_rank,
+            'p_value_approx': approx_pvalue,
+            'crit_val_90': cvt[0, 0],
+            'crit_val_95': cvt[0, 1],
+            'crit_val_99': cvt[0, 2],
+            **vectors
+        }, index=pd.Index(data.index[np.array(solved, dtype=np.intp) - 1], name='date'))
+
+        # Summary, printed in one write (none when no window was solved)
+        if len(results_df):
+            print(f"Summary:\n"
+                  f"  Average cointegration rank: {coint_rank.mean():.2f}\n"
+                  f"  Max rank observed: {coint_rank.max()}\n"
+                  f"  % of windows with cointegration: {np.count_nonzero(coint_rank) / len(coint_rank) * 100:.1f}%")
 
     return results_df
 
@@ -190,7 +700,7 @@ def calculate_spread(data, hedge_ratio=None):
     stock_a, stock_b = data.columns
 
     if hedge_ratio is None:
-        hedge_ratio = np.polyfit(data[stock_b], data[stock_a], 1)[0]
+        hedge_ratio = _ols_fit(data[stock_b].to_numpy(), data[stock_a].to_numpy())[0]
 
     spread = data[stock_a] - hedge_ratio * data[stock_b]
     return spread
@@ -212,9 +722,14 @@ def calculate_zscore(spread, window=20):
     pd.Series
         Z-score time series
     """
-    spread_mean = spread.rolling(window=window).mean()
-    spread_std = spread.rolling(window=window).std()
-    zscore = (spread - spread_mean) / spread_std
+    if _HAS_BOTTLENECK:
+        values = np.asarray(spread, dtype=np.float64)
+        spread_mean = bn.move_mean(values, window)
+        spread_std = bn.move_std(values, window, ddof=1)
+        return pd.Series((values - spread_mean) / spread_std, index=spread.index, name=spread.name)
+
+    rolling = spread.rolling(window=window)
+    zscore = (spread - rolling.mean()) / rolling.std()
     return zscore
 
 
@@ -239,35 +754,27 @@ def analyze_spread_stability(data, window=252, step_size=21):
     if len(data.columns) != 2:
         raise ValueError("Data must contain exactly 2 stocks for spread analysis")
 
-    results = []
-
-    for i in range(window, len(data) + 1, step_size):
-        window_data = data.iloc[i-window:i]
-
-        # Calculate hedge ratio for this window
-        beta = np.polyfit(window_data.iloc[:, 1], window_data.iloc[:, 0], 1)[0]
-
-        # Calculate spread
-        spread = window_data.iloc[:, 0] - beta * window_data.iloc[:, 1]
-
-        # Calculate spread statistics
-        spread_mean = spread.mean()
-        spread_std = spread.std()
-        spread_adf = None  # Could add ADF test here if needed
-
-        results.append({
-            'date': data.index[i-1],
-            'hedge_ratio': beta,
-            'spread_mean': spread_mean,
-            'spread_std': spread_std,
-            'spread_cv': spread_std / abs(spread_mean) if spread_mean != 0 else np.nan
-        })
-
-    results_df = pd.DataFrame(results).set_index('date')
-
+    # Hedge ratio and spread statistics of every window from its moments:
+    # the spread y - beta * x has variance Cyy - 2 beta Cxy + beta^2 Cxx
+    ends, means, cross = _rolling_pair_moments(data.to_numpy(dtype=np.float64), window, step_size)
+    betas = cross[:, 0, 1] / cross[:, 1, 1]
+    spread_mean = means[:, 0] - betas * means[:, 1]
+    spread_var = (cross[:, 0, 0] - 2 * betas * cross[:, 0, 1] + betas * betas * cross[:, 1, 1]) / (window - 1)
+    spread_std = np.sqrt(np.maximum(spread_var, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spread_cv = np.where(spread_mean != 0, spread_std / np.abs(spread_mean), np.nan)
+
+    results_df = pd.DataFrame({
+        'hedge_ratio': betas,
+        'spread_mean': spread_mean,
+        'spread_std': spread_std,
+        'spread_cv': spread_cv
+    }, index=pd.Index(data.index[ends - 1], name='date'))
+
+    beta_min, beta_max, _, beta_std = _summary_stats(betas)
     print(f"\nSpread Stability Analysis:")
-    print(f"  Hedge ratio range: [{results_df['hedge_ratio'].min():.3f}, {results_df['hedge_ratio'].max():.3f}]")
-    print(f"  Hedge ratio volatility: {results_df['hedge_ratio'].std():.3f}")
-    print(f"  Average spread CV: {results_df['spread_cv'].mean():.3f}")
+    print(f"  Hedge ratio range: [{beta_min:.3f}, {beta_max:.3f}]")
+    print(f"  Hedge ratio volatility: {beta_std:.3f}")
+    print(f"  Average spread CV: {np.nanmean(spread_cv):.3f}")
 
     return results_df
@@ -0,0 +1,33 @@
+"""
+Small numeric helpers shared by the analysis and interpretation modules.
+
+Depends only on NumPy, so importing it does not load statsmodels.
+"""
+
+import numpy as np
+
+
+def mean_std(values):
+    """
+    NaN-skipping mean and sample standard deviation (ddof=1) in one pass.
+
+    Uses the shifted-data form of the running sums: values are offset by the
+    first observation so the sum of squares does not cancel catastrophically
+    when the spread sits far from zero relative to its spread.
+
+    Returns:
+    --------
+    tuple
+        (mean, std); std is NaN with fewer than two observations
+    """
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return np.nan, np.nan
+    shifted = values - values[0]
+    total = shifted.sum()
+    mean = values[0] + total / n
+    if n < 2:
+        return mean, np.nan
+    var = (np.dot(shifted, shifted) - total * total / n) / (n - 1)
+    return mean, np.sqrt(max(var, 0.0))
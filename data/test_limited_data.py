@@ -12,6 +12,7 @@ from parameter_validator import (
     validate_backtest_parameters,
     print_validation_results,
     suggest_parameters,
+    suggest_parameters_array,
     print_suggested_parameters
 )
 from data_loader import get_close_price_data
@@ -45,7 +46,8 @@ def test_6_months_data():
         step_size=suggestions['rolling_step'],
         backtest_method=suggestions['method'],
         use_llm=False,
-        save_plots=False
+        save_plots=False,
+        data=data  # Reuse the frame fetched above
     )
 
     if results is not None:
@@ -91,7 +93,8 @@ def test_1_year_data():
         step_size=suggestions['rolling_step'],
         backtest_method=suggestions['method'],
         use_llm=False,
-        save_plots=False
+        save_plots=False,
+        data=data  # Reuse the frame fetched above
     )
 
     if results is not None:
@@ -192,12 +195,13 @@ def show_parameter_ranges():
         ("2 years (~504 days)", 504),
     ]
 
-    for scenario_name, days in scenarios:
+    # One vectorized table for every scenario, then print row by row
+    table = suggest_parameters_array([days for _, days in scenarios], "walk_forward")
+
+    for (scenario_name, days), suggestions in zip(scenarios, table.to_dict('records')):
         print(f"\n{scenario_name}:")
         print("-" * 70)
 
-        suggestions = suggest_parameters(days, "walk_forward")
-
         print(f"  Method: {suggestions['method']}")
         print(f"  Rolling window: {suggestions['rolling_window']} days")
         print(f"  Step size: {suggestions['rolling_step']} days")
@@ -10,8 +10,8 @@ from backtesting import walk_forward_backtest, backtest_with_train_test_split, p
 from data_loader import get_close_price_data
 
 
-def test_walkforward_backtest():
-    """Test walk-forward backtesting methodology."""
+def test_walkforward_backtest(data=None):
+    """Test walk-forward backtesting methodology (downloads AAPL/MSFT unless data is given)."""
     print("=" * 70)
     print("TESTING WALK-FORWARD BACKTESTING")
     print("=" * 70)
@@ -20,8 +20,9 @@ def test_walkforward_backtest():
     tickers = ["AAPL", "MSFT"]
     period = "1y"  # Use 1 year for faster testing
 
-    print(f"\nDownloading data for {tickers}...")
-    data = get_close_price_data(tickers, period=period)
+    if data is None:
+        print(f"\nDownloading data for {tickers}...")
+        data = get_close_price_data(tickers, period=period)
     print(f"Downloaded {len(data)} days of data")
 
     # Run walk-forward backtest
@@ -96,8 +97,8 @@ def test_walkforward_backtest():
     return wf_results, tt_results
 
 
-def test_comprehensive_with_walkforward():
-    """Test comprehensive analysis with walk-forward backtesting."""
+def test_comprehensive_with_walkforward(data=None):
+    """Test comprehensive analysis with walk-forward backtesting (reusing data if given)."""
     print("\n\n" + "=" * 70)
     print("TESTING COMPREHENSIVE ANALYSIS WITH WALK-FORWARD")
     print("=" * 70)
@@ -111,7 +112,8 @@ def test_comprehensive_with_walkforward():
         use_llm=False,  # Disable LLM for faster testing
         save_plots=True,
         plots_dir="plots",
-        backtest_method="walk_forward"  # Use walk-forward method
+        backtest_method="walk_forward",  # Use walk-forward method
+        data=data
     )
 
     print("\n" + "=" * 70)
@@ -131,17 +133,20 @@ def test_comprehensive_with_walkforward():
 
 
 if __name__ == "__main__":
+    # Both tests analyze the same 1y AAPL/MSFT prices: fetch them once
+    data = get_close_price_data(["AAPL", "MSFT"], period="1y")
+
     # Test 1: Direct walk-forward and train/test split comparison
     print("\n" + "=" * 70)
     print("TEST 1: Walk-Forward vs Train/Test Split")
     print("=" * 70)
-    wf_results, tt_results = test_walkforward_backtest()
+    wf_results, tt_results = test_walkforward_backtest(data)
 
     # Test 2: Comprehensive analysis with walk-forward
     print("\n\n" + "=" * 70)
     print("TEST 2: Comprehensive Analysis with Walk-Forward")
     print("=" * 70)
-    comprehensive_results = test_comprehensive_with_walkforward()
+    comprehensive_results = test_comprehensive_with_walkforward(data)
 
     print("\n" + "=" * 70)
     print("ALL TESTS COMPLETE!")
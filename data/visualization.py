@@ -4,12 +4,80 @@ Visualization functions for cointegration analysis results.
 
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
+# Long daily series: let Agg merge near-collinear segments and draw paths in chunks
+matplotlib.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
 import matplotlib.pyplot as plt
+import io
 import numpy as np
 import os
+from rolling_analysis import calculate_spread, calculate_zscore
 
+# Defaults sized for quick QA runs: Agg render and PNG encode time scale with
+# pixel count, and 10x6 in @ 100 dpi is about a quarter of 14x9 @ 150. For
+# publication plots pass a larger figsize and raise DEFAULT_DPI (e.g.
+# visualization.DEFAULT_DPI = 300) before saving.
+DEFAULT_FIGSIZE = (10, 6)
+DEFAULT_DPI = 100
 
-def plot_price_series(data, title=None, figsize=(12, 6), save_path=None):
+
+def _figure(name, figsize, nrows=None):
+    """
+    Figure for one plot function and size, reused across calls.
+
+    pyplot keeps one figure per num label; clear=True wipes the previous
+    drawing so repeated plots reuse its canvas and renderer instead of
+    allocating new ones. Saved figures are left open for the next call.
+    Returns the Figure, or (Figure, axes) like plt.subplots when nrows is
+    given. A figsize of None means DEFAULT_FIGSIZE.
+    """
+    figsize = figsize or DEFAULT_FIGSIZE
+    num = f"{name} {figsize[0]}x{figsize[1]}"
+    if nrows is None:
+        return plt.figure(num=num, figsize=figsize, clear=True)
+    return plt.subplots(nrows, 1, figsize=figsize, num=num, clear=True)
+
+
+def _save_or_show(save_path, return_bytes=False):
+    """
+    Save the current figure to save_path, or show it when no path is given.
+
+    The image is rendered into memory and written to disk in one call.
+    PNGs are encoded with zlib level 1: encoding dominates savefig time at
+    the default level, and level 1 is several times faster for files only
+    slightly larger. With return_bytes the encoded image is also returned
+    (PNG when there is no save_path) instead of showing the figure.
+    """
+    if not (save_path or return_bytes):
+        plt.show()
+        return None
+
+    fmt = os.path.splitext(save_path)[1][1:].lower() if save_path else 'png'
+    extra = {'pil_kwargs': {'compress_level': 1}} if fmt == 'png' else {}
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format=fmt or 'png', dpi=DEFAULT_DPI, bbox_inches='tight', **extra)
+    image = buffer.getvalue()
+    if save_path:
+        with open(save_path, 'wb') as f:
+            f.write(image)
+        print(f"  Saved plot to {save_path}")
+    return image if return_bytes else None
+
+
+def _band_lines(ax, levels, **kwargs):
+    """
+    Full-width horizontal lines at several levels as one artist.
+
+    Like repeated axhline calls (x spans the axes, y is in data units), but
+    a single LineCollection with one legend entry.
+    """
+    return ax.hlines(levels, 0, 1, transform=ax.get_yaxis_transform(), **kwargs)
+
+
+def plot_price_series(data, title=None, figsize=None, save_path=None, return_bytes=False):
     """
     Plot price series for multiple stocks.
 
@@ -20,13 +88,16 @@ def plot_price_series(data, title=None, figsize=(12, 6), save_path=None):
     title : str, optional
         Plot title
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    plt.figure(figsize=figsize)
-    for col in data.columns:
-        plt.plot(data.index, data[col], label=col, linewidth=2, alpha=0.8)
+    _figure('plot_price_series', figsize)
+    # One call draws every column; labels map onto the lines in order
+    plt.plot(data.index, data.to_numpy(), label=list(data.columns), linewidth=2, alpha=0.8)
 
     plt.xlabel('Date', fontsize=11)
     plt.ylabel('Log Price', fontsize=11)
@@ -39,15 +110,11 @@ def plot_price_series(data, title=None, figsize=(12, 6), save_path=None):
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)
 
 
-def plot_rolling_pair_results(results_df, tickers, window=252, step_size=21, figsize=(14, 9), save_path=None):
+def plot_rolling_pair_results(results_df, tickers, window=252, step_size=21, figsize=None, save_path=None,
+                              return_bytes=False):
     """
     Plot rolling cointegration results for a pair.
 
@@ -62,16 +129,22 @@ def plot_rolling_pair_results(results_df, tickers, window=252, step_size=21, fig
     step_size : int
         Step size used (for title)
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize)
+    fig, (ax1, ax2) = _figure('plot_rolling_pair_results', figsize, nrows=2)
+
+    # Dates converted once and shared by every artist
+    dates = results_df.index.to_numpy()
 
     # P-value plot
-    ax1.plot(results_df.index, results_df['p_value'], linewidth=2, color='steelblue')
+    ax1.plot(dates, results_df['p_value'], linewidth=2, color='steelblue')
     ax1.axhline(y=0.05, color='red', linestyle='--', linewidth=2, label='p=0.05 threshold')
-    ax1.fill_between(results_df.index, 0, 0.05, alpha=0.2, color='green', label='Cointegrated')
+    ax1.fill_between(dates, 0, 0.05, alpha=0.2, color='green', label='Cointegrated')
     ax1.set_ylabel('P-value', fontsize=11)
     ax1.set_title(f'Rolling Cointegration: {" vs ".join(tickers)} ({window}d window, {step_size}d step)',
                  fontsize=13, fontweight='bold')
@@ -79,7 +152,7 @@ def plot_rolling_pair_results(results_df, tickers, window=252, step_size=21, fig
     ax1.grid(True, alpha=0.3)
 
     # Beta plot
-    ax2.plot(results_df.index, results_df['beta'], linewidth=2, color='purple')
+    ax2.plot(dates, results_df['beta'], linewidth=2, color='purple')
     ax2.set_xlabel('Date', fontsize=11)
     ax2.set_ylabel('Beta (Hedge Ratio)', fontsize=11)
     ax2.set_title('Rolling Beta/Hedge Ratio', fontsize=13, fontweight='bold')
@@ -87,15 +160,11 @@ def plot_rolling_pair_results(results_df, tickers, window=252, step_size=21, fig
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)
 
 
-def plot_rolling_basket_results(results_df, tickers, window=252, step_size=21, figsize=(14, 9), save_path=None):
+def plot_rolling_basket_results(results_df, tickers, window=252, step_size=21, figsize=None, save_path=None,
+                                return_bytes=False):
     """
     Plot rolling cointegration results for a basket.
 
@@ -110,21 +179,27 @@ def plot_rolling_basket_results(results_df, tickers, window=252, step_size=21, f
     step_size : int
         Step size used (for title)
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize)
+    fig, (ax1, ax2) = _figure('plot_rolling_basket_results', figsize, nrows=2)
+
+    # Dates converted once and shared by every artist
+    dates = results_df.index.to_numpy()
 
     # Trace statistic
-    ax1.plot(results_df.index, results_df['trace_stat'], linewidth=2, color='steelblue')
+    ax1.plot(dates, results_df['trace_stat'], linewidth=2, color='steelblue')
     ax1.set_ylabel('Trace Statistic', fontsize=11)
     ax1.set_title(f'Rolling Cointegration: {", ".join(tickers)} ({window}d window, {step_size}d step)',
                  fontsize=13, fontweight='bold')
     ax1.grid(True, alpha=0.3)
 
     # Cointegration rank
-    ax2.plot(results_df.index, results_df['coint_rank'], linewidth=2, color='green',
+    ax2.plot(dates, results_df['coint_rank'], linewidth=2, color='green',
             marker='o', markersize=4)
     ax2.set_xlabel('Date', fontsize=11)
     ax2.set_ylabel('Cointegration Rank', fontsize=11)
@@ -134,15 +209,11 @@ def plot_rolling_basket_results(results_df, tickers, window=252, step_size=21, f
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)
 
 
-def plot_rolling_results(results_df, tickers, window=252, step_size=21, figsize=(14, 9), save_path=None):
+def plot_rolling_results(results_df, tickers, window=252, step_size=21, figsize=None, save_path=None,
+                         return_bytes=False):
     """
     Automatically detect type and plot rolling cointegration results.
 
@@ -157,19 +228,24 @@ def plot_rolling_results(results_df, tickers, window=252, step_size=21, figsize=
     step_size : int
         Step size used (for title)
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
     is_pair = 'p_value' in results_df.columns
 
     if is_pair:
-        plot_rolling_pair_results(results_df, tickers, window, step_size, figsize, save_path)
+        return plot_rolling_pair_results(results_df, tickers, window, step_size, figsize, save_path,
+                                         return_bytes)
     else:
-        plot_rolling_basket_results(results_df, tickers, window, step_size, figsize, save_path)
+        return plot_rolling_basket_results(results_df, tickers, window, step_size, figsize, save_path,
+                                           return_bytes)
 
 
-def plot_spread(spread, title="Price Spread", figsize=(12, 5), save_path=None):
+def plot_spread(spread, title="Price Spread", figsize=None, save_path=None, return_bytes=False):
     """
     Plot the spread between two cointegrated stocks.
 
@@ -180,15 +256,21 @@ def plot_spread(spread, title="Price Spread", figsize=(12, 5), save_path=None):
     title : str
         Plot title
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    plt.figure(figsize=figsize)
-    plt.plot(spread.index, spread, linewidth=1.5, color='steelblue')
-    plt.axhline(y=spread.mean(), color='red', linestyle='--', linewidth=2, label='Mean')
-    plt.axhline(y=spread.mean() + spread.std(), color='orange', linestyle='--', linewidth=1, alpha=0.7, label='+1 Std')
-    plt.axhline(y=spread.mean() - spread.std(), color='orange', linestyle='--', linewidth=1, alpha=0.7, label='-1 Std')
+    _figure('plot_spread', figsize)
+    # One ndarray for the line and the band levels (NaN-skipping, ddof=1 like pandas)
+    spread_values = spread.to_numpy(dtype=np.float64)
+    spread_mean, spread_std = np.nanmean(spread_values), np.nanstd(spread_values, ddof=1)
+    plt.plot(spread.index, spread_values, linewidth=1.5, color='steelblue')
+    plt.axhline(y=spread_mean, color='red', linestyle='--', linewidth=2, label='Mean')
+    _band_lines(plt.gca(), [spread_mean + spread_std, spread_mean - spread_std],
+                colors='orange', linestyles='--', linewidth=1, alpha=0.7, label='±1 Std')
 
     plt.xlabel('Date', fontsize=11)
     plt.ylabel('Spread', fontsize=11)
@@ -197,15 +279,10 @@ def plot_spread(spread, title="Price Spread", figsize=(12, 5), save_path=None):
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)
 
 
-def plot_zscore(zscore, title="Spread Z-Score", figsize=(12, 5), save_path=None):
+def plot_zscore(zscore, title="Spread Z-Score", figsize=None, save_path=None, return_bytes=False):
     """
     Plot the z-score of the spread with trading thresholds.
 
@@ -216,19 +293,22 @@ def plot_zscore(zscore, title="Spread Z-Score", figsize=(12, 5), save_path=None)
     title : str
         Plot title
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    plt.figure(figsize=figsize)
+    _figure('plot_zscore', figsize)
     plt.plot(zscore.index, zscore, linewidth=1.5, color='steelblue')
 
     # Add threshold lines
     plt.axhline(y=0, color='black', linestyle='-', linewidth=1, alpha=0.5)
-    plt.axhline(y=2, color='red', linestyle='--', linewidth=2, label='Entry threshold (+2σ)')
-    plt.axhline(y=-2, color='red', linestyle='--', linewidth=2, label='Entry threshold (-2σ)')
-    plt.axhline(y=0.5, color='green', linestyle='--', linewidth=1, alpha=0.7, label='Exit threshold (±0.5σ)')
-    plt.axhline(y=-0.5, color='green', linestyle='--', linewidth=1, alpha=0.7)
+    ax = plt.gca()
+    _band_lines(ax, [2, -2], colors='red', linestyles='--', linewidth=2, label='Entry threshold (±2σ)')
+    _band_lines(ax, [0.5, -0.5], colors='green', linestyles='--', linewidth=1, alpha=0.7,
+                label='Exit threshold (±0.5σ)')
 
     plt.xlabel('Date', fontsize=11)
     plt.ylabel('Z-Score', fontsize=11)
@@ -237,15 +317,10 @@ def plot_zscore(zscore, title="Spread Z-Score", figsize=(12, 5), save_path=None)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)
 
 
-def plot_cointegration_heatmap(summary_df, figsize=(10, 8), save_path=None):
+def plot_cointegration_heatmap(summary_df, figsize=None, save_path=None, return_bytes=False):
     """
     Plot a heatmap of cointegration ranks across baskets.
 
@@ -254,23 +329,21 @@ def plot_cointegration_heatmap(summary_df, figsize=(10, 8), save_path=None):
     summary_df : pd.DataFrame
         Summary DataFrame with basket names and cointegration ranks
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    import matplotlib.pyplot as plt
-    from matplotlib.colors import LinearSegmentedColormap
-
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _figure('plot_cointegration_heatmap', figsize, nrows=1)
 
-    # Create color map
-    colors = ['white', 'lightgreen', 'green', 'darkgreen']
-    n_bins = 100
-    cmap = LinearSegmentedColormap.from_list('coint', colors, N=n_bins)
+    # One colormap lookup over the whole rank array (all-zero ranks draw no bars)
+    ranks = summary_df['Coint_Rank'].to_numpy()
+    colors = plt.cm.viridis(ranks / (ranks.max() or 1))
 
     # Plot bars
-    bars = ax.barh(summary_df['Basket'], summary_df['Coint_Rank'],
-                   color=plt.cm.viridis(summary_df['Coint_Rank'] / summary_df['Coint_Rank'].max()))
+    bars = ax.barh(summary_df['Basket'], ranks, color=colors)
 
     ax.set_xlabel('Cointegration Rank', fontsize=12)
     ax.set_ylabel('Basket', fontsize=12)
@@ -279,15 +352,11 @@ def plot_cointegration_heatmap(summary_df, figsize=(10, 8), save_path=None):
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)
 
 
-def plot_spread_analysis(data, hedge_ratio=None, zscore_window=20, figsize=(14, 10), save_path=None):
+def plot_spread_analysis(data, hedge_ratio=None, zscore_window=20, figsize=None, save_path=None,
+                         return_bytes=False):
     """
     Comprehensive plot showing prices, spread, and z-score for a pair.
 
@@ -300,45 +369,49 @@ def plot_spread_analysis(data, hedge_ratio=None, zscore_window=20, figsize=(14,
     zscore_window : int
         Window for z-score calculation
     figsize : tuple
-        Figure size
+        Figure size (default DEFAULT_FIGSIZE)
     save_path : str, optional
         If provided, save plot to this path instead of displaying
+    return_bytes : bool
+        Return the encoded image (PNG unless save_path names another format)
+        instead of displaying it
     """
-    from rolling_analysis import calculate_spread, calculate_zscore
-
     if len(data.columns) != 2:
         raise ValueError("Data must contain exactly 2 stocks")
 
     # Calculate spread and z-score
     spread = calculate_spread(data, hedge_ratio)
     zscore = calculate_zscore(spread, window=zscore_window)
+    # Spread and z-score share the price index; convert it once for all panels
+    dates = data.index.to_numpy()
 
     # Create subplots
-    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=figsize)
+    fig, (ax1, ax2, ax3) = _figure('plot_spread_analysis', figsize, nrows=3)
 
     # Plot 1: Prices
-    ax1.plot(data.index, data.iloc[:, 0], label=data.columns[0], linewidth=2)
-    ax1.plot(data.index, data.iloc[:, 1], label=data.columns[1], linewidth=2)
+    ax1.plot(dates, data.to_numpy(), label=list(data.columns), linewidth=2)
     ax1.set_ylabel('Log Price', fontsize=11)
     ax1.set_title(f'Price Series: {" vs ".join(data.columns)}', fontsize=13, fontweight='bold')
     ax1.legend()
     ax1.grid(True, alpha=0.3)
 
     # Plot 2: Spread
-    ax2.plot(spread.index, spread, linewidth=1.5, color='steelblue')
-    ax2.axhline(y=spread.mean(), color='red', linestyle='--', linewidth=2, label='Mean')
-    ax2.axhline(y=spread.mean() + spread.std(), color='orange', linestyle='--', alpha=0.7)
-    ax2.axhline(y=spread.mean() - spread.std(), color='orange', linestyle='--', alpha=0.7)
+    # One ndarray for the line and the band levels (NaN-skipping, ddof=1 like pandas)
+    spread_values = spread.to_numpy(dtype=np.float64)
+    spread_mean, spread_std = np.nanmean(spread_values), np.nanstd(spread_values, ddof=1)
+    ax2.plot(dates, spread_values, linewidth=1.5, color='steelblue')
+    ax2.axhline(y=spread_mean, color='red', linestyle='--', linewidth=2, label='Mean')
+    _band_lines(ax2, [spread_mean + spread_std, spread_mean - spread_std],
+                colors='orange', linestyles='--', alpha=0.7)
     ax2.set_ylabel('Spread', fontsize=11)
     ax2.set_title('Price Spread', fontsize=13, fontweight='bold')
     ax2.legend()
     ax2.grid(True, alpha=0.3)
 
     # Plot 3: Z-Score
-    ax3.plot(zscore.index, zscore, linewidth=1.5, color='steelblue')
+    ax3.plot(dates, zscore, linewidth=1.5, color='steelblue')
     ax3.axhline(y=0, color='black', linestyle='-', linewidth=1, alpha=0.5)
-    ax3.axhline(y=2, color='red', linestyle='--', linewidth=2, alpha=0.7)
-    ax3.axhline(y=-2, color='red', linestyle='--', linewidth=2, alpha=0.7)
+    _band_lines(ax3, [2, -2], colors='red', linestyles='--', linewidth=2, alpha=0.7)
     ax3.set_xlabel('Date', fontsize=11)
     ax3.set_ylabel('Z-Score', fontsize=11)
     ax3.set_title(f'Spread Z-Score ({zscore_window}d window)', fontsize=13, fontweight='bold')
@@ -346,9 +419,4 @@ def plot_spread_analysis(data, hedge_ratio=None, zscore_window=20, figsize=(14,
 
     plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
-        print(f"  Saved plot to {save_path}")
-        plt.close()
-    else:
-        plt.show()
+    return _save_or_show(save_path, return_bytes)